@@ -1,36 +1,146 @@
+import time
+rerun_start = time.perf_counter()
+
 import streamlit as st
-import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 import json
 import hashlib
 import os
-import time
-import requests  # For fetching data from GitHub Pages
+import posixpath
+# pandas, plotly and requests are imported where they are used (only some
+# views need them), so a cold start paints the header without paying for them
+
+from lapprice import timing
+timing.startup.begin(rerun_start)
+
+with timing.startup.step("import numpy"):
+    import numpy as np
+
+with timing.startup.step("import lapprice"):
+    from lapprice.keys import create_laptop_hash, hash_canonical_columns  # Shared with scripts/ (batch lookup, API)
+    from lapprice.grid import ConfigGrid
+    from lapprice.compiled import CompiledPipeline
+    from lapprice.features import config_pricer
+    from lapprice.estimator import estimate_prices
+    from lapprice.batch import batch_lookup, first_available
+    from lapprice.figcache import figure_cache, plotly_chart
+    from lapprice.loader import shared_loader
+    from lapprice.configdb import ConfigStore
+    from lapprice.tiers import HotKeyCache, TieredPredictor, tier_stats
+    from lapprice.misslog import MissLog
+    from lapprice.prefetch import UPGRADES, PrefetchCache, Prefetcher, neighbour_columns
+    from lapprice.client import ServiceConfigStore, ServiceUnavailable, shared_service
+    from lapprice.options import (
+        DROPDOWN_OPTIONS, RAM_OPTIONS, SSD_OPTIONS, HDD_OPTIONS, RESOLUTION_OPTIONS,
+        SCREEN_SIZE_RANGE, WEIGHT_RANGE, FORM_DEFAULTS, SLIDER_DEFAULTS, PRESETS
+    )
 
 # ============================================================================
 # CONFIGURATION - GitHub Pages URLs
 # ============================================================================
 
 # GitHub Pages base URL for pre-computed data
-GITHUB_PAGES_BASE = "https://arijit2772-dev.github.io/ucs503p-202526odd-bigdawgs"
+GITHUB_PAGES_BASE = os.environ.get("LAPPRICE_PAGES_BASE", "https://arijit2772-dev.github.io/ucs503p-202526odd-bigdawgs")
+
+# Lookup backend for the pre-computed predictions, '<kind>:<location>' (see
+# lapprice/backends.py): dict / mmap / sqlite / shards / range
+PREDICTIONS_STORE = os.environ.get("LAPPRICE_STORE", f"dict:{GITHUB_PAGES_BASE}/predictions_lookup.json")
+
+# Artifact manifest (written next to the store by scripts/export_store.py and
+# precompute_predictions.py). Polled every RELOAD_INTERVAL seconds; a new version
+# is loaded in the background and swapped in without a restart (0 = off)
+STORE_MANIFEST = os.environ.get("LAPPRICE_STORE_MANIFEST", posixpath.join(
+    posixpath.dirname(PREDICTIONS_STORE.partition(':')[2]), "manifest.json"))
+RELOAD_INTERVAL = float(os.environ.get("LAPPRICE_RELOAD_INTERVAL", "300"))
+
+# Newly priced misses (scripts/precompute_misses.py), overlaid on the store if present
+STORE_DELTA = os.environ.get("LAPPRICE_STORE_DELTA", posixpath.join(
+    posixpath.dirname(PREDICTIONS_STORE.partition(':')[2]), "predictions_delta.json"))
+
+# Append-only log of configurations the store couldn't answer - the input of
+# scripts/precompute_misses.py
+MISS_LOG_PATH = os.environ.get("LAPPRICE_MISS_LOG", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "lookups", "misses.jsonl"))
+
+# Dense configuration grid (built by scripts/build_config_grid.py --compact) - the
+# bundled offline store; optional
+CONFIG_GRID_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "lookups", "config_grid.npz")
+
+# L1 hot-key cache snapshot, restored at startup so a restarted process starts
+# warm; point it at a persistent disk to survive redeploys as well
+L1_CACHE_PATH = os.environ.get("LAPPRICE_L1_CACHE", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "lookups", "l1_cache.json"))
+
+# Configuration database for filtered / price-range queries (built by
+# scripts/precompute_predictions.py --sqlite) - optional
+CONFIG_DB_PATH = os.environ.get("LAPPRICE_CONFIG_DB", os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "lookups", "configs.sqlite"))
+
+# Threads resolving the current spec and its one-step neighbours against the
+# store while the user edits, so Predict and the upgrade suggestions read
+# memory even with a remote store (0 = off)
+PREFETCH_WORKERS = int(os.environ.get("LAPPRICE_PREFETCH_WORKERS", "2"))
+
+# App-as-client mode: with a prediction service (scripts/api.py) URL set, store
+# lookups, batch pricing and configuration searches go to it over a pooled
+# keep-alive connection (lapprice/client.py) instead of this process opening the
+# store; the local grid / fallback model / estimator answer when it times out
+SERVICE_URL = os.environ.get("LAPPRICE_SERVICE_URL")
+SERVICE_TIMEOUT = float(os.environ.get("LAPPRICE_SERVICE_TIMEOUT", "2"))
+
+# Seconds a session may block on an in-flight predictions download before
+# answering from the fallback estimators (0 = never block)
+STORE_WAIT = float(os.environ.get("LAPPRICE_STORE_WAIT", "0"))
+
+# Stylesheet (also served at app/static/app.css)
+APP_CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "app.css")
+
+# Closed-form fallback model (built by scripts/train_fallback_model.py)
+FALLBACK_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "fallback_model.npz")
+
+# Views: only the selected one is built on a rerun (value = short name for timing)
+VIEWS = {
+    "🎯 Price Prediction": "predict",
+    "📊 Market Intelligence": "market",
+    "🔍 AI Insights": "insights",
+    "💡 Smart Recommendations": "recommendations",
+    "📈 Value Analysis": "value",
+}
+VIEW_PREDICT, VIEW_MARKET, VIEW_INSIGHTS, VIEW_RECOMMENDATIONS, VIEW_VALUE = VIEWS
+
+# Spec form state (widget keys). Kept in session state so the spec survives
+# while another view is shown and its widgets are not rendered.
+SPEC_DEFAULTS = {
+    'spec_company': FORM_DEFAULTS['company'],
+    'spec_type_name': FORM_DEFAULTS['type_name'],
+    'spec_ram': FORM_DEFAULTS['ram'],
+    'spec_cpu': FORM_DEFAULTS['cpu'],
+    'spec_gpu': FORM_DEFAULTS['gpu'],
+    'spec_os': FORM_DEFAULTS['os'],
+    'spec_screen_size': SLIDER_DEFAULTS['screen_size'],
+    'spec_weight': SLIDER_DEFAULTS['weight'],
+    'spec_touchscreen': 'No',
+    'spec_resolution': FORM_DEFAULTS['resolution'],
+    'spec_ips': 'No',
+    'spec_hdd': FORM_DEFAULTS['hdd'],
+    'spec_ssd': FORM_DEFAULTS['ssd'],
+    'spec_battery': 8,
+    'spec_warranty': 1,
+}
+
+# On-demand profiling: ?profile=1 profiles that one rerun, LAPPRICE_PROFILE=1
+# profiles the first rerun of every session. Output goes to LAPPRICE_PROFILE_DIR.
+PROFILE_ON_START = os.environ.get("LAPPRICE_PROFILE") == "1"
+PROFILE_DIR = os.environ.get("LAPPRICE_PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles"))
+
+# Payload measurement: ?payload=1 (sticky for the session) or LAPPRICE_MEASURE_PAYLOAD=1
+# reports the bytes each rerun sends to the browser
+MEASURE_PAYLOAD = os.environ.get("LAPPRICE_MEASURE_PAYLOAD") == "1"
 
 # ============================================================================
 # HELPER FUNCTIONS - Define all functions at the top
 # ============================================================================
 
-def create_laptop_hash(company, type_name, ram, cpu, gpu, ssd, hdd, os, screen_size, weight, resolution, touchscreen, ips):
-    """Create a unique hash key for laptop configuration"""
-    # Create a normalized string from specs
-    key_string = f"{company}_{type_name}_{ram}GB_{cpu}_{gpu}_{ssd}SSD_{hdd}HDD_{os}_{screen_size}in_{weight}kg_{resolution}_touch{touchscreen}_ips{ips}"
-    # Generate MD5 hash
-    hash_key = hashlib.md5(key_string.encode()).hexdigest()[:12]
-    return hash_key
-
-
-
 def calculate_config_score(ram, ssd, gpu, cpu):
     """Calculate configuration score based on specs"""
     score = 0
@@ -181,19 +291,33 @@ def generate_ai_insights(company, type_name, ram, ssd, gpu, cpu, price):
 
     return insights
 
-def generate_optimization_suggestions(ram, ssd, gpu, price):
-    """Generate optimization suggestions"""
+def format_upgrade_cost(cost):
+    """'+₹4,200', or 'no extra cost' when the upgraded configuration isn't priced higher"""
+    return f"+₹{cost:,}" if cost > 0 else "no extra cost"
+
+def generate_optimization_suggestions(ram, ssd, gpu, price, upgrades=None):
+    """Generate optimization suggestions (upgrades: {'ram'|'ssd'|'gpu': (option, extra cost)} when priced)"""
     suggestions = []
+    upgrades = upgrades or {}
 
-    if ram < 16 and price > 50000:
+    if 'ram' in upgrades and ram < 16:
+        option, upgrade_cost = upgrades['ram']
+        suggestions.append(f"📈 Upgrade to {option}GB RAM ({format_upgrade_cost(upgrade_cost)}) for smoother multitasking")
+    elif ram < 16 and price > 50000:
         upgrade_cost = 3000
         suggestions.append(f"📈 Upgrade to 16GB RAM (+₹{upgrade_cost}) for 25% better performance")
 
-    if ssd < 512:
+    if 'ssd' in upgrades and ssd < 512:
+        option, upgrade_cost = upgrades['ssd']
+        suggestions.append(f"📈 Upgrade to {option}GB SSD ({format_upgrade_cost(upgrade_cost)}) for faster system")
+    elif ssd < 512:
         upgrade_cost = 5000
         suggestions.append(f"📈 Upgrade to 512GB SSD (+₹{upgrade_cost}) for faster system")
 
-    if 'Intel' in str(gpu):
+    if 'gpu' in upgrades:
+        option, upgrade_cost = upgrades['gpu']
+        suggestions.append(f"📈 Step up to {option} ({format_upgrade_cost(upgrade_cost)}) for gaming/creative work")
+    elif 'Intel' in str(gpu):
         suggestions.append("💡 Consider model with dedicated GPU for gaming/creative work")
 
     suggestions.append("💡 Compare prices during festive sales for 10-15% savings")
@@ -201,8 +325,30 @@ def generate_optimization_suggestions(ram, ssd, gpu, price):
 
     return suggestions
 
-def generate_user_recommendations(user_type, budget_range, current_price):
-    """Generate personalized recommendations"""
+# What each profile looks for in the configuration database (lapprice.configdb.FILTERS)
+PROFILE_FILTERS = {
+    "Student": {'type_name': 'Notebook'},
+    "Professional": {'type_name': 'Ultrabook'},
+    "Gamer": {'type_name': 'Gaming', 'min_gpu_tier': 3},
+    "Designer": {'min_gpu_tier': 3, 'min_ram': 16},
+    "Developer": {'min_ram': 16, 'min_cpu_tier': 3},
+    "Business Owner": {'type_name': 'Ultrabook'},
+}
+
+
+def describe_config(row):
+    """Card title / spec line for a configs database row"""
+    return f"{row['company']} {row['type_name']}", f"{row['cpu']}, {row['ram']}GB RAM, {row['ssd']}GB SSD, {row['gpu']}"
+
+
+def generate_user_recommendations(user_type, budget_range, current_price, config_store=None):
+    """Generate personalized recommendations (top-priced matching configs in budget when the config database is built)"""
+    if config_store is not None:
+        rows = config_store.search(min_price=budget_range[0], max_price=budget_range[1], order='-price', limit=2,
+                                   **PROFILE_FILTERS.get(user_type, {}))
+        if rows:
+            return [dict(zip(('title', 'description'), describe_config(row)), price=int(row['price'])) for row in rows]
+
     recommendations = []
 
     if user_type == "Student":
@@ -252,9 +398,12 @@ def generate_user_recommendations(user_type, budget_range, current_price):
 
     return recommendations[:2]
 
-def find_similar_laptops(company, type_name, ram, price):
-    """Find similar laptops in the market"""
-    similar = []
+def find_similar_laptops(company, type_name, ram, price, config_store=None):
+    """Find similar laptops in the market (closest-priced configs of the same type when the config database is built)"""
+    if config_store is not None:
+        rows = config_store.similar_price(price, type_name=type_name, limit=3)
+        if rows:
+            return [dict(zip(('name', 'specs'), describe_config(row)), price=int(row['price'])) for row in rows]
 
     variations = [
         {'name': f'{company} {type_name} Pro', 'specs': f'{ram}GB RAM, 512GB SSD, FHD', 'price': int(price * 1.1)},
@@ -295,6 +444,145 @@ def get_value_proposition(score):
     else:
         return "Premium pricing. Ensure the brand and specific features justify the investment for your use case."
 
+# ============================================================================
+# FIGURE BUILDERS - pure functions of their inputs, memoized via figure_cache
+# ============================================================================
+
+def plotly_go():
+    """plotly.graph_objects, imported on first use (only result views draw figures)"""
+    with timing.startup.step("import plotly.graph_objects"):
+        import plotly.graph_objects as go
+    return go
+
+def markdown_table(rows):
+    """Small list-of-dicts table as markdown (keeps pandas out of always-rendered sections)"""
+    if not rows:
+        return ""
+    columns = list(rows[0])
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    for row in rows:
+        lines.append("| " + " | ".join(f"{row[c]:,.3f}" if isinstance(row[c], float) else str(row[c])
+                                       for c in columns) + " |")
+    return "\n".join(lines)
+
+def build_price_components_figure(components):
+    """Horizontal bar of price contribution per component"""
+    go = plotly_go()
+    fig = go.Figure(data=[
+        go.Bar(
+            x=list(components.values()),
+            y=list(components.keys()),
+            orientation='h',
+            marker_color=['#8b5cf6', '#3b82f6', '#22c55e', '#d97706', '#ef4444']
+        )
+    ])
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=0, r=0, t=0, b=0),
+        xaxis_title="Price Contribution (₹)",
+        showlegend=False
+    )
+    return fig
+
+def build_market_gauge_figure(percentile):
+    """Market percentile gauge"""
+    go = plotly_go()
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=percentile,
+        title={'text': "Market Percentile"},
+        delta={'reference': 50},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 25], 'color': "lightgray"},
+                {'range': [25, 50], 'color': "gray"},
+                {'range': [50, 75], 'color': "lightblue"},
+                {'range': [75, 100], 'color': "blue"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 90
+            }
+        }
+    ))
+
+    fig.update_layout(height=250, margin=dict(l=0, r=0, t=30, b=0))
+    return fig
+
+def build_feature_importance_figure():
+    """Feature importance bar (static)"""
+    go = plotly_go()
+    features = ['Brand', 'RAM', 'SSD', 'GPU', 'CPU', 'Display', 'Weight']
+    importance = [25, 20, 18, 15, 12, 7, 3]
+
+    fig = go.Figure(data=[
+        go.Bar(
+            x=importance,
+            y=features,
+            orientation='h',
+            marker=dict(
+                color=importance,
+                colorscale='Viridis',
+                showscale=True
+            )
+        )
+    ])
+
+    fig.update_layout(
+        title="ML Model Feature Importance",
+        xaxis_title="Impact on Price (%)",
+        height=400
+    )
+    return fig
+
+def build_tco_figure(years, values, total_costs):
+    """Resale value vs total investment over the ownership period"""
+    go = plotly_go()
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=values,
+        mode='lines+markers',
+        name='Resale Value',
+        line=dict(color='#16a34a', width=3)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=years,
+        y=total_costs,
+        mode='lines+markers',
+        name='Total Investment',
+        line=dict(color='#dc2626', width=3)
+    ))
+
+    fig.update_layout(
+        title="5-Year Total Cost of Ownership",
+        xaxis_title="Years",
+        yaxis_title="Value (₹)",
+        height=400,
+        hovermode='x unified'
+    )
+    return fig
+
+def build_value_score_figure(value_score):
+    """Overall value score indicator"""
+    go = plotly_go()
+    fig = go.Figure(go.Indicator(
+        mode="number+delta",
+        value=value_score,
+        title={'text': "Overall Value Score"},
+        delta={'reference': 70, 'relative': True},
+        domain={'x': [0, 1], 'y': [0, 1]}
+    ))
+
+    fig.update_layout(height=200)
+    return fig
+
 # ============================================================================
 # PAGE CONFIGURATION
 # ============================================================================
@@ -306,451 +594,113 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ============================================================================
-# CUSTOM CSS - WITH P0 IMPROVEMENTS
-# ============================================================================
-
-st.markdown("""
-    <style>
-    /* ============================================================
-       COLOR SYSTEM v2.0 - WCAG 2.1 AA Compliant
-       Design System with semantic tokens
-       ============================================================ */
-    :root {
-        /* Primary Purple - Brand Identity */
-        --color-primary-50:  #f5f3ff;
-        --color-primary-100: #ede9fe;
-        --color-primary-200: #ddd6fe;
-        --color-primary-300: #c4b5fd;
-        --color-primary-400: #a78bfa;
-        --color-primary-500: #8b5cf6;  /* Base - 5.2:1 contrast */
-        --color-primary-600: #7c3aed;  /* Dark - 7.1:1 contrast */
-        --color-primary-700: #6d28d9;
-        --color-primary-800: #5b21b6;
-        --color-primary-900: #4c1d95;
-
-        /* Success Green */
-        --color-success-50:  #f0fdf4;
-        --color-success-500: #22c55e;
-        --color-success-600: #16a34a;  /* 6.2:1 contrast - Better accessibility */
-
-        /* Warning Amber */
-        --color-warning-50:  #fffbeb;
-        --color-warning-400: #fbbf24;
-        --color-warning-500: #f59e0b;
-        --color-warning-600: #d97706;  /* 5.3:1 contrast - Better accessibility */
-
-        /* Error Red */
-        --color-error-50:  #fef2f2;
-        --color-error-500: #ef4444;
-        --color-error-600: #dc2626;  /* 6.5:1 contrast - Better accessibility */
-
-        /* Info Blue */
-        --color-info-50:  #eff6ff;
-        --color-info-500: #3b82f6;  /* 4.9:1 contrast */
-        --color-info-600: #2563eb;
-
-        /* Neutral Gray */
-        --color-neutral-50:  #fafafa;
-        --color-neutral-100: #f5f5f5;
-        --color-neutral-200: #e5e5e5;
-        --color-neutral-500: #737373;
-        --color-neutral-600: #525252;
-        --color-neutral-800: #262626;
-
-        /* Semantic Aliases */
-        --text-primary: var(--color-neutral-800);
-        --text-secondary: var(--color-neutral-600);
-        --text-tertiary: var(--color-neutral-500);
-        --text-inverse: #ffffff;
-        --bg-primary: #ffffff;
-        --bg-overlay: rgba(255, 255, 255, 0.98);
-
-        /* Gradients */
-        --gradient-primary: linear-gradient(135deg, var(--color-primary-500) 0%, var(--color-primary-600) 100%);
-        --gradient-warning: linear-gradient(135deg, var(--color-warning-400) 0%, var(--color-warning-600) 100%);
-
-        /* Shadows */
-        --shadow-primary: 0 8px 30px rgba(139, 92, 246, 0.3);
-        --shadow-primary-lg: 0 12px 40px rgba(139, 92, 246, 0.4);
-    }
-
-    /* Main Theme */
-    .stApp {
-        background: var(--gradient-primary);
-        background-attachment: fixed;
-    }
-
-    /* Main Container */
-    .main > div {
-        background: var(--bg-overlay);
-        border-radius: 20px;
-        padding: 2rem;
-        margin-top: 1rem;
-        box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-    }
-
-    /* Headers */
-    .hero-header {
-        color: #f5f3ff;
-        font-size: 3.5rem;
-        font-weight: 800;
-        text-align: center;
-        margin-bottom: 0.5rem;
-        animation: fadeInDown 1s ease-out;
-        text-shadow: 2px 2px 8px rgba(0,0,0,0.25);
-        background: rgba(255,255,255,0.08);
-        padding: 1rem;
-        border-radius: 15px;
-        backdrop-filter: blur(10px);
-    }
-
-    .sub-header {
-        text-align: center;
-        color: #ede9fe;
-        font-size: 1.2rem;
-        margin-bottom: 2rem;
-        animation: fadeInUp 1s ease-out;
-        font-weight: 500;
-        text-shadow: 1px 1px 3px rgba(0,0,0,0.2);
-        opacity: 0.95;
-    }
-
-    /* Ensure all h3 headers are visible on gradient */
-    .main h3 {
-        color: #f5f3ff !important;
-        text-shadow: 1px 1px 3px rgba(0,0,0,0.2);
-    }
-
-    /* Feature Cards */
-    .feature-card {
-        background: var(--bg-primary);
-        border-radius: 15px;
-        padding: 1.5rem;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-        margin-bottom: 1.5rem;
-        border-left: 4px solid;
-    }
-
-    .feature-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 15px 40px rgba(0,0,0,0.15);
-    }
-
-    .feature-card-blue { border-left-color: var(--color-info-500); }
-    .feature-card-green { border-left-color: var(--color-success-600); }
-    .feature-card-purple { border-left-color: var(--color-primary-600); }
-    .feature-card-orange { border-left-color: var(--color-warning-600); }
-
-    /* Price Display */
-    .price-display {
-        background: var(--gradient-primary);
-        color: var(--text-inverse);
-        padding: 2rem;
-        border-radius: 20px;
-        text-align: center;
-        box-shadow: var(--shadow-primary);
-        animation: pulse 2s infinite;
-    }
-
-    .price-value {
-        font-size: 3rem;
-        font-weight: bold;
-        margin: 0.5rem 0;
-    }
-
-    /* Trust Badges */
-    .trust-badge {
-        display: inline-block;
-        background: var(--color-success-600);
-        color: var(--text-inverse);
-        padding: 0.5rem 1rem;
-        border-radius: 50px;
-        font-size: 0.9rem;
-        margin: 0.25rem;
-        font-weight: 600;
-    }
-
-    /* Animations */
-    @keyframes fadeInDown {
-        from { opacity: 0; transform: translateY(-20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-
-    @keyframes fadeInUp {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-
-    @keyframes pulse {
-        0% { transform: scale(1); }
-        50% { transform: scale(1.02); }
-        100% { transform: scale(1); }
-    }
-
-    @keyframes bounceIn {
-        0% { opacity: 0; transform: scale(0.3); }
-        50% { opacity: 1; transform: scale(1.05); }
-        70% { transform: scale(0.9); }
-        100% { transform: scale(1); }
-    }
-
-    /* Interactive Buttons */
-    .stButton > button {
-        background: white;
-        color: var(--color-primary-600);
-        border: 2px solid var(--color-primary-500);
-        padding: 0.75rem 2rem;
-        border-radius: 50px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-    }
-
-    .stButton > button:hover {
-        background: var(--gradient-primary);
-        color: white;
-        border-color: transparent;
-        transform: translateY(-2px);
-        box-shadow: var(--shadow-primary-lg);
-    }
-
-    /* P0 IMPROVEMENT: Sticky Prediction Button */
-    .sticky-predict-button {
-        position: fixed;
-        bottom: 20px;
-        right: 20px;
-        z-index: 1000;
-        animation: bounceIn 0.6s ease-out;
-    }
-
-    .sticky-predict-button .stButton > button {
-        background: var(--gradient-primary);
-        color: var(--text-inverse);
-        font-size: 1.1rem;
-        padding: 1rem 2.5rem;
-        border-radius: 50px;
-        font-weight: 700;
-        box-shadow: var(--shadow-primary);
-        transition: all 0.3s ease;
-        min-width: 200px;
-    }
-
-    .sticky-predict-button .stButton > button:hover {
-        background: var(--color-primary-600);
-        transform: translateY(-3px) scale(1.05);
-        box-shadow: var(--shadow-primary-lg);
-    }
-
-    /* P0 IMPROVEMENT: Preset Button Styling */
-    .preset-button {
-        background: white !important;
-        color: var(--color-primary-500) !important;
-        border: 2px solid var(--color-primary-500) !important;
-        padding: 0.6rem 1.5rem !important;
-        border-radius: 10px !important;
-        font-weight: 600 !important;
-        transition: all 0.2s ease !important;
-    }
-
-    .preset-button:hover {
-        background: var(--color-primary-500) !important;
-        color: white !important;
-        transform: translateY(-2px) !important;
-    }
-
-    /* Value Props - IMPROVED: Better contrast for accessibility */
-    .value-prop {
-        background: var(--gradient-warning);
-        border-radius: 10px;
-        padding: 1rem;
-        margin: 0.5rem 0;
-        text-align: center;
-        font-weight: 600;
-        color: var(--text-primary);
-    }
-
-    /* Tech Stack Badge */
-    .tech-badge {
-        background: var(--color-neutral-200);
-        color: var(--text-primary);
-        padding: 0.3rem 0.8rem;
-        border-radius: 20px;
-        font-size: 0.85rem;
-        display: inline-block;
-        margin: 0.2rem;
-    }
-
-    /* P0 IMPROVEMENT: Accessibility Improvements */
-    *:focus {
-        outline: 3px solid var(--color-primary-500) !important;
-        outline-offset: 2px;
-    }
-
-    .skip-link {
-        position: absolute;
-        top: -40px;
-        left: 0;
-        background: var(--color-primary-500);
-        color: var(--text-inverse);
-        padding: 8px;
-        text-decoration: none;
-        border-radius: 0 0 4px 0;
-    }
-
-    .skip-link:focus {
-        top: 0;
-    }
-
-    /* High contrast mode support */
-    @media (prefers-contrast: high) {
-        .trust-badge, .stButton > button {
-            border: 2px solid currentColor;
-        }
-    }
-
-    /* Reduced motion support */
-    @media (prefers-reduced-motion: reduce) {
-        * {
-            animation-duration: 0.01ms !important;
-            animation-iteration-count: 1 !important;
-            transition-duration: 0.01ms !important;
-        }
-    }
-
-    /* P0 IMPROVEMENT: Mobile Responsive Styles */
-    @media (max-width: 768px) {
-        .hero-header {
-            font-size: 2rem;
-        }
-
-        .sub-header {
-            font-size: 1rem;
-        }
-
-        .trust-badge {
-            font-size: 0.75rem;
-            padding: 0.4rem 0.8rem;
-        }
-
-        .feature-card {
-            padding: 1rem;
-            margin-bottom: 1rem;
-        }
-
-        .price-value {
-            font-size: 2rem;
-        }
-
-        .main > div {
-            padding: 1rem;
-            margin-top: 0.5rem;
-        }
-
-        .sticky-predict-button {
-            bottom: 10px;
-            right: 10px;
-            left: 10px;
-        }
+rerun_profiler = None
+if st.query_params.get("profile") == "1" or (PROFILE_ON_START and "profiled" not in st.session_state):
+    from lapprice.profiling import RerunProfiler
+    st.session_state.profiled = True
+    st.query_params.pop("profile", None)  # one rerun only; the next interaction runs unprofiled
+    rerun_profiler = RerunProfiler(PROFILE_DIR).start()
 
-        .sticky-predict-button .stButton > button {
-            width: 100%;
-            font-size: 1rem;
-            padding: 0.9rem 1.5rem;
-        }
-
-        /* Stack columns on mobile */
-        .stColumns {
-            flex-direction: column !important;
-        }
+payload_meter = None
+if MEASURE_PAYLOAD or st.query_params.get("payload") == "1" or st.session_state.get("measure_payload"):
+    from lapprice.payload import PayloadMeter
+    st.session_state.measure_payload = True
+    payload_meter = PayloadMeter().start()
 
-        /* Make selectboxes and sliders mobile-friendly */
-        .stSelectbox, .stSlider {
-            font-size: 16px !important; /* Prevents zoom on iOS */
-        }
-    }
+# ============================================================================
+# CUSTOM CSS - WITH P0 IMPROVEMENTS (static/app.css)
+# ============================================================================
 
-    @media (max-width: 480px) {
-        .hero-header {
-            font-size: 1.5rem;
-        }
+@st.cache_resource
+def load_app_css():
+    """Stylesheet contents, read once per process"""
+    with open(APP_CSS_PATH) as f:
+        return f.read()
 
-        .price-value {
-            font-size: 1.75rem;
-        }
-
-        .stButton > button {
-            font-size: 0.9rem;
-            padding: 0.6rem 1.5rem;
-        }
-    }
-    </style>
-""", unsafe_allow_html=True)
+# Served as a static file (browser-cached, one small <link> per rerun) when
+# server.enableStaticServing is on, otherwise inlined from the same file
+if st.get_option("server.enableStaticServing"):
+    st.markdown('<link rel="stylesheet" href="app/static/app.css">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{load_app_css()}</style>", unsafe_allow_html=True)
 
 # ============================================================================
 # LOAD MODELS AND DATA
 # ============================================================================
 
-@st.cache_data(show_spinner="🌐 Loading data from GitHub Pages...")
-def load_data_from_github_pages():
-    """Load pre-computed predictions from GitHub Pages - O(1) lookup approach!"""
+def open_predictions_store():
+    """Open the configured lookup backend (runs on the loader thread - no st.* calls)"""
+    if SERVICE_URL:
+        return shared_service(SERVICE_URL, SERVICE_TIMEOUT)  # the service's store, queried per lookup
+
+    with timing.startup.step("import backends"):
+        from lapprice.backends import OverlayBackend, open_backend
+
+    with timing.startup.step("load predictions (background)"):
+        # dict downloads and parses the whole JSON (58MB - pooled session, parallel
+        # range requests, retries); mmap/sqlite open local files without parsing;
+        # shards/range only fetch what lookups touch
+        backend = open_backend(PREDICTIONS_STORE)
+    if getattr(backend, 'download', None):
+        timing.record('download.predictions', backend.download['seconds'])
+        timing.count('download.bytes', backend.download['bytes'])
+
+    with timing.startup.step("load predictions delta"):
+        delta = open_store_delta()
+    return OverlayBackend(backend, delta) if delta is not None else backend
+
+def open_store_delta():
+    """The published delta of priced misses, or None if there isn't one (loader thread - no st.*)"""
+    from lapprice.backends import DictBackend
+    if not STORE_DELTA.startswith(('http://', 'https://')) and not os.path.exists(STORE_DELTA):
+        return None
     try:
-        # Fetch predictions lookup (58MB - under GitHub's 100MB limit)
-        predictions_url = f"{GITHUB_PAGES_BASE}/predictions_lookup.json"
-
-        st.info("📡 Fetching pre-computed predictions from GitHub Pages (O(1) lookup system)...")
-
-        # Load predictions
-        response = requests.get(predictions_url, timeout=60)
-        response.raise_for_status()
-        predictions = response.json()
-
-        # Standard dropdown options (common laptop specs)
-        options = {
-            'Company': ['Acer', 'Apple', 'ASUS', 'Dell', 'HP', 'Lenovo', 'MSI', 'Microsoft', 'Razer', 'Samsung'],
-            'TypeName': ['Notebook', 'Ultrabook', 'Gaming', 'Workstation', '2 in 1 Convertible'],
-            'Cpu brand': ['Intel Core i3', 'Intel Core i5', 'Intel Core i7', 'Intel Core i9',
-                         'AMD Ryzen 3', 'AMD Ryzen 5', 'AMD Ryzen 7', 'AMD Ryzen 9',
-                         'Intel Celeron', 'Intel Pentium'],
-            'Gpu_Brand': ['Intel HD Graphics', 'Intel UHD Graphics', 'Intel Iris Xe',
-                         'Nvidia GeForce GTX 1650', 'Nvidia GeForce GTX 1660 Ti',
-                         'Nvidia GeForce RTX 3050', 'Nvidia GeForce RTX 3060',
-                         'Nvidia GeForce RTX 3070', 'Nvidia GeForce RTX 4060',
-                         'AMD Radeon Graphics', 'AMD Radeon RX 6600M'],
-            'os': ['Windows 10', 'Windows 11', 'macOS', 'Linux', 'Chrome OS', 'No OS']
-        }
-
-        st.success(f"✅ Loaded {len(predictions):,} pre-computed predictions from GitHub Pages!")
-
-        return predictions, options
-
-    except requests.exceptions.RequestException as e:
-        st.error(f"""
-            ⚠️ **Could not fetch data from GitHub Pages**
-
-            Error: {str(e)}
-
-            **Please ensure:**
-            1. GitHub Pages is enabled in repository settings
-            2. JSON files are deployed to: {GITHUB_PAGES_BASE}
-            3. You have internet connection
-
-            **Falling back to demo mode with sample data...**
-        """)
-
-        # Fallback sample data
-        options = {
-            'Company': ['Dell', 'HP', 'Lenovo', 'ASUS', 'Apple', 'Acer', 'MSI'],
-            'TypeName': ['Notebook', 'Gaming', 'Ultrabook', 'Workstation'],
-            'Cpu brand': ['Intel Core i5', 'Intel Core i7', 'Intel Core i9', 'AMD Ryzen 5', 'AMD Ryzen 7'],
-            'Gpu_Brand': ['Intel HD Graphics', 'Nvidia GeForce GTX 1650', 'Nvidia GeForce RTX 3060', 'AMD Radeon'],
-            'os': ['Windows 10', 'Windows 11', 'macOS', 'Linux', 'No OS']
-        }
-
-        return {}, options
-
-predictions_data, dropdown_options = load_data_from_github_pages()
+        return DictBackend.open(STORE_DELTA)
+    except Exception:
+        return None  # not published (404) or unreadable: the store alone still serves
+
+def predictions_store_version():
+    """Version in the store's manifest (runs on loader threads - no st.* calls)"""
+    if SERVICE_URL:
+        return shared_service(SERVICE_URL, SERVICE_TIMEOUT).version()  # changes when the service hot-reloads
+    from lapprice.backends import manifest_version
+    return manifest_version(STORE_MANIFEST)
+
+@st.cache_resource
+def load_config_grid():
+    """Load the dense configuration grid if it has been built - O(1), no hashing"""
+    if not os.path.exists(CONFIG_GRID_PATH):
+        return None
+    return ConfigGrid.load(CONFIG_GRID_PATH)
+
+@st.cache_resource
+def load_config_store():
+    """Open the configuration database if it has been built (indexed SQLite, read-only)"""
+    if not os.path.exists(CONFIG_DB_PATH):
+        return None
+    return ConfigStore(CONFIG_DB_PATH)
+
+@st.cache_resource
+def load_prediction_tiers():
+    """L1 hot keys (restored from the last snapshot) in front of the stores and models"""
+    return TieredPredictor(HotKeyCache(path=L1_CACHE_PATH))
+
+@st.cache_resource
+def load_miss_log():
+    """Process-wide miss log (appends only; a read-only disk just disables it)"""
+    return MissLog(MISS_LOG_PATH)
+
+@st.cache_resource
+def load_prefetcher():
+    """Process-wide prefetch pool (each session keeps its own results)"""
+    return Prefetcher(PREFETCH_WORKERS) if PREFETCH_WORKERS > 0 else None
+
+@st.cache_resource
+def load_fallback_model():
+    """Load the data-backed fallback estimator (ridge model on laptop_data.csv)"""
+    if not os.path.exists(FALLBACK_MODEL_PATH):
+        return None
+    return config_pricer(CompiledPipeline.load(FALLBACK_MODEL_PATH))
 
 # ============================================================================
 # INITIALIZE SESSION STATE
@@ -764,8 +714,17 @@ if 'user_id' not in st.session_state:
     st.session_state.user_id = hashlib.md5(str(datetime.now()).encode()).hexdigest()[:8]
 if 'predicted_price' not in st.session_state:
     st.session_state.predicted_price = None
-if 'preset_config' not in st.session_state:
-    st.session_state.preset_config = None
+if 'prefetch' not in st.session_state:
+    st.session_state.prefetch = PrefetchCache()
+
+# Re-assigning keeps widget state alive across reruns where the spec form isn't rendered
+for spec_key, spec_default in SPEC_DEFAULTS.items():
+    st.session_state[spec_key] = st.session_state.get(spec_key, spec_default)
+
+
+def apply_preset(preset):
+    """Load a preset into the spec form (must run before the form's widgets)"""
+    st.session_state.update({f'spec_{field}': value for field, value in preset.items()})
 
 # ============================================================================
 # HEADER SECTION
@@ -773,6 +732,7 @@ if 'preset_config' not in st.session_state:
 
 st.markdown('<h1 class="hero-header">🎯 LapPrice Pro</h1>', unsafe_allow_html=True)
 st.markdown('<p class="sub-header">AI-Powered Laptop Value Intelligence Platform</p>', unsafe_allow_html=True)
+timing.startup.mark("first paint (header)")
 
 # Trust Indicators
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -788,17 +748,127 @@ with col5:
     st.markdown('<div class="trust-badge">✓ TCO Analysis</div>', unsafe_allow_html=True)
 
 # P0 IMPROVEMENT: Keyboard shortcut helper
-st.markdown("""
-    <div style="text-align: center; margin: 1rem 0; font-size: 0.85rem; color: #ede9fe; background: rgba(0,0,0,0.15); padding: 0.75rem; border-radius: 10px; backdrop-filter: blur(10px);">
-        💡 <strong>Tip:</strong> Press <kbd style="background: rgba(245,243,255,0.95); padding: 0.2rem 0.5rem; border-radius: 3px; border: 1px solid rgba(237,233,254,0.4); color: #7c3aed; font-weight: 600;">Tab</kbd>
-        to navigate between fields,
-        <kbd style="background: rgba(245,243,255,0.95); padding: 0.2rem 0.5rem; border-radius: 3px; border: 1px solid rgba(237,233,254,0.4); color: #7c3aed; font-weight: 600;">Enter</kbd>
-        to confirm selections
-    </div>
-""", unsafe_allow_html=True)
+st.markdown('<div class="shortcut-tip">💡 <strong>Tip:</strong> Press <kbd>Tab</kbd> to navigate between fields, '
+            '<kbd>Enter</kbd> to confirm selections</div>', unsafe_allow_html=True)
 
 st.markdown("---")
 
+# Data loads run after the header is on screen (all cached per process). The
+# predictions store downloads in the background; until it is ready, lookups
+# miss and predictions come from the (labelled) fallback estimators.
+store = shared_loader('predictions', open_predictions_store, predictions_store_version)  # single-flight
+if RELOAD_INTERVAL > 0:
+    store.watch(RELOAD_INTERVAL)  # hot reload on a new manifest version
+# Read once per rerun, store and version together: a swap mid-rerun can't mix
+# two versions of the store, or pair one store with the other's version
+predictions_store, store_version = store.snapshot(wait=STORE_WAIT)  # lookup backend, None until loaded
+dropdown_options = DROPDOWN_OPTIONS
+with timing.startup.step("load config grid"):
+    config_grid = load_config_grid()
+with timing.startup.step("load fallback model"):
+    fallback_model = load_fallback_model()
+with timing.startup.step("open config database"):
+    config_store = load_config_store()
+service = shared_service(SERVICE_URL, SERVICE_TIMEOUT) if SERVICE_URL else None
+if service is not None:
+    config_store = ServiceConfigStore(service, local=config_store)  # searches go to the service first
+with timing.startup.step("restore hot-key cache"):
+    prediction_tiers = load_prediction_tiers()
+# Cached answers belong to one store version. A new one (first load, hot reload)
+# clears L1 and refills it from the store's hot section, most popular first;
+# while the store loads, the restored entries keep serving
+if predictions_store is not None:
+    if prediction_tiers.l1.sync(f"ready:{store_version}"):
+        prediction_tiers.l1.warm(predictions_store.hot_items(), 'store')
+elif store.state == 'failed':
+    prediction_tiers.l1.sync(f"failed:{store_version}")
+miss_log = load_miss_log()
+prefetcher = load_prefetcher()
+session_prefetch = st.session_state.prefetch
+if predictions_store is not None:
+    session_prefetch.sync(f"ready:{store_version}")  # answers of an older store version are dropped
+
+
+def store_price(key):
+    """The store's price for key (None = not in the store), from the prefetched answers when there are some"""
+    if predictions_store is None:
+        return None
+    if prefetcher is not None:
+        price = session_prefetch.get(key)  # joins a prefetch of key still in flight
+        if price is not None or session_prefetch.resolved(key):
+            return price
+    try:
+        return predictions_store.get(key)
+    except ServiceUnavailable:
+        return None  # client mode, service down: the local tiers answer
+
+
+def price_locally(columns):
+    """Grid, then fallback model (or estimator), for many configurations at once"""
+    return first_available(*([config_grid.lookup] if config_grid is not None else []),
+                           fallback_model or estimate_prices)(columns)
+
+
+def price_misses(columns):
+    """Price configurations the store doesn't have: by the service's model in client mode, else locally"""
+    if service is not None:
+        try:
+            return service.predict_batch(columns)['prices']
+        except ServiceUnavailable:
+            pass
+    return price_locally(columns)
+
+
+def infer_price(columns):
+    """(price, source) for one configuration no store or grid answered - the service's model first in client mode"""
+    if service is not None:
+        try:
+            result = service.predict_batch(columns)
+            return result['prices'][0], result['sources'][0]
+        except ServiceUnavailable:
+            pass
+    return (fallback_model or estimate_prices)(columns)[0], 'model' if fallback_model is not None else 'estimate'
+
+
+def priced_upgrades(price):
+    """{'ram'|'ssd'|'gpu': (option, extra cost)}: the spec's one-step upgrades, priced relative to price"""
+    prices = price_configs(spec_neighbours)
+    upgrades = {}
+    for row, label in enumerate(spec_labels):
+        if label in UPGRADES and prices[0] > 0:
+            field = label.partition('_')[0]
+            upgrades[field] = (spec_neighbours[field][row], int(price * (prices[row] / prices[0] - 1)))
+    return upgrades
+
+
+def store_prices_unresolved(columns):
+    """
+    Store prices for the rows the prefetch never settled (failed, evicted,
+    not scheduled), NaN for the rest: known store misses aren't probed again
+    """
+    keys = hash_canonical_columns(columns)
+    prices = np.full(len(keys), np.nan)
+    unresolved = np.array([not session_prefetch.resolved(key) for key in keys.astype(str).tolist()], dtype=bool)
+    if unresolved.any():
+        try:
+            hits, found = predictions_store.probe(keys[unresolved])
+        except ServiceUnavailable:
+            return prices  # client mode, service down: the local tiers answer
+        rows = np.flatnonzero(unresolved)
+        prices[rows[hits]] = found[hits]
+    return prices
+
+
+def price_configs(columns):
+    """Prices for many configurations in one batch: store (prefetched answers first), then price_misses"""
+    if predictions_store is None:
+        return batch_lookup(columns, None, fallback=price_misses)['prices']
+    if prefetcher is None:
+        return batch_lookup(columns, predictions_store, fallback=price_misses)['prices']
+    # Prefetched answers, then the store for what the prefetch didn't settle, like store_price
+    return batch_lookup(columns, session_prefetch,
+                        fallback=first_available(store_prices_unresolved, price_misses))['prices']
+
 # ============================================================================
 # SIDEBAR
 # ============================================================================
@@ -831,6 +901,10 @@ with st.sidebar:
     include_depreciation = st.checkbox("Include Depreciation Analysis", value=True)
     include_market_trends = st.checkbox("Show Market Trends", value=True)
     include_alternatives = st.checkbox("Suggest Alternatives", value=True)
+    batch_spec_edits = st.checkbox(
+        "Batch spec edits", value=True, key="batch_spec_edits",
+        help="Apply the specification form only when you press Get AI Prediction (no rerun per widget change)"
+    )
 
     st.markdown("---")
 
@@ -856,62 +930,22 @@ preset_cols = st.columns(4)
 
 with preset_cols[0]:
     if st.button("🎓 Student Budget", use_container_width=True, key="preset_student"):
-        st.session_state.preset_config = {
-            'ram': 8,
-            'ssd': 256,
-            'type': 'Notebook',
-            'screen_size': 14.0,
-            'weight': 1.5,
-            'resolution': '1920x1080',
-            'hdd': 0,
-            'battery': 8,
-            'warranty': 1
-        }
+        apply_preset(PRESETS['student'])
         st.success("✅ Student configuration loaded!")
 
 with preset_cols[1]:
     if st.button("💼 Professional", use_container_width=True, key="preset_professional"):
-        st.session_state.preset_config = {
-            'ram': 16,
-            'ssd': 512,
-            'type': 'Ultrabook',
-            'screen_size': 14.0,
-            'weight': 1.3,
-            'resolution': '1920x1080',
-            'hdd': 0,
-            'battery': 10,
-            'warranty': 3
-        }
+        apply_preset(PRESETS['professional'])
         st.success("✅ Professional configuration loaded!")
 
 with preset_cols[2]:
     if st.button("🎮 Gamer", use_container_width=True, key="preset_gamer"):
-        st.session_state.preset_config = {
-            'ram': 16,
-            'ssd': 1024,
-            'type': 'Gaming',
-            'screen_size': 15.6,
-            'weight': 2.5,
-            'resolution': '1920x1080',
-            'hdd': 0,
-            'battery': 6,
-            'warranty': 2
-        }
+        apply_preset(PRESETS['gamer'])
         st.success("✅ Gaming configuration loaded!")
 
 with preset_cols[3]:
     if st.button("🎨 Designer", use_container_width=True, key="preset_designer"):
-        st.session_state.preset_config = {
-            'ram': 32,
-            'ssd': 1024,
-            'type': 'Workstation',
-            'screen_size': 15.6,
-            'weight': 2.0,
-            'resolution': '3840x2160',
-            'hdd': 0,
-            'battery': 8,
-            'warranty': 3
-        }
+        apply_preset(PRESETS['designer'])
         st.success("✅ Designer configuration loaded!")
 
 st.markdown("---")
@@ -920,93 +954,92 @@ st.markdown("---")
 # MAIN CONTENT - TABS
 # ============================================================================
 
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "🎯 Price Prediction",
-    "📊 Market Intelligence",
-    "🔍 AI Insights",
-    "💡 Smart Recommendations",
-    "📈 Value Analysis"
-])
+active_view = st.radio("View", list(VIEWS), horizontal=True, key="active_view", label_visibility="collapsed")
+
+# Current spec (the form below updates these keys before this rerun starts)
+company = st.session_state.spec_company
+type_name = st.session_state.spec_type_name
+ram = st.session_state.spec_ram
+cpu = st.session_state.spec_cpu
+gpu = st.session_state.spec_gpu
+os_name = st.session_state.spec_os
+screen_size = st.session_state.spec_screen_size
+weight = st.session_state.spec_weight
+touchscreen = st.session_state.spec_touchscreen
+resolution = st.session_state.spec_resolution
+ips = st.session_state.spec_ips
+hdd = st.session_state.spec_hdd
+ssd = st.session_state.spec_ssd
+battery_life = st.session_state.spec_battery
+warranty_years = st.session_state.spec_warranty
+predict_button = False
+
+# Speculative prefetch: the spec as it stands and its one-step neighbours (RAM /
+# SSD option, GPU tier) are looked up in the background on every rerun, so
+# Predict and the upgrade suggestions find them already resolved
+spec_config = {
+    'company': company, 'type_name': type_name, 'ram': ram, 'cpu': cpu, 'gpu': gpu, 'ssd': ssd, 'hdd': hdd,
+    'os': os_name, 'screen_size': screen_size, 'weight': weight, 'resolution': resolution,
+    'touchscreen': 1 if touchscreen == 'Yes' else 0, 'ips': 1 if ips == 'Yes' else 0,
+}
+spec_labels, spec_neighbours = neighbour_columns(spec_config)
+if prefetcher is not None and predictions_store is not None:
+    prefetcher.schedule(session_prefetch, spec_neighbours, predictions_store)
 
 # ============================================================================
 # TAB 1: PRICE PREDICTION
 # ============================================================================
 
-with tab1:
+if active_view == VIEW_PREDICT:
     col1, col2 = st.columns([2, 1])
 
     with col1:
         st.markdown('<div class="feature-card feature-card-blue">', unsafe_allow_html=True)
         st.markdown("### 📝 Laptop Specifications")
 
-        # Basic Specs
-        spec_col1, spec_col2, spec_col3 = st.columns(3)
+        # Batched mode: widgets inside a form only send their values on submit, so
+        # dragging a slider or flipping dropdowns costs no reruns until then
+        spec_panel = st.form('spec_form') if batch_spec_edits else st.container()
+        with spec_panel:
+            # Basic Specs (presets are applied through the spec_* session keys)
+            spec_col1, spec_col2, spec_col3 = st.columns(3)
 
-        # Get preset values if available
-        preset = st.session_state.preset_config
+            with spec_col1:
+                company = st.selectbox('Brand', dropdown_options['Company'], key='spec_company')
+                type_name = st.selectbox('Type', dropdown_options['TypeName'], key='spec_type_name')
+                ram = st.selectbox('RAM (GB)', RAM_OPTIONS, key='spec_ram')
 
-        with spec_col1:
-            company = st.selectbox('Brand', dropdown_options['Company'])
+            with spec_col2:
+                cpu = st.selectbox('Processor', dropdown_options['Cpu brand'], key='spec_cpu')
+                gpu = st.selectbox('Graphics', dropdown_options['Gpu_Brand'], key='spec_gpu')
+                os_name = st.selectbox('OS', dropdown_options['os'], key='spec_os')
 
-            # Get available types and set default
-            available_types = dropdown_options['TypeName']
-            type_default = preset['type'] if preset and preset['type'] in available_types else available_types[0]
-            type_index = list(available_types).index(type_default) if type_default in available_types else 0
-            type_name = st.selectbox('Type', available_types, index=type_index)
+            with spec_col3:
+                screen_size = st.slider('Screen Size (inches)', SCREEN_SIZE_RANGE[0], SCREEN_SIZE_RANGE[1],
+                                        step=SCREEN_SIZE_RANGE[2], key='spec_screen_size')
+                weight = st.slider('Weight (kg)', WEIGHT_RANGE[0], WEIGHT_RANGE[1], step=WEIGHT_RANGE[2], key='spec_weight')
+                touchscreen = st.selectbox('Touchscreen', ['No', 'Yes'], key='spec_touchscreen')
 
-            # RAM with preset
-            ram_options = [2, 4, 6, 8, 12, 16, 24, 32, 64]
-            ram_default = preset['ram'] if preset and preset['ram'] in ram_options else 8
-            ram_index = ram_options.index(ram_default)
-            ram = st.selectbox('RAM (GB)', ram_options, index=ram_index)
+            # P0 IMPROVEMENT: Collapsible Advanced Configuration
+            with st.expander("🔧 Advanced Configuration", expanded=False):
+                st.markdown('<small style="color: #525252; font-weight: 500;">Optional: Fine-tune your laptop specifications</small>', unsafe_allow_html=True)
 
-        with spec_col2:
-            cpu = st.selectbox('Processor', dropdown_options['Cpu brand'])
-            gpu = st.selectbox('Graphics', dropdown_options['Gpu_Brand'])
-            os = st.selectbox('OS', dropdown_options['os'])
+                adv_col1, adv_col2, adv_col3 = st.columns(3)
 
-        with spec_col3:
-            screen_default = preset['screen_size'] if preset else 15.6
-            screen_size = st.slider('Screen Size (inches)', 10.0, 18.0, screen_default, 0.1)
+                with adv_col1:
+                    resolution = st.selectbox('Resolution', RESOLUTION_OPTIONS, key='spec_resolution')
+                    ips = st.selectbox('IPS Display', ['No', 'Yes'], key='spec_ips')
 
-            weight_default = preset['weight'] if preset else 2.0
-            weight = st.slider('Weight (kg)', 0.5, 5.0, weight_default, 0.1)
+                with adv_col2:
+                    hdd = st.selectbox('HDD (GB)', HDD_OPTIONS, key='spec_hdd')
+                    ssd = st.selectbox('SSD (GB)', SSD_OPTIONS, key='spec_ssd')
 
-            touchscreen = st.selectbox('Touchscreen', ['No', 'Yes'])
+                with adv_col3:
+                    battery_life = st.slider('Battery Life (hours)', 2, 20, key='spec_battery')
+                    warranty_years = st.selectbox('Warranty (years)', [1, 2, 3, 4, 5], key='spec_warranty')
 
-        # P0 IMPROVEMENT: Collapsible Advanced Configuration
-        with st.expander("🔧 Advanced Configuration", expanded=False):
-            st.markdown('<small style="color: #525252; font-weight: 500;">Optional: Fine-tune your laptop specifications</small>', unsafe_allow_html=True)
-
-            adv_col1, adv_col2, adv_col3 = st.columns(3)
-
-            with adv_col1:
-                resolution_options = ['1920x1080', '1366x768', '1600x900', '3840x2160', '2560x1440']
-                resolution_default = preset['resolution'] if preset and preset['resolution'] in resolution_options else '1920x1080'
-                resolution_index = resolution_options.index(resolution_default)
-                resolution = st.selectbox('Resolution', resolution_options, index=resolution_index)
-
-                ips = st.selectbox('IPS Display', ['No', 'Yes'])
-
-            with adv_col2:
-                hdd_options = [0, 128, 256, 512, 1024, 2048]
-                hdd_default = preset['hdd'] if preset and preset['hdd'] in hdd_options else 0
-                hdd_index = hdd_options.index(hdd_default)
-                hdd = st.selectbox('HDD (GB)', hdd_options, index=hdd_index)
-
-                ssd_options = [0, 8, 128, 256, 512, 1024, 2048]
-                ssd_default = preset['ssd'] if preset and preset['ssd'] in ssd_options else 256
-                ssd_index = ssd_options.index(ssd_default)
-                ssd = st.selectbox('SSD (GB)', ssd_options, index=ssd_index)
-
-            with adv_col3:
-                battery_default = preset['battery'] if preset else 8
-                battery_life = st.slider('Battery Life (hours)', 2, 20, battery_default)
-
-                warranty_options = [1, 2, 3, 4, 5]
-                warranty_default = preset['warranty'] if preset else 1
-                warranty_index = warranty_options.index(warranty_default)
-                warranty_years = st.selectbox('Warranty (years)', warranty_options, index=warranty_index)
+            if batch_spec_edits:
+                predict_button = st.form_submit_button('🚀 Get AI Prediction', type="primary", use_container_width=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1033,61 +1066,48 @@ with tab1:
         st.markdown('</div>', unsafe_allow_html=True)
 
         # P0 IMPROVEMENT: Main Prediction Button (in sidebar for visual hierarchy)
-        st.markdown("<br>", unsafe_allow_html=True)
-        predict_button = st.button(
-            '🚀 Get AI Prediction',
-            use_container_width=True,
-            type="primary",
-            key="predict_main"
-        )
+        if not batch_spec_edits:
+            st.markdown("<br>", unsafe_allow_html=True)
+            predict_button = st.button(
+                '🚀 Get AI Prediction',
+                use_container_width=True,
+                type="primary",
+                key="predict_main"
+            )
 
-# P0 IMPROVEMENT: Sticky floating button (always visible when scrolling)
-st.markdown('<div class="sticky-predict-button">', unsafe_allow_html=True)
-predict_button_sticky = st.button(
-    '🚀 Get AI Prediction',
-    use_container_width=True,
-    type="primary",
-    key="predict_sticky"
-)
-st.markdown('</div>', unsafe_allow_html=True)
+# P0 IMPROVEMENT: Sticky floating button (always visible when scrolling).
+# Not with batched edits: outside the form it would predict the last submitted
+# spec and drop unsubmitted edits - the form's own submit button predicts there
+predict_button_sticky = False
+if not batch_spec_edits:
+    st.markdown('<div class="sticky-predict-button">', unsafe_allow_html=True)
+    predict_button_sticky = st.button(
+        '🚀 Get AI Prediction',
+        use_container_width=True,
+        type="primary",
+        key="predict_sticky"
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
 
 # ============================================================================
 # P0 IMPROVEMENT: EMPTY STATE (Before first prediction)
 # ============================================================================
 
-with tab1:
+if active_view == VIEW_PREDICT:
     if st.session_state.predicted_price is None and not (predict_button or predict_button_sticky):
-        st.markdown("""
-            <div class="feature-card feature-card-blue" style="text-align: center; padding: 3rem;">
-                <h3 style="color: #7c3aed;">👋 Welcome to LapPrice Pro!</h3>
-                <p style="color: #525252; margin: 1rem 0;">
-                    Configure your dream laptop using the options above,
-                    then hit the <strong>🚀 Get AI Prediction</strong> button to see:
-                </p>
-                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem; margin-top: 2rem;">
-                    <div>
-                        <div style="font-size: 2rem;">💰</div>
-                        <strong>AI Price Prediction</strong>
-                        <p style="font-size: 0.9rem; color: #525252;">with confidence range</p>
-                    </div>
-                    <div>
-                        <div style="font-size: 2rem;">📊</div>
-                        <strong>Market Analysis</strong>
-                        <p style="font-size: 0.9rem; color: #525252;">position & trends</p>
-                    </div>
-                    <div>
-                        <div style="font-size: 2rem;">💡</div>
-                        <strong>Smart Insights</strong>
-                        <p style="font-size: 0.9rem; color: #525252;">optimization tips</p>
-                    </div>
-                    <div>
-                        <div style="font-size: 2rem;">📈</div>
-                        <strong>Value Analysis</strong>
-                        <p style="font-size: 0.9rem; color: #525252;">5-year TCO projection</p>
-                    </div>
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            '<div class="feature-card feature-card-blue welcome-card">'
+            '<h3>👋 Welcome to LapPrice Pro!</h3>'
+            '<p>Configure your dream laptop using the options above, '
+            'then hit the <strong>🚀 Get AI Prediction</strong> button to see:</p>'
+            '<div class="welcome-grid">'
+            '<div><div class="welcome-icon">💰</div><strong>AI Price Prediction</strong><p>with confidence range</p></div>'
+            '<div><div class="welcome-icon">📊</div><strong>Market Analysis</strong><p>position & trends</p></div>'
+            '<div><div class="welcome-icon">💡</div><strong>Smart Insights</strong><p>optimization tips</p></div>'
+            '<div><div class="welcome-icon">📈</div><strong>Value Analysis</strong><p>5-year TCO projection</p></div>'
+            '</div></div>',
+            unsafe_allow_html=True
+        )
 
 # ============================================================================
 # PREDICTION LOGIC - WITH P0 IMPROVEMENTS
@@ -1098,102 +1118,122 @@ if predict_button or predict_button_sticky:
     progress_bar = st.progress(0)
     status_text = st.empty()
 
-    with st.spinner(""):  # Keep spinner for backup
+    # Every stage is timed into the per-process histograms shown under "Developer Metrics"
+    with st.spinner(""), timing.span('predict.total'):  # Keep spinner for backup
         # Stage 1: Analyzing specifications
         status_text.text("🔍 Analyzing specifications...")
         progress_bar.progress(20)
-        time.sleep(0.3)
+
+        with timing.span('predict.key'):
+            # Create hash key from user specs
+            touchscreen_val = 1 if touchscreen == 'Yes' else 0
+            ips_val = 1 if ips == 'Yes' else 0
+
+            laptop_key = create_laptop_hash(
+                company, type_name, ram, cpu, gpu, ssd, hdd, os_name,
+                screen_size, weight, resolution, touchscreen_val, ips_val
+            )
+
+            config_columns = {
+                'company': [company], 'type_name': [type_name], 'ram': [ram], 'cpu': [cpu],
+                'gpu': [gpu], 'ssd': [ssd], 'hdd': [hdd], 'os': [os_name],
+                'screen_size': [screen_size], 'weight': [weight], 'resolution': [resolution],
+                'touchscreen': [touchscreen_val], 'ips': [ips_val]
+            }
 
         # Stage 2: O(1) Lookup from GitHub Pages data
         status_text.text("⚡ O(1) hash lookup (instant!)...")
         progress_bar.progress(50)
 
-        # Create hash key from user specs
-        touchscreen_val = 1 if touchscreen == 'Yes' else 0
-        ips_val = 1 if ips == 'Yes' else 0
-
-        laptop_key = create_laptop_hash(
-            company, type_name, ram, cpu, gpu, ssd, hdd, os,
-            screen_size, weight, resolution, touchscreen_val, ips_val
-        )
+        def grid_price():
+            # Dense grid: every UI-reachable config it covers, answered by ordinal arithmetic
+            price = config_grid.lookup(config_columns)[0] if config_grid is not None else np.nan
+            return None if np.isnan(price) else price
+
+        def fallback_price():
+            # Model / formula fallback, in its own span so store hits and fallback cost show apart
+            with timing.span('predict.fallback'):
+                return infer_price(config_columns)
+
+        with timing.span('predict.lookup'):
+            # L1 hot keys -> L2 store, then grid -> L3 model (lapprice/tiers.py)
+            price, tier, source = prediction_tiers.predict(
+                laptop_key,
+                l2=[('store', lambda: store_price(laptop_key)),
+                    ('grid', grid_price)],
+                l3=('model', fallback_price),
+                # Nothing cached while the store loads or the service is down (local stand-in answers)
+                write_back=store.state != 'loading' and (service is None or service.available),
+            )
+            base_price = int(price)
+        cached_note = " · ⚡ from the hot-key cache" if tier == 'l1' else ""
+        if source != 'store' and predictions_store is not None and service is None:
+            # A real miss of the loaded store (not just "still loading"): log it for the delta job
+            # (in client mode the service logs the misses it prices)
+            miss_log.record(laptop_key, {field: values[0] for field, values in config_columns.items()})
 
         # O(1) Lookup!
-        if laptop_key in predictions_data:
+        if source == 'store':
             # Found exact match in pre-computed predictions!
-            prediction = predictions_data[laptop_key]
-            base_price = int(prediction.get('price', 0))
-            st.success(f"✅ Found exact match! Hash: {laptop_key}")
+            timing.count('lookup.hit')
+            st.success(f"✅ Found exact match! Hash: {laptop_key}{cached_note}")
+        elif source == 'grid':
+            timing.count('lookup.grid')
+            st.success("✅ Answered from the dense configuration grid (interpolated screen size / weight)"
+                       + cached_note)
+        elif store.state == 'loading':
+            # Store still downloading: say so rather than calling it a miss
+            timing.count('lookup.loading')
+            st.warning("⏳ Pre-computed predictions are still loading. This is an **estimate**; "
+                       "exact lookups switch on automatically when the store is ready.")
+        elif source == 'model':
+            # Data-backed estimate: ridge model fitted on laptop_data.csv
+            timing.count('lookup.miss')
+            st.warning(f"⚠️ Configuration not in database (Hash: {laptop_key}). Using model-based estimate..."
+                       + cached_note)
         else:
             # Fallback: Generate estimate based on specs (demo mode)
-            st.warning(f"⚠️ Configuration not in database (Hash: {laptop_key}). Using estimation...")
-
-            base_price = 30000  # Base price
-
-            # Add price based on specs
-            base_price += ram * 1500  # RAM contribution
-            base_price += ssd * 30  # SSD contribution
-            base_price += hdd * 10  # HDD contribution
-
-            # Brand premium
-            if company in ['Apple', 'Microsoft']:
-                base_price *= 1.5
-            elif company in ['Dell', 'HP', 'Lenovo']:
-                base_price *= 1.2
-
-            # Type premium
-            if type_name == 'Gaming':
-                base_price *= 1.3
-            elif type_name == 'Ultrabook':
-                base_price *= 1.2
-
-            # GPU premium
-            if 'Nvidia' in gpu:
-                base_price += 15000
-            elif 'AMD' in gpu:
-                base_price += 10000
-
-            base_price = int(base_price)
+            timing.count('lookup.miss')
+            st.warning(f"⚠️ Configuration not in database (Hash: {laptop_key}). Using estimation..." + cached_note)
 
         # Stage 3: Calculating market position
         status_text.text("📊 Calculating market position...")
         progress_bar.progress(75)
-        time.sleep(0.2)
-
-        # Apply prediction mode adjustments
-        if prediction_mode == "Conservative":
-            predicted_price = int(base_price * 0.95)
-            confidence_range = 0.10
-        elif prediction_mode == "Optimistic":
-            predicted_price = int(base_price * 1.05)
-            confidence_range = 0.20
-        else:
-            predicted_price = base_price
-            confidence_range = 0.15
-
-        lower_bound = int(predicted_price * (1 - confidence_range))
-        upper_bound = int(predicted_price * (1 + confidence_range))
-
-        # Stage 4: Generating insights
-        status_text.text("✨ Generating insights...")
-        progress_bar.progress(90)
-        time.sleep(0.2)
-
-        # Store in session state
-        st.session_state.predicted_price = predicted_price
-
-        # Store prediction history
-        prediction_data = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'specs': f"{company} {type_name} - {ram}GB RAM, {ssd}GB SSD",
-            'price': predicted_price,
-            'confidence': f"₹{lower_bound:,} - ₹{upper_bound:,}"
-        }
-        st.session_state.predictions_history.append(prediction_data)
+
+        with timing.span('predict.scoring'):
+            # Apply prediction mode adjustments
+            if prediction_mode == "Conservative":
+                predicted_price = int(base_price * 0.95)
+                confidence_range = 0.10
+            elif prediction_mode == "Optimistic":
+                predicted_price = int(base_price * 1.05)
+                confidence_range = 0.20
+            else:
+                predicted_price = base_price
+                confidence_range = 0.15
+
+            lower_bound = int(predicted_price * (1 - confidence_range))
+            upper_bound = int(predicted_price * (1 + confidence_range))
+
+            # Stage 4: Generating insights
+            status_text.text("✨ Generating insights...")
+            progress_bar.progress(90)
+
+            # Store in session state
+            st.session_state.predicted_price = predicted_price
+
+            # Store prediction history
+            prediction_data = {
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'specs': f"{company} {type_name} - {ram}GB RAM, {ssd}GB SSD",
+                'price': predicted_price,
+                'confidence': f"₹{lower_bound:,} - ₹{upper_bound:,}"
+            }
+            st.session_state.predictions_history.append(prediction_data)
 
         # Complete
         progress_bar.progress(100)
         status_text.text("✅ Complete!")
-        time.sleep(0.3)
 
         # Clear progress indicators
         progress_bar.empty()
@@ -1226,25 +1266,13 @@ if predict_button or predict_button_sticky:
             st.markdown('<div class="feature-card feature-card-green">', unsafe_allow_html=True)
             st.markdown("### 💰 Price Component Analysis")
 
+            chart_start = time.perf_counter()
             components = calculate_price_components(company, ram, ssd, gpu, cpu, predicted_price)
+            fig = figure_cache.get('price_components', tuple(components.items()),
+                                   lambda: build_price_components_figure(components))
+            timing.record('predict.charts', time.perf_counter() - chart_start)
 
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=list(components.values()),
-                    y=list(components.keys()),
-                    orientation='h',
-                    marker_color=['#8b5cf6', '#3b82f6', '#22c55e', '#d97706', '#ef4444']
-                )
-            ])
-
-            fig.update_layout(
-                height=300,
-                margin=dict(l=0, r=0, t=0, b=0),
-                xaxis_title="Price Contribution (₹)",
-                showlegend=False
-            )
-
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(fig)
             st.markdown('</div>', unsafe_allow_html=True)
 
         with analysis_col2:
@@ -1252,32 +1280,12 @@ if predict_button or predict_button_sticky:
             st.markdown('<div class="feature-card feature-card-orange">', unsafe_allow_html=True)
             st.markdown("### 📊 Market Position Analysis")
 
+            chart_start = time.perf_counter()
             market_position = analyze_market_position(predicted_price, company, type_name)
-
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=market_position['percentile'],
-                title={'text': "Market Percentile"},
-                delta={'reference': 50},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 25], 'color': "lightgray"},
-                        {'range': [25, 50], 'color': "gray"},
-                        {'range': [50, 75], 'color': "lightblue"},
-                        {'range': [75, 100], 'color': "blue"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 90
-                    }
-                }
-            ))
-
-            fig.update_layout(height=250, margin=dict(l=0, r=0, t=30, b=0))
-            st.plotly_chart(fig, use_container_width=True)
+            percentile = market_position['percentile']
+            fig = figure_cache.get('market_gauge', (percentile,), lambda: build_market_gauge_figure(percentile))
+            timing.record('predict.charts', time.perf_counter() - chart_start)
+            plotly_chart(fig)
 
             st.info(f"📊 {market_position['message']}")
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1286,7 +1294,7 @@ if predict_button or predict_button_sticky:
 # TAB 2: MARKET INTELLIGENCE
 # ============================================================================
 
-with tab2:
+if active_view == VIEW_MARKET:
     if include_market_trends:
         st.markdown("### 📈 Market Intelligence Dashboard")
 
@@ -1321,6 +1329,10 @@ with tab2:
         # Price Trend Analysis
         st.markdown("### 📊 Historical Price Trends")
 
+        with timing.startup.step("import pandas + plotly.express"):
+            import pandas as pd
+            import plotly.express as px
+
         # Generate mock trend data
         dates = pd.date_range(start='2024-01', periods=12, freq='M')
         prices = np.random.normal(60000, 5000, 12).cumsum() + 50000
@@ -1343,11 +1355,34 @@ with tab2:
     else:
         st.info("Enable 'Show Market Trends' in the sidebar to view market intelligence.")
 
+    if config_store is not None:
+        # Filtered + price-range query over every priced configuration (indexed SQLite)
+        st.markdown("### 🔎 Configuration Explorer")
+        explore_col1, explore_col2, explore_col3 = st.columns(3)
+        with explore_col1:
+            explore_type = st.selectbox("Type", ["Any"] + DROPDOWN_OPTIONS['TypeName'], key="explore_type")
+        with explore_col2:
+            explore_ram = st.selectbox("Minimum RAM (GB)", RAM_OPTIONS, index=RAM_OPTIONS.index(8), key="explore_ram")
+        with explore_col3:
+            explore_max_price = st.slider("Maximum price (₹)", 20000, 300000, 80000, 5000, key="explore_max_price")
+
+        with timing.span('query.explore'):
+            explore_filters = {'type_name': None if explore_type == "Any" else explore_type,
+                               'min_ram': explore_ram, 'max_price': explore_max_price}
+            explore_matches = config_store.count(**explore_filters)
+            explore_rows = config_store.search(order='-price', limit=10, **explore_filters)
+
+        st.caption(f"{explore_matches:,} of {len(config_store):,} configurations match - the 10 highest-priced shown")
+        st.markdown(markdown_table([
+            dict(zip(('Laptop', 'Specs'), describe_config(row)), Price=f"₹{int(row['price']):,}")
+            for row in explore_rows
+        ]))
+
 # ============================================================================
 # TAB 3: AI INSIGHTS
 # ============================================================================
 
-with tab3:
+if active_view == VIEW_INSIGHTS:
     st.markdown("### 🤖 AI-Powered Insights & Recommendations")
 
     if st.session_state.predicted_price is not None:
@@ -1370,7 +1405,9 @@ with tab3:
             st.markdown('<div class="feature-card feature-card-green">', unsafe_allow_html=True)
             st.markdown("#### 💡 Optimization Suggestions")
 
-            suggestions = generate_optimization_suggestions(ram, ssd, gpu, predicted_price)
+            with timing.span('insights.upgrades'):
+                upgrades = priced_upgrades(predicted_price)  # prefetched with the spec's neighbours
+            suggestions = generate_optimization_suggestions(ram, ssd, gpu, predicted_price, upgrades)
 
             for suggestion in suggestions:
                 st.markdown(f"• {suggestion}")
@@ -1380,29 +1417,8 @@ with tab3:
         # Feature Importance
         st.markdown("### 📊 Feature Impact on Price")
 
-        features = ['Brand', 'RAM', 'SSD', 'GPU', 'CPU', 'Display', 'Weight']
-        importance = [25, 20, 18, 15, 12, 7, 3]
-
-        fig = go.Figure(data=[
-            go.Bar(
-                x=importance,
-                y=features,
-                orientation='h',
-                marker=dict(
-                    color=importance,
-                    colorscale='Viridis',
-                    showscale=True
-                )
-            )
-        ])
-
-        fig.update_layout(
-            title="ML Model Feature Importance",
-            xaxis_title="Impact on Price (%)",
-            height=400
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        fig = figure_cache.get('feature_importance', (), build_feature_importance_figure)
+        plotly_chart(fig)
     else:
         st.info("👆 Make a prediction first to see AI insights")
 
@@ -1410,7 +1426,7 @@ with tab3:
 # TAB 4: SMART RECOMMENDATIONS
 # ============================================================================
 
-with tab4:
+if active_view == VIEW_RECOMMENDATIONS:
     st.markdown("### 🎯 Personalized Recommendations")
 
     if st.session_state.predicted_price is not None and include_alternatives:
@@ -1422,7 +1438,8 @@ with tab4:
             st.markdown('<div class="feature-card feature-card-purple">', unsafe_allow_html=True)
             st.markdown(f"#### 👤 Based on your profile: {user_type}")
 
-            recommendations = generate_user_recommendations(user_type, budget_range, predicted_price)
+            with timing.span('query.budget'):
+                recommendations = generate_user_recommendations(user_type, budget_range, predicted_price, config_store)
 
             for rec in recommendations:
                 st.markdown(f"""
@@ -1439,7 +1456,8 @@ with tab4:
             st.markdown('<div class="feature-card feature-card-orange">', unsafe_allow_html=True)
             st.markdown("#### 🔥 Similar Laptops in Market")
 
-            similar_laptops = find_similar_laptops(company, type_name, ram, predicted_price)
+            with timing.span('query.similar'):
+                similar_laptops = find_similar_laptops(company, type_name, ram, predicted_price, config_store)
 
             for laptop in similar_laptops:
                 diff = laptop['price'] - predicted_price
@@ -1463,7 +1481,7 @@ with tab4:
 # TAB 5: VALUE ANALYSIS
 # ============================================================================
 
-with tab5:
+if active_view == VIEW_VALUE:
     st.markdown("### 💰 Total Cost of Ownership (TCO) Analysis")
 
     if st.session_state.predicted_price is not None and include_depreciation:
@@ -1480,33 +1498,9 @@ with tab5:
         maintenance_costs = [0, 2000, 3000, 4500, 6000, 8000]
         total_costs = [predicted_price + mc for mc in maintenance_costs]
 
-        fig = go.Figure()
-
-        fig.add_trace(go.Scatter(
-            x=years,
-            y=values,
-            mode='lines+markers',
-            name='Resale Value',
-            line=dict(color='#16a34a', width=3)
-        ))
-
-        fig.add_trace(go.Scatter(
-            x=years,
-            y=total_costs,
-            mode='lines+markers',
-            name='Total Investment',
-            line=dict(color='#dc2626', width=3)
-        ))
-
-        fig.update_layout(
-            title="5-Year Total Cost of Ownership",
-            xaxis_title="Years",
-            yaxis_title="Value (₹)",
-            height=400,
-            hovermode='x unified'
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        fig = figure_cache.get('tco', (tuple(values), tuple(total_costs)),
+                               lambda: build_tco_figure(years, values, total_costs))
+        plotly_chart(fig)
 
         # ROI Analysis
         roi_col1, roi_col2, roi_col3 = st.columns(3)
@@ -1531,16 +1525,8 @@ with tab5:
         score_col1, score_col2 = st.columns([1, 2])
 
         with score_col1:
-            fig = go.Figure(go.Indicator(
-                mode="number+delta",
-                value=value_score,
-                title={'text': "Overall Value Score"},
-                delta={'reference': 70, 'relative': True},
-                domain={'x': [0, 1], 'y': [0, 1]}
-            ))
-
-            fig.update_layout(height=200)
-            st.plotly_chart(fig, use_container_width=True)
+            fig = figure_cache.get('value_score', (value_score,), lambda: build_value_score_figure(value_score))
+            plotly_chart(fig)
 
         with score_col2:
             st.markdown(f"""
@@ -1557,51 +1543,160 @@ with tab5:
 # ============================================================================
 
 st.markdown("---")
-st.markdown("""
-    <div style='text-align: center; padding: 2rem; background: linear-gradient(135deg, #8b5cf6 0%, #7c3aed 100%); border-radius: 15px; color: #f5f3ff;'>
-        <h3 style='color: #f5f3ff;'>🚀 LapPrice Pro - Revolutionizing Laptop Shopping</h3>
-        <p style='color: #ede9fe; opacity: 0.95;'>Powered by Advanced ML • Real-time Market Data</p>
-        <div style='margin-top: 1rem;'>
-            <span class='tech-badge'>Python</span>
-            <span class='tech-badge'>Scikit-learn</span>
-            <span class='tech-badge'>Streamlit</span>
-            <span class='tech-badge'>XGBoost</span>
-            <span class='tech-badge'>Real-time API</span>
-        </div>
-        <p style='margin-top: 1.5rem; font-size: 0.9rem; color: #ede9fe; opacity: 0.9;'>© 2025 LapPrice Pro | Developed by Team Big_dawgs</p>
-    </div>
-""", unsafe_allow_html=True)
+st.markdown(
+    '<div class="app-footer">'
+    '<h3>🚀 LapPrice Pro - Revolutionizing Laptop Shopping</h3>'
+    '<p>Powered by Advanced ML • Real-time Market Data</p>'
+    '<div class="footer-badges">'
+    + ''.join(f"<span class='tech-badge'>{tech}</span>"
+              for tech in ('Python', 'Scikit-learn', 'Streamlit', 'XGBoost', 'Real-time API'))
+    + '</div>'
+    '<p class="footer-credit">© 2025 LapPrice Pro | Developed by Team Big_dawgs</p>'
+    '</div>',
+    unsafe_allow_html=True
+)
 
 # Performance Metrics (Hidden but trackable)
 with st.expander("📊 Developer Metrics"):
     st.markdown("### 🔧 System Performance Metrics")
+    st.caption("Measured in this server process since it started (all sessions)")
+    metrics = timing.snapshot()
+    total = metrics['spans'].get('predict.total')
+    counters = metrics['counters']
+    lookups = sum(counters.get(name, 0) for name in ('lookup.hit', 'lookup.grid', 'lookup.miss', 'lookup.loading'))
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Model Accuracy", "94.7%", "+2.3%")
+        st.metric("Predictions Served", f"{total['count']:,}" if total else "0")
     with col2:
-        st.metric("Avg Response Time", "1.2s", "-0.3s")
+        st.metric("p50 Response Time", f"{total['p50_ms']:.1f} ms" if total else "–")
     with col3:
-        st.metric("API Calls Today", "1,247", "+156")
+        st.metric("p95 / p99", f"{total['p95_ms']:.1f} / {total['p99_ms']:.1f} ms" if total else "–")
     with col4:
-        st.metric("User Satisfaction", "4.8/5", "+0.2")
+        hit_rate = (counters.get('lookup.hit', 0) + counters.get('lookup.grid', 0)) / lookups if lookups else 0
+        st.metric("Lookup Hit Rate", f"{hit_rate:.0%}",
+                  f"{counters.get('lookup.hit', 0)} exact · {counters.get('lookup.grid', 0)} grid · "
+                  f"{counters.get('lookup.miss', 0)} miss · {counters.get('lookup.loading', 0)} while loading",
+                  delta_color="off")
+
+    hot_keys = prediction_tiers.l1
+    st.markdown(markdown_table([
+        {'Tier': {'l1': 'L1 hot keys', 'l2': 'L2 store / grid', 'l3': 'L3 model'}[row['tier']],
+         'Hits': row['hits'], 'Misses': row['misses'] if row['tier'] != 'l3' else '–',
+         'Hit rate': f"{row['hit_rate']:.0%}" if row['tier'] != 'l3' else '–',
+         'p50 (ms)': row['p50_ms'], 'p99 (ms)': row['p99_ms']}
+        for row in tier_stats()
+    ]))
+    st.caption(f"L1: {len(hot_keys):,}/{hot_keys.maxsize:,} keys held · {hot_keys.restored:,} restored at startup · "
+               f"{hot_keys.warmed:,} warmed from the store's hot section"
+               + (f" · snapshot not saved: {hot_keys.save_error}" if hot_keys.save_error else ""))
+
+    if service is not None:
+        st.caption(f"Prediction service: {service.describe()} · {service.calls:,} calls, {service.failures:,} failed"
+                   + ("" if service.available else f" · answering locally for now ({service.error})"))
+
+    if prefetcher is not None:
+        st.caption(f"Prefetch: {len(session_prefetch):,} configurations resolved for this session · "
+                   f"{session_prefetch.used:,} lookups answered from them, {session_prefetch.unused:,} not · "
+                   f"{prefetcher.batches:,} batches on {prefetcher.workers} threads"
+                   + (f" ({prefetcher.errors:,} failed)" if prefetcher.errors else ""))
+
+    st.caption(f"Miss log: {miss_log.recorded:,} misses recorded by this process ({MISS_LOG_PATH})"
+               + (f" · not writable: {miss_log.error}" if miss_log.error else ""))
+
+    figures = figure_cache.stats()
+    st.caption(f"Figure cache: {figures['hit_rate']:.0%} hit rate ({figures['hits']:,} hits / "
+               f"{figures['misses']:,} builds), {figures['size']}/{figures['maxsize']} figures held"
+               + (f" · re-serialized per rerun ({figures['fast_path_error']!r})" if figures['fast_path_error'] else ""))
+
+    if metrics['spans']:
+        st.markdown(markdown_table([
+            {'Stage': name, 'Calls': s['count'], 'p50 (ms)': s['p50_ms'], 'p95 (ms)': s['p95_ms'],
+             'p99 (ms)': s['p99_ms'], 'Max (ms)': s['max_ms']}
+            for name, s in sorted(metrics['spans'].items())
+        ]))
+
+    if os.environ.get("LAPPRICE_WORKER"):
+        st.caption(f"Worker {os.environ['LAPPRICE_WORKER']} under scripts/serve_multi.py (pid {os.getpid()}), "
+                   f"sharing {PREDICTIONS_STORE}")
+    loader = store.status()
+    st.caption(f"Predictions store: {loader['state']} · {loader['fetches']} fetch · {loader['joined']} joined · "
+               f"{loader['waits']} waited · {loader['fallbacks']} served fallback")
+    st.caption(f"Store version: {loader['version'] or 'unversioned'} · {loader['swaps']} hot reload(s)"
+               + (" · reloading" if loader['reloading'] else "")
+               + (f" · last reload failed: {loader['reload_error']}" if loader['reload_error'] else ""))
+    download = metrics['spans'].get('download.predictions')
+    if download:
+        download_mb = counters.get('download.bytes', 0) / 1024 ** 2
+        st.caption(f"Store download: {download_mb:.1f} MB in {download['max_ms'] / 1000:.2f}s "
+                   f"({download_mb / (download['max_ms'] / 1000):.1f} MB/s)")
+
+    st.markdown("#### 🚀 Startup Timeline (this process)")
+    st.markdown(markdown_table([
+        {'Step': event['step'], 'Start (ms)': event['start_ms'], 'Duration (ms)': event['duration_ms']}
+        for event in timing.startup.report()
+    ]))
 
 # Display GitHub Pages Status
-if not predictions_data:
-    st.warning("""
+if store.state == 'loading':
+    # Polls the loader and reruns the app once the store arrives (no page reload)
+    def store_loading_status():
+        if store.ready():
+            st.rerun()
+        st.info(f"📡 Loading pre-computed predictions ({PREDICTIONS_STORE.partition(':')[0]} store) in the background "
+                f"({store.status()['elapsed_s']:.0f}s)... "
+                + ("Until then, prices come from the bundled offline store." if config_grid is not None
+                   else "Predictions are estimates until then."))
+
+    if hasattr(st, 'fragment'):
+        st.fragment(run_every=2)(store_loading_status)()
+    else:
+        store_loading_status()
+elif predictions_store is None and config_grid is not None:
+    # Remote store unreachable, but the bundled compact grid answers every form configuration
+    st.info(f"""
+        📦 **Offline Store Active**
+
+        The full pre-computed store is unavailable ({store.error}).
+        Prices come from the bundled configuration grid ({config_grid.values.size:,} pre-computed cells),
+        which covers {"every configuration in the form" if config_grid.offsets else "the main specification fields"}.
+        {"A newly published store is picked up automatically." if RELOAD_INTERVAL > 0
+         else "Restart the app to retry the full store."}
+    """)
+elif predictions_store is None:
+    st.warning(f"""
         ⚠️ **GitHub Pages Data Not Loaded**
 
+        Error: {store.error}
+
         The app is using fallback mode with estimated prices.
 
         **To enable O(1) lookup:**
         1. Enable GitHub Pages in repository settings
-        2. Deploy JSON files to GitHub Pages
+        2. Deploy JSON files to: {GITHUB_PAGES_BASE}
+           (or set LAPPRICE_STORE to a local store - scripts/export_store.py)
         3. Restart the application
     """)
 else:
     st.info(f"""
         ✅ **O(1) Lookup System Active**
 
-        Using pre-computed predictions from GitHub Pages.
-        {len(predictions_data):,} laptop configurations ready for instant lookup!
+        Using pre-computed predictions: {predictions_store.describe()}.
+        {len(predictions_store):,} laptop configurations ready for instant lookup!
     """)
+
+timing.record(f"rerun.{VIEWS[active_view]}", time.perf_counter() - rerun_start)
+timing.startup.mark("first run complete")
+
+if payload_meter is not None:
+    payload = payload_meter.stop()
+    if payload is not None:
+        timing.count('payload.reruns')
+        timing.count('payload.bytes', payload['bytes'])
+        with st.expander(f"📦 This rerun sent {payload['bytes'] / 1024:.1f} KB in {payload['messages']} messages"):
+            st.markdown(markdown_table([{'Bytes': size, 'Message': message} for size, message in payload['largest']]))
+
+if rerun_profiler is not None:
+    profile_paths = rerun_profiler.stop()
+    st.caption(f"🔬 Profiled this rerun ({rerun_profiler.elapsed * 1000:.0f} ms): "
+               f"{profile_paths['tree']} · {profile_paths['folded']} · {profile_paths['prof']}")
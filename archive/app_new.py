@@ -8,6 +8,11 @@ from datetime import datetime
 import json
 import hashlib
 import os
+import sys
+
+# Shared pricing helpers live in lapprice/ at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lapprice.estimator import estimate_price
 
 # ============================================================================
 # HELPER FUNCTIONS - Define all functions at the top
@@ -718,32 +723,7 @@ if predict_button:
             base_price = int(np.exp(log_price))
         else:
             # Demo mode - generate realistic price based on specs
-            base_price = 30000  # Base price
-            
-            # Add price based on specs
-            base_price += ram * 1500  # RAM contribution
-            base_price += ssd * 30  # SSD contribution
-            base_price += hdd * 10  # HDD contribution
-            
-            # Brand premium
-            if company in ['Apple', 'Microsoft']:
-                base_price *= 1.5
-            elif company in ['Dell', 'HP', 'Lenovo']:
-                base_price *= 1.2
-            
-            # Type premium
-            if type_name == 'Gaming':
-                base_price *= 1.3
-            elif type_name == 'Ultrabook':
-                base_price *= 1.2
-            
-            # GPU premium
-            if 'Nvidia' in gpu:
-                base_price += 15000
-            elif 'AMD' in gpu:
-                base_price += 10000
-            
-            base_price = int(base_price)
+            base_price = estimate_price(company, type_name, ram, ssd, hdd, gpu)
         
         # Apply prediction mode adjustments
         if prediction_mode == "Conservative":
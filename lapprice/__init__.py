@@ -0,0 +1,30 @@
+"""
+LapPrice Pro - shared lookup and pricing helpers
+
+Used by app_new.py and the scripts/ tools so both build the same keys
+and resolve predictions the same way.
+
+Modules:
+- keys:  canonical laptop configuration keys (scalar and column-wise)
+- batch: vectorized batch lookup against the pre-computed predictions
+- features: UI configuration -> model feature columns
+- options: the UI configuration space (form options)
+- grid: dense mixed-radix configuration grid with interpolation
+- compiled: pipe.pkl compiled to NumPy arrays (no sklearn/pandas at serve time)
+- linear: closed-form ridge fallback model (NumPy least squares)
+- estimator: vectorized formula estimate (demo / last resort)
+- timing: stage spans, latency histograms and hit/miss counters
+- profiling: opt-in profiler for a single Streamlit rerun
+- figcache: bounded LRU of built, serialized Plotly figures keyed by their inputs
+- payload: bytes sent to the browser per rerun (measurement mode)
+- loader: background loading of the predictions store, hot reload on a new manifest
+- download: pooled, parallel artifact downloader with retries
+- backends: pluggable lookup stores (dict, mmap, sqlite, sharded HTTP, HTTP range)
+- standins: local stand-ins for every backend (files + range-capable server)
+- configdb: indexed SQLite store of priced configs (filters, price ranges)
+- tiers: L1 hot-key cache (persisted) -> L2 stores -> L3 inference, per-tier stats
+- misslog: append-only log of lookup misses (input of the delta pre-compute)
+- popularity: configuration popularity (store order, hot section, L1 warm-up)
+- prefetch: background lookups of the spec being edited and its one-step neighbours
+- client: app-as-client mode (pooled, timed-out calls to scripts/api.py, local fallback)
+"""
@@ -0,0 +1,579 @@
+"""
+Pluggable lookup backends for the pre-computed predictions
+
+Every backend answers the same two questions about 12-character hash keys
+(lapprice.keys): get(key) -> price or None, and probe(keys) -> (hit mask,
+prices) for a whole batch, so any of them can be handed to batch_lookup.
+Which one a deployment uses is a config string:
+
+    dict:<path or URL>      JSON {key: {'price': ...}} loaded into a dict
+    mmap:<path>             sorted key/price file, memory-mapped (no parse)
+    sqlite:<path>           SQLite table, read-only, one connection per thread
+    shards:<base URL>       JSON shards by key prefix, fetched on demand
+    range:<URL>             the mmap file over HTTP, one page per range request
+
+    backend = open_backend(os.environ.get('LAPPRICE_STORE', 'dict:predictions_lookup.json'))
+
+dict is fastest per lookup but holds everything in memory and has to parse
+the whole JSON first; mmap and sqlite start instantly from local disk and
+leave paging to the OS; shards and range need no local copy at all and only
+fetch what is asked for. lapprice.standins builds every format from one
+predictions dict and serves the HTTP ones locally. OverlayBackend puts a
+delta of newly priced misses (DELTA_NAME, from precompute_misses.py) in
+front of any of them.
+
+Published artifacts carry a manifest.json (write_manifest) whose version
+is a hash of their contents; StoreLoader.watch polls manifest_version()
+to hot-reload a new store. The writers replace files atomically, so a
+store still memory-mapped by the running app is never rewritten under it.
+"""
+
+import abc
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+import numpy as np
+
+from .keys import KEY_DTYPE, KEY_LENGTH
+
+# Store file layout (mmap / range): header, the hot section (most popular
+# keys and their prices, popularity order), fence keys (first key of each
+# page), all keys sorted, then float32 prices in the same order
+STORE_MAGIC = b'LPSTORE2'
+_HEADER = struct.Struct('<8sQQQ')  # magic, key count, page size, hot key count
+_V1_MAGIC, _V1_HEADER = b'LPSTORE1', struct.Struct('<8sQQ')  # no hot section; still readable
+DEFAULT_PAGE = 4096
+DEFAULT_HOT = 1024
+MANIFEST_NAME = 'manifest.json'
+DELTA_NAME = 'predictions_delta.json'  # scripts/precompute_misses.py, overlaid on the store
+SQLITE_CHUNK = 500  # keys per IN (...) query, under SQLite's variable limit
+
+
+def _as_keys(keys):
+    """Array of fixed-width byte keys from bytes, str or an S12 array"""
+    keys = np.asarray(keys)
+    if keys.dtype.kind == 'U':
+        keys = np.char.encode(keys, 'ascii')
+    return keys.astype(KEY_DTYPE)
+
+
+def _key_bytes(key):
+    return key.encode() if isinstance(key, str) else bytes(key)
+
+
+def _is_url(location):
+    return location.startswith(('http://', 'https://'))
+
+
+class LookupBackend(abc.ABC):
+    """Base class: subclasses implement probe() and __len__()"""
+
+    kind = None
+
+    @abc.abstractmethod
+    def probe(self, keys):
+        """(hit mask, prices) for an array of byte keys; misses are NaN"""
+
+    @abc.abstractmethod
+    def __len__(self):
+        """Number of keys in the store"""
+
+    def get(self, key):
+        """Price for one key, or None if the store doesn't have it"""
+        hits, prices = self.probe(_as_keys([_key_bytes(key)]))
+        return float(prices[0]) if hits[0] else None
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def close(self):
+        pass
+
+    def hot_items(self):
+        """[(key, price)] the store holds in memory as its most popular, most popular first"""
+        return []
+
+    def describe(self):
+        return f"{self.kind} ({len(self):,} keys)"
+
+
+class DictBackend(LookupBackend):
+    """The predictions JSON parsed into a dict - fastest lookups, whole store in memory"""
+
+    kind = 'dict'
+
+    def __init__(self, predictions):
+        self.predictions = predictions
+        self.download = None  # Downloader stats when loaded from a URL
+
+    @classmethod
+    def open(cls, location):
+        if _is_url(location):
+            from .download import Downloader
+            with Downloader() as downloader:
+                blob = downloader.fetch(location)
+            backend = cls(json.loads(blob))
+            backend.download = downloader.stats[location]
+            return backend
+        with open(location) as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.predictions)
+
+    def get(self, key):
+        prediction = self.predictions.get(key.decode() if isinstance(key, bytes) else key)
+        return None if prediction is None else float(prediction.get('price', 0))
+
+    def probe(self, keys):
+        found = [self.predictions.get(key) for key in _as_keys(keys).astype(str)]
+        hits = np.array([p is not None for p in found], dtype=bool)
+        prices = np.array([p.get('price', 0) if p is not None else np.nan for p in found], dtype=float)
+        return hits, prices
+
+    def hot_items(self, n=DEFAULT_HOT):
+        # precompute_predictions.py writes the JSON most popular first
+        return [(key, float(prediction.get('price', 0)))
+                for key, prediction in islice(self.predictions.items(), n)]
+
+
+class HotSection:
+    """A store file's hot keys in memory: a dict for single keys, sorted arrays for batches"""
+
+    def __init__(self, keys, prices):
+        self.keys, self.prices = keys, prices  # popularity order
+        self._prices = dict(zip(keys.tolist(), prices.tolist()))
+        order = np.argsort(keys)
+        self._sorted_keys, self._sorted_prices = keys[order], prices[order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, key):
+        return self._prices.get(_key_bytes(key))
+
+    def probe(self, keys):
+        hits = np.zeros(len(keys), dtype=bool)
+        prices = np.full(len(keys), np.nan)
+        if len(self.keys) and len(keys):
+            positions = np.minimum(np.searchsorted(self._sorted_keys, keys), len(self.keys) - 1)
+            hits = self._sorted_keys[positions] == keys
+            prices[hits] = self._sorted_prices[positions[hits]]
+        return hits, prices
+
+    def items(self):
+        return [(key.decode(), float(price)) for key, price in zip(self.keys.tolist(), self.prices.tolist())]
+
+
+class MmapBackend(LookupBackend):
+    """Sorted keys + float32 prices memory-mapped from a store file - no parse, O(log n) probe"""
+
+    kind = 'mmap'
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            n, page, hot, header = read_store_header(f.read(_HEADER.size), path)
+            layout = store_layout(n, page, hot, header)
+            # The hot section is read into memory: popular keys never touch the mapped pages
+            f.seek(layout['hot_keys'])
+            self._hot = HotSection(np.frombuffer(f.read(hot * KEY_LENGTH), dtype=KEY_DTYPE),
+                                   np.frombuffer(f.read(hot * 4), dtype='<f4'))
+        if n:
+            self.keys = np.memmap(path, dtype=KEY_DTYPE, mode='r', offset=layout['keys'], shape=(n,))
+            self.prices = np.memmap(path, dtype='<f4', mode='r', offset=layout['prices'], shape=(n,))
+        else:  # np.memmap refuses empty maps
+            self.keys, self.prices = np.array([], dtype=KEY_DTYPE), np.array([], dtype='<f4')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, key):
+        price = self._hot.get(key)
+        return price if price is not None else super().get(key)
+
+    def probe(self, keys):
+        keys = _as_keys(keys)
+        hits, prices = self._hot.probe(keys)
+        cold = np.flatnonzero(~hits)
+        if not len(self.keys) or not len(cold):
+            return hits, prices
+        positions = np.minimum(np.searchsorted(self.keys, keys[cold]), len(self.keys) - 1)
+        found = self.keys[positions] == keys[cold]
+        hits[cold[found]] = True
+        prices[cold[found]] = self.prices[positions[found]]
+        return hits, prices
+
+    def hot_items(self):
+        return self._hot.items()
+
+
+class SqliteBackend(LookupBackend):
+    """predictions(key, price) table in a read-only SQLite file"""
+
+    kind = 'sqlite'
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._local = threading.local()  # sqlite3 connections can't cross threads
+        self._count = self._connection().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        return connection
+
+    def __len__(self):
+        return self._count
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT price FROM predictions WHERE key = ?", (_key_bytes(key).decode(),)
+        ).fetchone()
+        return None if row is None else float(row[0])
+
+    def probe(self, keys):
+        keys = _as_keys(keys).astype(str)
+        connection = self._connection()
+        found = {}
+        for start in range(0, len(keys), SQLITE_CHUNK):
+            chunk = keys[start:start + SQLITE_CHUNK].tolist()
+            found.update(connection.execute(
+                f"SELECT key, price FROM predictions WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        hits = np.array([key in found for key in keys], dtype=bool)
+        prices = np.array([found.get(key, np.nan) for key in keys], dtype=float)
+        return hits, prices
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class ShardedHttpBackend(LookupBackend):
+    """JSON shards by key prefix under a base URL; each shard is fetched once, on first use"""
+
+    kind = 'shards'
+
+    def __init__(self, base_url, downloader=None):
+        from .download import Downloader
+        self.base_url = base_url.rstrip('/')
+        self.downloader = downloader or Downloader()
+        index = json.loads(self.downloader.fetch(f'{self.base_url}/index.json'))
+        self.prefix = index['prefix']
+        self._count = index['count']
+        self.available = set(index['shards'])  # prefixes with at least one key
+        self.shards = {}  # prefix -> {key: price}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def _load(self, prefixes):
+        missing = sorted((set(prefixes) & self.available) - set(self.shards))
+        if not missing:
+            return
+        urls = {f'{self.base_url}/{prefix}.json': prefix for prefix in missing}
+        blobs = self.downloader.fetch_many(list(urls))
+        with self._lock:
+            for url, blob in blobs.items():
+                self.shards[urls[url]] = json.loads(blob)
+
+    def probe(self, keys):
+        keys = _as_keys(keys).astype(str)
+        self._load(key[:self.prefix] for key in keys)
+        found = [self.shards.get(key[:self.prefix], {}).get(key) for key in keys]
+        hits = np.array([price is not None for price in found], dtype=bool)
+        prices = np.array([np.nan if price is None else price for price in found], dtype=float)
+        return hits, prices
+
+    def close(self):
+        self.downloader.close()
+
+
+class RangeHttpBackend(LookupBackend):
+    """
+    A store file served over HTTP: the header and fence keys are read once,
+    then each probe fetches only the pages holding its keys (range requests,
+    in parallel), keeping the most recent pages in memory
+    """
+
+    kind = 'range'
+
+    def __init__(self, url, downloader=None, max_pages=256):
+        from .download import Downloader
+        self.url = url
+        self.downloader = downloader or Downloader()
+        self.max_pages = max_pages
+        self.n, self.page, hot, header = read_store_header(
+            self.downloader.fetch_ranges(url, [(0, _HEADER.size - 1)])[0], url)
+        self.layout = store_layout(self.n, self.page, hot, header)
+        if self.n:
+            # Hot section and fences are adjacent: one request for both
+            blob = self.downloader.fetch_ranges(url, [(self.layout['hot_keys'], self.layout['keys'] - 1)])[0]
+            fences = self.layout['fences'] - self.layout['hot_keys']
+            self._hot = HotSection(np.frombuffer(blob[:hot * KEY_LENGTH], dtype=KEY_DTYPE),
+                                   np.frombuffer(blob[hot * KEY_LENGTH:fences], dtype='<f4'))
+            self.fences = np.frombuffer(blob[fences:], dtype=KEY_DTYPE)
+        else:
+            self._hot = HotSection(np.array([], dtype=KEY_DTYPE), np.array([], dtype='<f4'))
+            self.fences = np.array([], dtype=KEY_DTYPE)
+        self.pages = OrderedDict()  # page number -> (keys, prices)
+        self.page_fetches = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.n
+
+    def _load(self, numbers):
+        with self._lock:
+            missing = [number for number in numbers if number not in self.pages]
+        if missing:
+            ranges = []
+            for number in missing:
+                first = number * self.page
+                count = min(self.page, self.n - first)
+                ranges.append((self.layout['keys'] + first * KEY_LENGTH, self.layout['keys'] + (first + count) * KEY_LENGTH - 1))
+                ranges.append((self.layout['prices'] + first * 4, self.layout['prices'] + (first + count) * 4 - 1))
+            blobs = self.downloader.fetch_ranges(self.url, ranges)
+            with self._lock:
+                self.page_fetches += len(missing)
+                for i, number in enumerate(missing):
+                    self.pages[number] = (np.frombuffer(blobs[2 * i], dtype=KEY_DTYPE),
+                                          np.frombuffer(blobs[2 * i + 1], dtype='<f4'))
+        with self._lock:
+            pages = {number: self.pages[number] for number in numbers}
+            for number in numbers:
+                self.pages.move_to_end(number)
+            while len(self.pages) > max(self.max_pages, len(numbers)):
+                self.pages.popitem(last=False)
+        return pages
+
+    def get(self, key):
+        price = self._hot.get(key)
+        return price if price is not None else super().get(key)
+
+    def probe(self, keys):
+        keys = _as_keys(keys)
+        hits, prices = self._hot.probe(keys)  # no page fetch for hot keys
+        if not self.n or hits.all():
+            return hits, prices
+        numbers = np.searchsorted(self.fences, keys, side='right') - 1
+        wanted = (numbers >= 0) & ~hits  # below the first key: certainly a miss
+        pages = self._load(np.unique(numbers[wanted]).tolist())
+        for number, (page_keys, page_prices) in pages.items():
+            rows = np.flatnonzero((numbers == number) & ~hits)
+            positions = np.minimum(np.searchsorted(page_keys, keys[rows]), len(page_keys) - 1)
+            found = page_keys[positions] == keys[rows]
+            hits[rows[found]] = True
+            prices[rows[found]] = page_prices[positions[found]]
+        return hits, prices
+
+    def hot_items(self):
+        return self._hot.items()
+
+    def close(self):
+        self.downloader.close()
+
+
+class OverlayBackend(LookupBackend):
+    """A small delta store in front of a base store; the delta answers first"""
+
+    kind = 'overlay'
+
+    def __init__(self, base, delta):
+        self.base = base
+        self.delta = delta
+
+    @property
+    def download(self):
+        return getattr(self.base, 'download', None)
+
+    def __len__(self):
+        return len(self.base) + len(self.delta)  # deltas hold keys the base missed
+
+    def get(self, key):
+        price = self.delta.get(key)
+        return price if price is not None else self.base.get(key)
+
+    def probe(self, keys):
+        keys = _as_keys(keys)
+        hits, prices = self.delta.probe(keys)
+        missing = ~hits
+        if missing.any():
+            hits[missing], prices[missing] = self.base.probe(keys[missing])
+        return hits, prices
+
+    def hot_items(self):
+        return self.base.hot_items()
+
+    def close(self):
+        self.delta.close()
+        self.base.close()
+
+    def describe(self):
+        return f"{self.base.kind} + delta ({len(self.base):,} + {len(self.delta):,} keys)"
+
+
+BACKENDS = {
+    'dict': DictBackend.open,
+    'mmap': MmapBackend,
+    'sqlite': SqliteBackend,
+    'shards': ShardedHttpBackend,
+    'range': RangeHttpBackend,
+}
+
+
+def open_backend(spec):
+    """Open the backend named by a '<kind>:<location>' config string"""
+    kind, _, location = spec.partition(':')
+    if kind not in BACKENDS or not location:
+        raise ValueError(f"Unknown lookup store {spec!r}; expected one of "
+                         f"{', '.join(f'{k}:<location>' for k in BACKENDS)}")
+    return BACKENDS[kind](location)
+
+
+# ----------------------------------------------------------------------
+# Writers - one per on-disk format, all from sorted key/price arrays
+# ----------------------------------------------------------------------
+
+def sorted_arrays(predictions):
+    """Sorted S12 keys and float prices from the {key: {'price': ...}} dict"""
+    from .batch import PredictionIndex
+    index = PredictionIndex.from_predictions(predictions)
+    return index.keys.astype(KEY_DTYPE), index.prices
+
+
+def read_store_header(blob, name):
+    """(key count, page size, hot key count, header size) from the start of a store file"""
+    if blob[:len(STORE_MAGIC)] == STORE_MAGIC:
+        _, n, page, hot = _HEADER.unpack(blob[:_HEADER.size])
+        return n, page, hot, _HEADER.size
+    if blob[:len(_V1_MAGIC)] == _V1_MAGIC:
+        _, n, page = _V1_HEADER.unpack(blob[:_V1_HEADER.size])
+        return n, page, 0, _V1_HEADER.size
+    raise ValueError(f"{name} is not a predictions store file")
+
+
+def store_layout(n, page, hot=0, header=_HEADER.size):
+    """Byte offsets of the sections of a store file with n keys, hot of them in the hot section"""
+    hot_prices = header + hot * KEY_LENGTH
+    fences = hot_prices + hot * 4
+    keys = fences + math.ceil(n / page) * KEY_LENGTH
+    prices = keys + n * KEY_LENGTH
+    return {'hot_keys': header, 'hot_prices': hot_prices, 'fences': fences, 'keys': keys, 'prices': prices,
+            'end': prices + n * 4}
+
+
+def write_store_file(path, keys, prices, page=DEFAULT_PAGE, hot_keys=()):
+    """
+    Write sorted keys/prices in the mmap/range store layout
+
+    hot_keys: the most popular keys, most popular first (lapprice.popularity);
+    they are also written to the hot section at the front of the file
+    """
+    keys = np.asarray(keys, dtype=KEY_DTYPE)
+    prices = np.asarray(prices, dtype='<f4')
+    hot_keys = _as_keys(list(hot_keys)) if len(hot_keys) else np.array([], dtype=KEY_DTYPE)
+    if len(hot_keys) and len(keys):
+        positions = np.minimum(np.searchsorted(keys, hot_keys), len(keys) - 1)
+        positions = positions[keys[positions] == hot_keys]  # only keys the store has
+        _, first = np.unique(positions, return_index=True)
+        positions = positions[np.sort(first)]  # each once, in popularity order
+    else:
+        positions = np.array([], dtype=int)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(_HEADER.pack(STORE_MAGIC, len(keys), page, len(positions)))
+        f.write(keys[positions].tobytes())
+        f.write(prices[positions].tobytes())
+        f.write(keys[::page].tobytes())
+        f.write(keys.tobytes())
+        f.write(prices.tobytes())
+    os.replace(path + '.tmp', path)  # a live mmap keeps the old file
+
+
+def write_sqlite(path, keys, prices):
+    """Write keys/prices to a predictions(key, price) table (replacing the file)"""
+    building = path + '.tmp'
+    if os.path.exists(building):
+        os.remove(building)
+    connection = sqlite3.connect(building)
+    with connection:
+        connection.execute("CREATE TABLE predictions (key TEXT PRIMARY KEY, price REAL NOT NULL) WITHOUT ROWID")
+        connection.executemany("INSERT INTO predictions VALUES (?, ?)",
+                               zip(np.asarray(keys).astype(str).tolist(), np.asarray(prices, dtype=float).tolist()))
+    connection.close()
+    os.replace(building, path)  # open connections keep reading the old file
+
+
+def write_shards(directory, keys, prices, prefix=2):
+    """Write {key: price} JSON shards by key prefix plus an index.json"""
+    os.makedirs(directory, exist_ok=True)
+    keys = np.asarray(keys).astype(str)
+    prices = np.asarray(prices, dtype=float).tolist()
+    shards = {}
+    for key, price in zip(keys.tolist(), prices):
+        shards.setdefault(key[:prefix], {})[key] = price
+    index = {'prefix': prefix, 'count': len(keys), 'shards': sorted(shards)}
+    for name, content in [*((f'{name}.json', shard) for name, shard in shards.items()), ('index.json', index)]:
+        path = os.path.join(directory, name)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(content, f)
+        os.replace(path + '.tmp', path)
+
+
+def _digest_path(digest, path):
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            digest.update(name.encode())
+            _digest_path(digest, os.path.join(path, name))
+        return
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+
+
+def write_manifest(directory, names):
+    """
+    Write manifest.json for the artifacts names (files or directories) in directory
+
+    The version is a hash of their contents, so it changes exactly when
+    they do. Write it after the artifacts: a watcher reloads as soon as it
+    sees a new version.
+    """
+    digest = hashlib.sha256()
+    files = {}
+    for name in sorted(names):
+        path = os.path.join(directory, name)
+        digest.update(name.encode())
+        _digest_path(digest, path)
+        files[name] = os.path.getsize(path) if os.path.isfile(path) else None
+    manifest = {'version': digest.hexdigest()[:16], 'files': files}
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+    return manifest
+
+
+def manifest_version(location):
+    """The 'version' of a manifest.json at a local path or URL"""
+    if _is_url(location):
+        import requests
+        response = requests.get(location, timeout=10)
+        response.raise_for_status()
+        return response.json()['version']
+    with open(location) as f:
+        return json.load(f)['version']
@@ -0,0 +1,99 @@
+"""
+Batch lookup - resolve thousands of configurations in one call
+
+1. Canonicalise + hash all configurations column-wise
+2. Probe the pre-computed predictions with one vectorized searchsorted
+3. Send only the misses to the fallback estimator, as a single batch
+"""
+
+import numpy as np
+
+from .keys import canonicalize_columns, hash_canonical_columns
+
+
+class PredictionIndex:
+    """
+    Sorted key/price arrays built once from the predictions lookup
+
+    A dict answers one key at a time; sorted arrays let numpy answer a
+    whole batch of keys with a single searchsorted.
+    """
+
+    def __init__(self, keys, prices):
+        order = np.argsort(keys, kind='stable')
+        self.keys = np.asarray(keys)[order]
+        self.prices = np.asarray(prices, dtype=float)[order]
+
+    @classmethod
+    def from_predictions(cls, predictions):
+        """Build from the {hash_key: {'price': ...}} dict loaded from JSON"""
+        if not predictions:
+            return cls(np.array([], dtype='S12'), np.array([], dtype=float))
+        keys = np.array(list(predictions.keys()), dtype=bytes)
+        prices = np.fromiter((p.get('price', 0) for p in predictions.values()), dtype=float, count=len(predictions))
+        return cls(keys, prices)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def probe(self, keys):
+        """Return (hit mask, prices) for an array of byte keys; misses are NaN"""
+        keys = np.asarray(keys)
+        prices = np.full(len(keys), np.nan)
+        if len(self.keys) == 0 or len(keys) == 0:
+            return np.zeros(len(keys), dtype=bool), prices
+
+        keys = keys.astype(self.keys.dtype) if keys.dtype.itemsize <= self.keys.dtype.itemsize else keys
+        positions = np.searchsorted(self.keys, keys)
+        positions = np.minimum(positions, len(self.keys) - 1)
+        hits = self.keys[positions] == keys
+        prices[hits] = self.prices[positions[hits]]
+        return hits, prices
+
+
+def take_rows(columns, mask):
+    """Select the rows of a column mapping where mask is True"""
+    return {field: np.asarray(values, dtype=object)[mask].tolist() for field, values in columns.items()}
+
+
+def batch_lookup(columns, index, fallback=None):
+    """
+    Look up many configurations at once
+
+    columns:  mapping of CONFIG_FIELDS -> equal-length sequences
+    index:    PredictionIndex (or anything with the same probe() method)
+    fallback: optional callable(columns) -> prices, called once with
+              only the rows the index could not answer
+
+    Returns a dict of numpy arrays: keys, prices, hits.
+    """
+    canonical = canonicalize_columns(columns)
+    keys = hash_canonical_columns(canonical)
+
+    if index is not None:
+        hits, prices = index.probe(keys)
+    else:
+        hits, prices = np.zeros(len(keys), dtype=bool), np.full(len(keys), np.nan)
+
+    misses = ~hits
+    if fallback is not None and misses.any():
+        prices[misses] = np.asarray(fallback(take_rows(canonical, misses)), dtype=float)
+
+    return {'keys': keys, 'prices': prices, 'hits': hits}
+
+
+def first_available(*sources):
+    """
+    Chain fallbacks: each source answers what it can (NaN = don't know)
+    and only the rows still unanswered go on to the next one
+    """
+    def resolve(columns):
+        n = len(next(iter(columns.values())))
+        prices = np.full(n, np.nan)
+        for source in sources:
+            missing = np.isnan(prices)
+            if not missing.any():
+                break
+            prices[missing] = np.asarray(source(take_rows(columns, missing)), dtype=float)
+        return prices
+    return resolve
@@ -0,0 +1,222 @@
+"""
+Client for the prediction service (scripts/api.py) - app-as-client mode
+
+With LAPPRICE_SERVICE_URL set, app_new.py stays a thin UI process: store
+lookups, batch pricing and configuration searches go to the service over
+one pooled keep-alive requests.Session, each call with a timeout, and the
+prediction tier scales on its own.
+
+    service = shared_service('http://127.0.0.1:5000', timeout=2.0)
+    hits, prices = service.probe(keys)         # a lookup backend (lapprice.backends)
+    result = service.predict_batch(columns)     # keys, prices, hits, sources
+    configs = ServiceConfigStore(service)       # ConfigStore's search / count / similar_price
+
+A call that times out, can't connect or gets a 5xx raises
+ServiceUnavailable and opens the circuit: for `cooldown` seconds every call
+fails at once instead of each waiting out the timeout, and the caller
+answers locally (grid, fallback model, estimator, local database). A 4xx
+is the request's fault: it raises ServiceRequestError and leaves the
+circuit closed.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from . import timing
+from .backends import LookupBackend, _as_keys
+
+DEFAULT_TIMEOUT = 2.0    # seconds per call
+DEFAULT_POOL = 8         # keep-alive connections (concurrent sessions per UI process)
+DEFAULT_COOLDOWN = 10.0  # seconds calls skip the service after a failure
+
+
+class ServiceUnavailable(Exception):
+    """The prediction service timed out, refused or failed - answer locally"""
+
+
+class ServiceRequestError(Exception):
+    """The service rejected the request (4xx) - a caller error, not an outage"""
+
+
+def _error_message(response):
+    """The 'error' of a JSON error body, else the HTTP reason"""
+    try:
+        return response.json().get('error') or response.reason
+    except (ValueError, AttributeError):
+        return response.reason
+
+
+def _jsonable(columns):
+    """Column mapping -> plain lists (numpy scalars aren't JSON serializable)"""
+    return {field: np.asarray(values, dtype=object).tolist() for field, values in columns.items()}
+
+
+class PredictionService(LookupBackend):
+    """The service's lookup store, batch pricing and searches, over one pooled Session"""
+
+    kind = 'service'
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT, pool=DEFAULT_POOL, cooldown=DEFAULT_COOLDOWN):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self.calls = 0
+        self.failures = 0
+        self.error = None
+        self._down_until = 0.0
+        self._status = None
+        # requests is imported here, not at module level: the app imports this
+        # module on every start, client mode or not, and keeps requests off that path
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool, pool_block=False,
+            # One retry of a failed connect (e.g. a kept-alive connection the server
+            # closed); nothing once the request was sent - a slow call fails at timeout
+            max_retries=Retry(total=1, connect=1, read=0, status=0, other=0, allowed_methods=None),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def available(self):
+        """False while the circuit is open (a call failed less than cooldown seconds ago)"""
+        return time.time() >= self._down_until
+
+    def _fail(self, path, error):
+        """Count a failure and open the circuit; returns the ServiceUnavailable to raise"""
+        self.failures += 1
+        self.error = error
+        self._down_until = time.time() + self.cooldown
+        timing.count('service.failures')
+        return ServiceUnavailable(f"{self.base_url}{path}: {error}")
+
+    def _call(self, method, path, **kwargs):
+        import requests
+        if not self.available:
+            raise ServiceUnavailable(f"{self.base_url} unavailable: {self.error}")
+        self.calls += 1
+        timing.count('service.calls')
+        try:
+            with timing.span(f"service.{path.strip('/').replace('/', '.')}"):
+                response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:  # timed out, refused, reset
+            raise self._fail(path, e) from e
+
+        if response.status_code == 503:
+            # The service is up but lacks this part (e.g. no configuration database)
+            raise ServiceUnavailable(f"{path}: {_error_message(response)}")
+        if 400 <= response.status_code < 500:
+            # The request is at fault, not the service: no fallback, no open circuit
+            raise ServiceRequestError(f"{path}: {response.status_code} {_error_message(response)}")
+        if response.status_code >= 500:
+            raise self._fail(path, f"{response.status_code} {_error_message(response)}")
+        try:
+            return response.json()
+        except ValueError as e:
+            raise self._fail(path, e) from e
+
+    # Lookup backend ------------------------------------------------------
+
+    def status(self, refresh=False):
+        """The service's /status (store, key count, version), cached; {} if it can't be reached"""
+        if self._status is None or refresh:
+            try:
+                self._status = self._call('GET', '/status')
+            except ServiceUnavailable:
+                return self._status or {}
+        return self._status
+
+    def version(self):
+        """Version of the store the service serves (for StoreLoader.watch), None if unknown"""
+        return self.status(refresh=True).get('version')
+
+    def __len__(self):
+        return self.status().get('keys') or 0
+
+    def probe(self, keys):
+        keys = _as_keys(keys)
+        data = self._call('POST', '/lookup', json={'keys': np.char.decode(keys, 'ascii').tolist()})
+        prices = np.array([np.nan if price is None else price for price in data['prices']], dtype=float)
+        return np.asarray(data['hits'], dtype=bool), prices
+
+    def describe(self):
+        store = self.status().get('store')
+        return f"service {self.base_url} ({store or 'unreachable'})"
+
+    def close(self):
+        self.session.close()
+
+    # Pricing and search --------------------------------------------------
+
+    def predict_batch(self, columns):
+        """batch_lookup() on the service: keys, prices, hits and the source that answered each row"""
+        data = self._call('POST', '/predict_batch', json={'configs': _jsonable(columns)})
+        return {
+            'keys': np.asarray(data['keys']),
+            'prices': np.asarray(data['predicted_prices'], dtype=float),
+            'hits': np.asarray(data['hits'], dtype=bool),
+            'sources': data.get('sources') or ['store' if hit else 'model' for hit in data['hits']],
+        }
+
+    def search(self, limit=20, order='price', **filters):
+        """(matching count, rows) from /configs"""
+        data = self._call('GET', '/configs', params=dict(_query(filters), limit=limit, order=order))
+        return data['count'], data['configs']
+
+    def similar_price(self, price, limit=3, **filters):
+        return self._call('GET', '/configs/similar', params=dict(_query(filters), price=price, limit=limit))['configs']
+
+
+def _query(filters):
+    """Filters as query string args; None means "any" and is left out"""
+    return {name: value for name, value in filters.items() if value is not None}
+
+
+class ServiceConfigStore:
+    """ConfigStore's query methods answered by the service, or by local (a ConfigStore) when it can't"""
+
+    def __init__(self, service, local=None):
+        self.service = service
+        self.local = local
+
+    def __len__(self):
+        configs = self.service.status().get('configs')
+        if configs is None and self.local is not None:
+            return len(self.local)
+        return configs or 0
+
+    def search(self, limit=20, order='price', **filters):
+        try:
+            return self.service.search(limit=limit, order=order, **filters)[1]
+        except ServiceUnavailable:
+            return self.local.search(limit=limit, order=order, **filters) if self.local is not None else []
+
+    def count(self, **filters):
+        try:
+            return self.service.search(limit=0, **filters)[0]
+        except ServiceUnavailable:
+            return self.local.count(**filters) if self.local is not None else 0
+
+    def similar_price(self, price, limit=3, **filters):
+        try:
+            return self.service.similar_price(price, limit=limit, **filters)
+        except ServiceUnavailable:
+            return self.local.similar_price(price, limit=limit, **filters) if self.local is not None else []
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def shared_service(base_url, timeout=DEFAULT_TIMEOUT):
+    """One PredictionService (one connection pool) per URL per process"""
+    with _services_lock:
+        service = _services.get(base_url)
+        if service is None:
+            service = _services[base_url] = PredictionService(base_url, timeout=timeout)
+        return service
@@ -0,0 +1,361 @@
+"""
+Compiled pipeline - pipe.pkl as plain NumPy arrays
+
+compile_pipeline() walks a fitted scikit-learn pipeline (ColumnTransformer
+with OneHotEncoder/passthrough, then a linear model, tree, forest, boosting,
+voting or stacking regressor - including XGBRegressor members) and copies
+out everything predict() needs: encoder vocabularies, coefficients and
+flattened tree arrays. CompiledPipeline then predicts with NumPy only, so
+serving never imports sklearn, xgboost or pandas.
+
+Trees are flattened into shared arrays where leaves point to themselves,
+so a whole ensemble is evaluated by stepping every (row, tree) pair down
+one level per iteration.
+"""
+
+import json
+
+import numpy as np
+
+# Batches up to this size are one-hot encoded with dict lookups instead of numpy
+SMALL_BATCH = 16
+
+
+# ============================================================================
+# PREDICTION (NumPy only)
+# ============================================================================
+
+class CompiledPipeline:
+    """NumPy-only predictor loaded from a compile_pipeline() artifact"""
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.arrays = arrays
+        self.input_columns = meta['input_columns']
+        self.log_target = meta.get('log_target', True)
+        self._encoders = []
+        for encoder in meta['encoders']:
+            categories = np.array(encoder['categories'], dtype=float if encoder['numeric'] else str)
+            sorter = np.argsort(categories)
+            # Output column per category (None for the dropped one), for small batches
+            slots = {}
+            for position, category in enumerate(categories.tolist()):
+                if position != encoder['drop']:
+                    skip = encoder['drop'] is not None and position > encoder['drop']
+                    slots[category] = encoder['offset'] + position - skip
+            self._encoders.append((encoder, categories, sorter, slots))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        np.savez(path, meta=np.array(json.dumps(self.meta)), **self.arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            arrays = {name: data[name] for name in data.files if name != 'meta'}
+        return cls(meta, arrays)
+
+    # ------------------------------------------------------------------
+    # Feature encoding (ColumnTransformer equivalent)
+    # ------------------------------------------------------------------
+
+    def transform(self, columns):
+        """Model input columns ({name: values} or list of records) -> design matrix"""
+        if isinstance(columns, list):
+            columns = {name: [record[name] for record in columns] for name in self.input_columns}
+        n = len(columns[self.input_columns[0]])
+        X = np.zeros((n, self.meta['n_features']))
+        rows = np.arange(n)
+
+        for encoder, categories, sorter, slots in self._encoders:
+            values = columns[self.input_columns[encoder['column']]]
+            if n <= SMALL_BATCH:
+                # A few dict lookups beat a handful of numpy calls for one row
+                for row, value in enumerate(values):
+                    slot = slots.get(float(value) if encoder['numeric'] else str(value))
+                    if slot is not None:
+                        X[row, slot] = 1.0
+                continue
+
+            values = np.asarray(values, dtype=float if encoder['numeric'] else str)
+            found = sorter[np.minimum(np.searchsorted(categories, values, sorter=sorter), len(categories) - 1)]
+            known = categories[found] == values
+            if encoder['drop'] is not None:
+                known &= found != encoder['drop']
+                found = np.where(found > encoder['drop'], found - 1, found)
+            # Unknown categories encode as all zeros (handle_unknown='ignore')
+            X[rows[known], encoder['offset'] + found[known]] = 1.0
+
+        for column, offset in self.meta['passthrough']:
+            X[:, offset] = np.asarray(columns[self.input_columns[column]], dtype=float)
+        return X
+
+    # ------------------------------------------------------------------
+    # Estimators
+    # ------------------------------------------------------------------
+
+    def _trees(self, spec, X):
+        """Leaf values of every tree for every row, shape (n_rows, n_trees)"""
+        a = self.arrays
+        prefix = spec['arrays']
+        feature, threshold = a[prefix + '_feature'], a[prefix + '_threshold']
+        left, right, roots = a[prefix + '_left'], a[prefix + '_right'], a[prefix + '_roots']
+
+        # sklearn compares float32(x) <= threshold, xgboost float32(x) < float32(split)
+        Xc = X.astype(np.float32)
+        if spec['split'] == 'le':
+            Xc = Xc.astype(np.float64)
+
+        node = np.broadcast_to(roots, (len(X), len(roots))).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(spec['depth']):
+            x = Xc[rows, feature[node]]
+            go_left = x <= threshold[node] if spec['split'] == 'le' else x < threshold[node]
+            node = np.where(go_left, left[node], right[node])
+        return a[prefix + '_value'][node]
+
+    def _predict(self, spec, X):
+        kind = spec['kind']
+        if kind == 'linear':
+            return X @ self.arrays[spec['coef']] + spec['intercept']
+
+        if kind == 'trees':
+            leaves = self._trees(spec, X)
+            if spec['combine'] == 'mean':
+                return leaves.mean(axis=1)
+            if spec['combine'] == 'xgboost':
+                # xgboost accumulates leaf values tree by tree in float32
+                total = np.full(len(X), spec['bias'], dtype=np.float32)
+                for t in range(leaves.shape[1]):
+                    total += leaves[:, t]
+                return total.astype(np.float64)
+            # Gradient boosting: init + learning_rate * sum of trees
+            return spec['bias'] + spec['scale'] * leaves.sum(axis=1)
+
+        if kind == 'voting':
+            predictions = np.column_stack([self._predict(member, X) for member in spec['estimators']])
+            return np.average(predictions, axis=1, weights=spec['weights'])
+
+        if kind == 'stacking':
+            predictions = np.column_stack([self._predict(member, X) for member in spec['estimators']])
+            if spec['passthrough']:
+                predictions = np.hstack([predictions, X])
+            return self._predict(spec['final'], predictions)
+
+        raise ValueError(f"Unknown compiled estimator kind: {kind}")
+
+    def predict(self, columns):
+        """Same output as pipe.predict (log price for the notebook's pipeline)"""
+        return self._predict(self.meta['model'], self.transform(columns))
+
+    def predict_price(self, columns):
+        """Prices in ₹ (undoes the log target)"""
+        raw = self.predict(columns)
+        return np.exp(raw) if self.log_target else raw
+
+
+# ============================================================================
+# COMPILATION (needs the fitted sklearn objects, not sklearn itself)
+# ============================================================================
+
+class _ArrayStore:
+    """Names and collects the arrays referenced from the meta spec"""
+
+    def __init__(self):
+        self.arrays = {}
+
+    def add(self, prefix, **arrays):
+        name = f"{prefix}{len(self.arrays)}"
+        for suffix, array in arrays.items():
+            self.arrays[f"{name}_{suffix}"] = np.asarray(array)
+        return name
+
+
+def _flatten_trees(trees, store):
+    """
+    trees: list of (feature, threshold, left, right, value) arrays per tree,
+    with left == -1 marking leaves. Returns the array prefix and max depth.
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    depth = 0
+    for feature, threshold, left, right, value in trees:
+        n_nodes = len(left)
+        own = np.arange(n_nodes)
+        leaf = left == -1
+        features.append(np.where(leaf, 0, feature))
+        thresholds.append(threshold)
+        lefts.append(np.where(leaf, own, left) + offset)
+        rights.append(np.where(leaf, own, right) + offset)
+        values.append(value)
+        roots.append(offset)
+        depth = max(depth, _tree_depth(left, right))
+        offset += n_nodes
+
+    prefix = store.add(
+        'trees',
+        feature=np.concatenate(features).astype(np.int64),
+        threshold=np.concatenate(thresholds),
+        left=np.concatenate(lefts).astype(np.int64),
+        right=np.concatenate(rights).astype(np.int64),
+        value=np.concatenate(values),
+        roots=np.array(roots, dtype=np.int64),
+    )
+    return prefix, depth
+
+
+def _tree_depth(left, right):
+    depth = 0
+    frontier = [0]
+    while frontier:
+        frontier = [child for node in frontier for child in (left[node], right[node]) if left[node] != -1]
+        depth += 1 if frontier else 0
+    return depth
+
+
+def _sklearn_tree(estimator):
+    tree = estimator.tree_
+    return (tree.feature, tree.threshold, tree.children_left, tree.children_right,
+            tree.value.reshape(tree.node_count, -1)[:, 0].astype(np.float64))
+
+
+def _xgboost_spec(booster, store):
+    model = json.loads(bytes(booster.save_raw('json')))
+    learner = model['learner']
+    objective = learner['objective']['name']
+    if objective not in ('reg:squarederror', 'reg:linear'):
+        raise ValueError(f"Cannot compile xgboost objective {objective}")
+
+    trees = []
+    for tree in learner['gradient_booster']['model']['trees']:
+        left = np.array(tree['left_children'])
+        trees.append((
+            np.array(tree['split_indices']),
+            np.array(tree['split_conditions'], dtype=np.float32),
+            left,
+            np.array(tree['right_children']),
+            # xgboost stores leaf values in split_conditions
+            np.array(tree['split_conditions'], dtype=np.float32),
+        ))
+    prefix, depth = _flatten_trees(trees, store)
+    base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+    return {'kind': 'trees', 'arrays': prefix, 'depth': depth, 'split': 'lt',
+            'combine': 'xgboost', 'bias': base_score}
+
+
+def _estimator_spec(estimator, store):
+    name = type(estimator).__name__
+
+    if hasattr(estimator, 'coef_') and name in ('LinearRegression', 'Ridge', 'Lasso', 'ElasticNet', 'RidgeCV', 'LassoCV'):
+        coef = store.add('linear', coef=np.ravel(estimator.coef_).astype(np.float64))
+        return {'kind': 'linear', 'coef': coef + '_coef', 'intercept': float(np.ravel(estimator.intercept_)[0])}
+
+    if name == 'DecisionTreeRegressor':
+        prefix, depth = _flatten_trees([_sklearn_tree(estimator)], store)
+        return {'kind': 'trees', 'arrays': prefix, 'depth': depth, 'split': 'le', 'combine': 'mean'}
+
+    if name in ('RandomForestRegressor', 'ExtraTreesRegressor'):
+        prefix, depth = _flatten_trees([_sklearn_tree(tree) for tree in estimator.estimators_], store)
+        return {'kind': 'trees', 'arrays': prefix, 'depth': depth, 'split': 'le', 'combine': 'mean'}
+
+    if name == 'GradientBoostingRegressor':
+        init = estimator.init_
+        if init == 'zero':
+            bias = 0.0
+        elif type(init).__name__ == 'DummyRegressor':
+            bias = float(np.ravel(init.constant_)[0])
+        else:
+            raise ValueError(f"Cannot compile GradientBoostingRegressor with init={init!r}")
+        prefix, depth = _flatten_trees([_sklearn_tree(tree) for tree in estimator.estimators_[:, 0]], store)
+        return {'kind': 'trees', 'arrays': prefix, 'depth': depth, 'split': 'le', 'combine': 'sum',
+                'bias': bias, 'scale': float(estimator.learning_rate)}
+
+    if name == 'XGBRegressor':
+        return _xgboost_spec(estimator.get_booster(), store)
+
+    if name == 'VotingRegressor':
+        weights = estimator.weights if estimator.weights is not None else [1.0] * len(estimator.estimators_)
+        return {'kind': 'voting', 'weights': [float(w) for w in weights],
+                'estimators': [_estimator_spec(member, store) for member in estimator.estimators_]}
+
+    if name == 'StackingRegressor':
+        return {'kind': 'stacking', 'passthrough': bool(estimator.passthrough),
+                'estimators': [_estimator_spec(member, store) for member in estimator.estimators_],
+                'final': _estimator_spec(estimator.final_estimator_, store)}
+
+    raise ValueError(f"Cannot compile estimator type {name}")
+
+
+def _column_index(column, input_columns):
+    return input_columns.index(column) if isinstance(column, str) else int(column)
+
+
+def _encoder_meta(transformer, input_columns):
+    """Encoders + passthrough layout of a fitted ColumnTransformer"""
+    encoders, passthrough = [], []
+    offset = 0
+    for _, step, columns in transformer.transformers_:
+        if isinstance(columns, slice) or np.ndim(columns) == 0:
+            columns = list(range(len(input_columns)))[columns] if isinstance(columns, slice) else [columns]
+        if step == 'drop' or len(columns) == 0:
+            continue
+        # Newer sklearn stores passthrough as an identity FunctionTransformer
+        identity = type(step).__name__ == 'FunctionTransformer' and step.func is None
+        if step == 'passthrough' or identity:
+            for column in columns:
+                passthrough.append((_column_index(column, input_columns), offset))
+                offset += 1
+            continue
+        if type(step).__name__ != 'OneHotEncoder':
+            raise ValueError(f"Cannot compile transformer type {type(step).__name__}")
+
+        drop_idx = getattr(step, 'drop_idx_', None)
+        for i, column in enumerate(columns):
+            categories = step.categories_[i]
+            drop = None if drop_idx is None or drop_idx[i] is None else int(drop_idx[i])
+            numeric = categories.dtype.kind in 'iuf'
+            encoders.append({
+                'column': _column_index(column, input_columns),
+                'categories': categories.tolist() if numeric else [str(c) for c in categories],
+                'numeric': numeric,
+                'drop': drop,
+                'offset': offset,
+            })
+            offset += len(categories) - (drop is not None)
+    return encoders, passthrough, offset
+
+
+def compile_pipeline(pipe, input_columns=None, log_target=True):
+    """
+    Compile a fitted Pipeline(ColumnTransformer, regressor) into a
+    CompiledPipeline. input_columns defaults to the names the pipeline was
+    fitted with (features.MODEL_COLUMNS for the notebook's pipe.pkl).
+    """
+    steps = [step for _, step in pipe.steps] if hasattr(pipe, 'steps') else [pipe]
+    transformer = steps[0] if len(steps) > 1 else None
+    estimator = steps[-1]
+
+    if input_columns is None:
+        source = transformer if transformer is not None else estimator
+        input_columns = [str(c) for c in source.feature_names_in_]
+    input_columns = list(input_columns)
+
+    if transformer is not None:
+        encoders, passthrough, n_features = _encoder_meta(transformer, input_columns)
+    else:
+        encoders, passthrough, n_features = [], [(i, i) for i in range(len(input_columns))], len(input_columns)
+
+    store = _ArrayStore()
+    meta = {
+        'input_columns': input_columns,
+        'encoders': encoders,
+        'passthrough': passthrough,
+        'n_features': n_features,
+        'log_target': log_target,
+        'model': _estimator_spec(estimator, store),
+    }
+    return CompiledPipeline(meta, store.arrays)
@@ -0,0 +1,225 @@
+"""
+SQLite configuration store - filtered and range queries over priced configs
+
+The predictions lookup answers "what does this exact config cost"; this
+answers the questions in between: every Gaming laptop under ₹80k with
+16GB, everything inside the sidebar's budget range, the configs priced
+closest to a prediction. One `configs` table, one row per priced
+configuration, with composite (column, price) indexes so each filter plus
+a price range or price ordering is a single index range scan.
+
+    store = ConfigStore('data/lookups/configs.sqlite')
+    store.search(type_name='Gaming', min_ram=16, max_price=80000, limit=10)
+    store.similar_price(62000, type_name='Gaming', limit=3)
+
+Queries are built only from the fixed FILTERS clauses with every value
+bound as a parameter, so each filter combination is one SQL string that
+sqlite3's per-connection statement cache prepares once.
+"""
+
+import functools
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from .keys import canonicalize_columns, hash_canonical_columns
+
+COLUMNS = (
+    'key', 'company', 'type_name', 'ram', 'cpu', 'cpu_tier', 'gpu', 'gpu_tier', 'ssd', 'hdd', 'os',
+    'screen_size', 'weight', 'resolution', 'touchscreen', 'ips', 'price'
+)
+
+SCHEMA = """
+CREATE TABLE configs (
+    key TEXT NOT NULL,
+    company TEXT NOT NULL,
+    type_name TEXT NOT NULL,
+    ram INTEGER NOT NULL,
+    cpu TEXT NOT NULL,
+    cpu_tier INTEGER NOT NULL,
+    gpu TEXT NOT NULL,
+    gpu_tier INTEGER NOT NULL,
+    ssd INTEGER NOT NULL,
+    hdd INTEGER NOT NULL,
+    os TEXT NOT NULL,
+    screen_size REAL NOT NULL,
+    weight REAL NOT NULL,
+    resolution TEXT NOT NULL,
+    touchscreen INTEGER NOT NULL,
+    ips INTEGER NOT NULL,
+    price REAL NOT NULL
+)
+"""
+
+# Created after the bulk insert (much faster than maintaining them row by row)
+INDEXES = {
+    'idx_configs_price': ('price',),
+    'idx_configs_company_price': ('company', 'price'),
+    'idx_configs_type_price': ('type_name', 'price'),
+    'idx_configs_ram_price': ('ram', 'price'),
+    'idx_configs_cpu_tier_price': ('cpu_tier', 'price'),
+    'idx_configs_gpu_tier_price': ('gpu_tier', 'price'),
+    'idx_configs_key': ('key',),
+}
+
+# Filter name -> WHERE clause; the only SQL fragments a query can contain
+FILTERS = {
+    'company': 'company = ?',
+    'type_name': 'type_name = ?',
+    'ram': 'ram = ?',
+    'min_ram': 'ram >= ?',
+    'cpu_tier': 'cpu_tier = ?',
+    'min_cpu_tier': 'cpu_tier >= ?',
+    'gpu_tier': 'gpu_tier = ?',
+    'min_gpu_tier': 'gpu_tier >= ?',
+    'min_price': 'price >= ?',
+    'max_price': 'price <= ?',
+}
+ORDERS = {'price': 'price ASC', '-price': 'price DESC'}
+
+# Processor / graphics tiers, 1 (entry) .. 5 (top); first matching rule wins
+CPU_TIER_RULES = (
+    (5, ('i9', 'Ryzen 9')),
+    (4, ('i7', 'Ryzen 7')),
+    (3, ('i5', 'Ryzen 5')),
+    (2, ('i3', 'Ryzen 3', 'AMD')),
+)
+GPU_TIER_RULES = (
+    (5, ('RTX 3070', 'RTX 3080', 'RTX 4070', 'RTX 4080', 'RTX 4090', 'Quadro')),
+    (4, ('RTX 3060', 'RTX 4060', 'RTX 2070', 'RTX 2080', 'GTX 1070', 'GTX 1080', 'RX 6600', 'RX 6700')),
+    (3, ('RTX 3050', 'RTX 2060', 'GTX 1660', 'GTX 1060', 'RX 5600', 'RX 580')),
+    (2, ('GTX', 'MX', 'Radeon RX', 'Radeon Pro', 'FirePro')),
+)
+
+
+def _tier(text, rules):
+    text = str(text)
+    for tier, needles in rules:
+        if any(needle in text for needle in needles):
+            return tier
+    return 1
+
+
+def cpu_tier(cpu):
+    """'Intel Core i7' / 'AMD Ryzen 7 5800H' -> 4; Celeron, Pentium and unknowns -> 1"""
+    return _tier(cpu, CPU_TIER_RULES)
+
+
+def gpu_tier(gpu):
+    """'Nvidia GeForce RTX 3060' -> 4; integrated graphics -> 1"""
+    return _tier(gpu, GPU_TIER_RULES)
+
+
+def write_config_db(path, columns, prices, keys=None, chunk=100000):
+    """
+    Write priced configurations to a new SQLite file
+
+    columns: mapping of lapprice.keys.CONFIG_FIELDS -> equal-length sequences
+    prices:  one price per row; keys default to the canonical config hashes
+    """
+    canonical = canonicalize_columns(columns)
+    if keys is None:
+        keys = hash_canonical_columns(canonical)
+    keys = np.asarray(keys).astype(str).tolist()
+    prices = np.asarray(prices, dtype=float).tolist()
+    tiers = {
+        'cpu_tier': [cpu_tier(cpu) for cpu in canonical['cpu']],
+        'gpu_tier': [gpu_tier(gpu) for gpu in canonical['gpu']],
+    }
+    values = dict(canonical, key=keys, price=prices, **tiers)
+    rows = zip(*(values[column] for column in COLUMNS))
+
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode = OFF")  # build once, then read-only
+    connection.execute("PRAGMA synchronous = OFF")
+    with connection:
+        connection.execute(SCHEMA)
+        insert = f"INSERT INTO configs VALUES ({', '.join('?' * len(COLUMNS))})"
+        while True:
+            batch = [row for _, row in zip(range(chunk), rows)]
+            if not batch:
+                break
+            connection.executemany(insert, batch)
+        for name, indexed in INDEXES.items():
+            connection.execute(f"CREATE INDEX {name} ON configs ({', '.join(indexed)})")
+    connection.execute("ANALYZE")
+    connection.close()
+    return len(keys)
+
+
+@functools.lru_cache(maxsize=None)
+def _select_sql(filters, order, extra=''):
+    """SELECT for a sorted tuple of filter names (+ an optional extra clause)"""
+    clauses = [FILTERS[name] for name in filters] + ([extra] if extra else [])
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+    return f"SELECT {', '.join(COLUMNS)} FROM configs{where} ORDER BY {ORDERS[order]} LIMIT ?"
+
+
+class ConfigStore:
+    """Read-only queries over a write_config_db() file, one connection per thread"""
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._local = threading.local()  # sqlite3 connections can't cross threads
+        self._count = self._connection().execute("SELECT COUNT(*) FROM configs").fetchone()[0]
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, cached_statements=256)
+            self._local.connection = connection
+        return connection
+
+    def __len__(self):
+        return self._count
+
+    @staticmethod
+    def _filters(filters):
+        """Drop unset filters; reject unknown ones (they would never reach SQL anyway)"""
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown config filter(s): {', '.join(sorted(unknown))}")
+        names = tuple(sorted(name for name, value in filters.items() if value is not None))
+        return names, [filters[name] for name in names]
+
+    @staticmethod
+    def _limit(limit):
+        """SQLite reads a negative LIMIT as "no limit" - never let one through"""
+        if limit < 0:
+            raise ValueError(f"limit must be >= 0, got {limit}")
+        return limit
+
+    def _rows(self, sql, params):
+        return [dict(zip(COLUMNS, row)) for row in self._connection().execute(sql, params)]
+
+    def search(self, limit=20, order='price', **filters):
+        """Configs matching every filter (see FILTERS), cheapest first (order='-price': dearest)"""
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order {order!r}; expected one of {', '.join(ORDERS)}")
+        names, params = self._filters(filters)
+        return self._rows(_select_sql(names, order), params + [self._limit(limit)])
+
+    def count(self, **filters):
+        names, params = self._filters(filters)
+        where = f" WHERE {' AND '.join(FILTERS[name] for name in names)}" if names else ''
+        return self._connection().execute(f"SELECT COUNT(*) FROM configs{where}", params).fetchone()[0]
+
+    def similar_price(self, price, limit=3, **filters):
+        """The configs priced closest to price: one index scan up, one down, merged"""
+        limit = self._limit(limit)
+        names, params = self._filters(filters)
+        above = self._rows(_select_sql(names, 'price', 'price >= ?'), params + [price, limit])
+        below = self._rows(_select_sql(names, '-price', 'price < ?'), params + [price, limit])
+        return sorted(above + below, key=lambda row: abs(row['price'] - price))[:limit]
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,143 @@
+"""
+Pooled, parallel artifact downloader
+
+One requests.Session with a connection pool sized to the worker count,
+shared by every request:
+
+- several artifacts are fetched concurrently
+- large files (server advertises Accept-Ranges) are split into range
+  requests that run in parallel and are reassembled in order
+- failed requests retry with exponential backoff (connection errors,
+  timeouts, truncated bodies, 429/5xx)
+- per-artifact and total throughput are kept in .stats
+
+A cold start with several artifacts therefore takes about as long as the
+largest one rather than the sum.
+
+    with Downloader() as downloader:
+        blobs = downloader.fetch_many([predictions_url, grid_url])
+        print(downloader.report())
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_WORKERS = 8
+DEFAULT_PART_SIZE = 8 * 1024 * 1024  # files larger than this are split into ranges
+# Sizes and byte ranges refer to the file as stored: a server that gzips on the
+# fly (GitHub Pages does for JSON) would otherwise report and slice the
+# compressed encoding, which the parts can't be reassembled from
+IDENTITY = {'Accept-Encoding': 'identity'}
+
+
+class Downloader:
+    """Parallel, range-splitting downloader over one pooled Session"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, part_size=DEFAULT_PART_SIZE, retries=3, backoff=0.5, timeout=60):
+        self.workers = workers
+        self.part_size = part_size
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=workers, pool_maxsize=workers,
+            max_retries=Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                              allowed_methods=frozenset({'GET', 'HEAD'}))
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _probe(self, url):
+        """(size, supports ranges) from a HEAD request; (None, False) if the server won't say"""
+        try:
+            response = self.session.head(url, headers=IDENTITY, timeout=self.timeout, allow_redirects=True)
+            response.raise_for_status()
+        except requests.RequestException:
+            return None, False
+        size = response.headers.get('Content-Length')
+        return (int(size) if size else None), response.headers.get('Accept-Ranges') == 'bytes'
+
+    def _get(self, url, first=None, last=None):
+        """
+        GET the whole file or bytes first..last, retrying failures the adapter
+        can't (bodies cut off mid-transfer). Returns (content, finish time).
+        """
+        headers = dict(IDENTITY, Range=f'bytes={first}-{last}') if first is not None else {}
+        for attempt in range(self.retries + 1):
+            # The adapter already retried connection errors and 429/5xx here
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            response.raise_for_status()
+            try:
+                content = response.content
+            except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                response.close()  # give the pooled connection back before retrying
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                continue
+            if first is not None and response.status_code != 206:
+                content = content[first:last + 1]  # server ignored the range
+            return content, time.perf_counter()
+
+    def fetch_many(self, urls):
+        """Download every URL concurrently; returns {url: bytes}"""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            probes = dict(zip(urls, pool.map(self._probe, urls)))
+
+            parts = {}  # url -> [future, ...] in byte order
+            for url in urls:
+                size, ranges = probes[url]
+                if ranges and size and size > self.part_size:
+                    parts[url] = [pool.submit(self._get, url, first, min(first + self.part_size, size) - 1)
+                                  for first in range(0, size, self.part_size)]
+                else:
+                    parts[url] = [pool.submit(self._get, url)]
+
+            results = {url: [future.result() for future in futures] for url, futures in parts.items()}
+
+        blobs = {}
+        for url, chunks in results.items():
+            blobs[url] = blob = b''.join(content for content, _ in chunks)
+            seconds = max(finished for _, finished in chunks) - start
+            self.stats[url] = {'bytes': len(blob), 'parts': len(parts[url]), 'seconds': seconds,
+                               'mb_per_s': len(blob) / 1024 ** 2 / seconds if seconds else float('inf')}
+        total_bytes = sum(len(blob) for blob in blobs.values())
+        total_seconds = time.perf_counter() - start
+        self.stats['total'] = {'bytes': total_bytes, 'parts': sum(len(f) for f in parts.values()),
+                               'seconds': total_seconds, 'mb_per_s': total_bytes / 1024 ** 2 / total_seconds}
+        return blobs
+
+    def fetch(self, url):
+        return self.fetch_many([url])[url]
+
+    def fetch_ranges(self, url, ranges):
+        """Bytes first..last (inclusive) for each (first, last) of one URL, fetched concurrently"""
+        if len(ranges) == 1:
+            return [self._get(url, *ranges[0])[0]]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return [content for content, _ in pool.map(lambda r: self._get(url, *r), ranges)]
+
+    def report(self):
+        """One line per artifact: size, parts, time and throughput"""
+        return '\n'.join(
+            f"{url.rsplit('/', 1)[-1]}: {s['bytes'] / 1024 ** 2:.1f} MB in {s['parts']} part(s), "
+            f"{s['seconds']:.2f}s ({s['mb_per_s']:.1f} MB/s)"
+            for url, s in self.stats.items()
+        )
@@ -0,0 +1,60 @@
+"""
+Formula-based price estimator (demo / last-resort fallback)
+
+The hand-tuned pricing rules that used to live inline in app_new.py and
+archive/app_new.py, rewritten to work on whole columns. A one-row call
+gives exactly the same ₹ value as the old scalar if-chain, a 400k-row
+call costs a few numpy operations.
+"""
+
+import numpy as np
+
+BASE_PRICE = 30000
+RAM_PRICE_PER_GB = 1500
+SSD_PRICE_PER_GB = 30
+HDD_PRICE_PER_GB = 10
+
+PREMIUM_BRANDS = ['Apple', 'Microsoft']          # x1.5
+MAINSTREAM_BRANDS = ['Dell', 'HP', 'Lenovo']     # x1.2
+TYPE_PREMIUMS = {'Gaming': 1.3, 'Ultrabook': 1.2}
+NVIDIA_PREMIUM = 15000
+AMD_PREMIUM = 10000
+
+
+def estimate_prices(columns):
+    """
+    Estimate prices for a column mapping with company, type_name, ram,
+    ssd, hdd and gpu (other fields are ignored). Returns int64 ₹ prices.
+    """
+    company = np.asarray(columns['company'], dtype=str)
+    type_name = np.asarray(columns['type_name'], dtype=str)
+    gpu = np.asarray(columns['gpu'], dtype=str)
+
+    # Same order of operations as the scalar version, so float rounding matches
+    price = (BASE_PRICE
+             + np.asarray(columns['ram'], dtype=np.int64) * RAM_PRICE_PER_GB
+             + np.asarray(columns['ssd'], dtype=np.int64) * SSD_PRICE_PER_GB
+             + np.asarray(columns['hdd'], dtype=np.int64) * HDD_PRICE_PER_GB).astype(float)
+
+    # Brand premium
+    price = np.where(np.isin(company, PREMIUM_BRANDS), price * 1.5,
+                     np.where(np.isin(company, MAINSTREAM_BRANDS), price * 1.2, price))
+
+    # Type premium
+    for type_value, multiplier in TYPE_PREMIUMS.items():
+        price = np.where(type_name == type_value, price * multiplier, price)
+
+    # GPU premium
+    nvidia = np.char.find(gpu, 'Nvidia') >= 0
+    amd = ~nvidia & (np.char.find(gpu, 'AMD') >= 0)
+    price = np.where(nvidia, price + NVIDIA_PREMIUM, np.where(amd, price + AMD_PREMIUM, price))
+
+    return price.astype(np.int64)
+
+
+def estimate_price(company, type_name, ram, ssd, hdd, gpu):
+    """Single-configuration convenience wrapper around estimate_prices"""
+    return int(estimate_prices({
+        'company': [company], 'type_name': [type_name], 'ram': [ram],
+        'ssd': [ssd], 'hdd': [hdd], 'gpu': [gpu]
+    })[0])
@@ -0,0 +1,151 @@
+"""
+Feature engineering shared with notebooks/lpp.ipynb
+
+The trained pipeline (pipe.pkl) expects the notebook's engineered columns,
+while the app works with the UI's configuration fields. These helpers map
+one onto the other, column-wise.
+"""
+
+import numpy as np
+
+from .keys import canonicalize_columns
+
+# Column order of X in the notebook (df without 'Price')
+MODEL_COLUMNS = [
+    'Company', 'TypeName', 'Ram', 'Weight', 'Touchscreen', 'Ips', 'ppi',
+    'Cpu brand', 'HDD', 'SSD', 'Gpu_Brand', 'os'
+]
+
+# UI spelling -> training data spelling
+COMPANY_ALIASES = {'ASUS': 'Asus'}
+
+
+def fetch_processor(text):
+    """Same bucketing as the notebook: 'Intel Core i3 6006U 2GHz' -> 'Intel Core i3'"""
+    text = " ".join(str(text).split()[0:3])
+    if text == 'Intel Core i7' or text == 'Intel Core i5' or text == 'Intel Core i3':
+        return text
+    if text.split()[0] == 'Intel':
+        return 'other Intel processor'
+    return 'Amd processor'
+
+
+def cat_os(inp):
+    """Same bucketing as the notebook (plus Windows 11, which the UI offers)"""
+    if inp in ('Windows 10', 'Windows 11', 'Windows 7', 'Windows 10 S'):
+        return 'Windows'
+    if inp in ('macOS', 'Mac OS X'):
+        return 'Mac'
+    return 'Others/No os/Linux'
+
+
+def gpu_brand(gpu):
+    """'Nvidia GeForce RTX 3060' -> 'Nvidia'"""
+    return str(gpu).split()[0]
+
+
+def calculate_ppi(resolution, inches):
+    """Pixels per inch from 'WxH' resolution strings and screen sizes (arrays)"""
+    dims = [str(r).lower().split('x') for r in resolution]
+    x_res = np.array([float(d[0]) for d in dims])
+    y_res = np.array([float(d[1]) for d in dims])
+    return np.sqrt(x_res ** 2 + y_res ** 2) / np.asarray(inches, dtype=float)
+
+
+def model_columns(canonical):
+    """
+    Map canonical UI config columns (see keys.canonicalize_columns) to the
+    pipeline's input columns, returned as {MODEL_COLUMN: list}
+    """
+    return {
+        'Company': [COMPANY_ALIASES.get(c, c) for c in canonical['company']],
+        'TypeName': list(canonical['type_name']),
+        'Ram': list(canonical['ram']),
+        'Weight': list(canonical['weight']),
+        'Touchscreen': list(canonical['touchscreen']),
+        'Ips': list(canonical['ips']),
+        'ppi': calculate_ppi(canonical['resolution'], canonical['screen_size']).tolist(),
+        'Cpu brand': [fetch_processor(c) for c in canonical['cpu']],
+        'HDD': list(canonical['hdd']),
+        'SSD': list(canonical['ssd']),
+        'Gpu_Brand': [gpu_brand(g) for g in canonical['gpu']],
+        'os': [cat_os(o) for o in canonical['os']],
+    }
+
+
+def storage_sizes(memory):
+    """"256GB SSD +  1TB HDD" -> (SSD=256, HDD=1000), for a Series of Memory strings"""
+    memory = memory.astype(str).replace(r'\.0', '', regex=True)
+    memory = memory.str.replace('GB', '').str.replace('TB', '000')
+    layers = memory.str.split('+', n=1, expand=True)
+    first = layers[0]
+    second = layers[1].fillna('0') if 1 in layers else first.map(lambda _: '0')
+    first_size = first.str.replace(r'\D', '', regex=True).astype(int)
+    second_size = second.str.replace(r'\D', '', regex=True).astype(int)
+    ssd = first_size * first.str.contains('SSD') + second_size * second.str.contains('SSD')
+    hdd = first_size * first.str.contains('HDD') + second_size * second.str.contains('HDD')
+    return ssd, hdd
+
+
+def raw_config_columns(df):
+    """
+    Raw laptop_data.csv-style rows as app configuration columns
+    (lapprice.keys.CONFIG_FIELDS); CPU and GPU keep their full names
+    """
+    resolution = df['ScreenResolution'].str.extract(r'(\d+)x(\d+)')
+    ssd, hdd = storage_sizes(df['Memory'])
+    return {
+        'company': df['Company'].tolist(),
+        'type_name': df['TypeName'].tolist(),
+        'ram': df['Ram'].astype(str).str.replace('GB', '').astype(int).tolist(),
+        'cpu': df['Cpu'].tolist(),
+        'gpu': df['Gpu'].tolist(),
+        'ssd': ssd.tolist(),
+        'hdd': hdd.tolist(),
+        'os': df['OpSys'].tolist(),
+        'screen_size': df['Inches'].astype(float).tolist(),
+        'weight': df['Weight'].astype(str).str.replace('kg', '').astype(float).tolist(),
+        'resolution': (resolution[0] + 'x' + resolution[1]).tolist(),
+        'touchscreen': df['ScreenResolution'].str.contains('Touchscreen').astype(int).tolist(),
+        'ips': df['ScreenResolution'].str.contains('IPS').astype(int).tolist(),
+    }
+
+
+def engineer_raw_frame(df):
+    """
+    Notebook feature engineering on the raw laptop_data.csv frame
+
+    Returns a new DataFrame with MODEL_COLUMNS + 'Price', matching
+    models/df.pkl row for row.
+    """
+    df = df.drop(columns=['Unnamed: 0'], errors='ignore').copy()
+
+    df['Ram'] = df['Ram'].str.replace('GB', '').astype('int32')
+    df['Weight'] = df['Weight'].str.replace('kg', '').astype('float32')
+
+    df['Touchscreen'] = df['ScreenResolution'].str.contains('Touchscreen').astype(int)
+    df['Ips'] = df['ScreenResolution'].str.contains('IPS').astype(int)
+    resolution = df['ScreenResolution'].str.split('x', n=1, expand=True)
+    x_res = resolution[0].str.replace(',', '').str.findall(r'(\d+\.?\d+)').apply(lambda x: x[0]).astype(int)
+    y_res = resolution[1].astype(int)
+    df['ppi'] = (x_res ** 2 + y_res ** 2) ** 0.5 / df['Inches'].astype('float')
+
+    df['Cpu brand'] = df['Cpu'].apply(fetch_processor)
+    df['SSD'], df['HDD'] = storage_sizes(df['Memory'])
+
+    df['Gpu_Brand'] = df['Gpu'].apply(gpu_brand)
+    df = df[df['Gpu_Brand'] != 'ARM'].copy()
+
+    df['os'] = df['OpSys'].apply(cat_os)
+
+    return df[MODEL_COLUMNS[:4] + ['Price'] + MODEL_COLUMNS[4:]]
+
+
+def config_pricer(model):
+    """
+    Wrap a CompiledPipeline (pipe export or fallback model) as a batch
+    fallback: callable(config columns) -> prices in ₹
+    """
+    def price(columns):
+        return model.predict_price(model_columns(canonicalize_columns(columns)))
+    return price
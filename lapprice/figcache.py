@@ -0,0 +1,137 @@
+"""
+Bounded cache for Plotly figures keyed by their inputs
+
+Building a go.Figure validates every property, which costs more than the
+numbers behind it, and st.plotly_chart then converts and serializes the
+figure to JSON again on every rerun. The app's figures are pure functions
+of a few inputs (price, spec tuple, score), so a figure is built and
+serialized once and its JSON spec is handed out again for the same inputs,
+across reruns and sessions of this process.
+
+    fig = figure_cache.get('tco', (predicted_price,), lambda: build_tco_figure(predicted_price))
+    plotly_chart(fig)  # sends the cached spec, no conversion or serialization
+
+plotly_chart() relies on Streamlit element internals (written against
+Streamlit 1.66). Their signatures are checked against the calls made here
+at import, and any error while rendering turns the fast path off for the
+process: either way it falls back to the public st.plotly_chart on the
+cached figure (the build is still saved, the serialization isn't).
+
+Cached figures are shared: callers must not mutate what they get back.
+"""
+
+import inspect
+import threading
+from collections import OrderedDict, namedtuple
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_HEIGHT = 450  # what st.plotly_chart uses for a figure without a layout height
+
+# The element id arguments st.plotly_chart(fig, use_container_width=True) hashes
+ELEMENT_ID_ARGS = dict(
+    user_key=None, key_as_main_identity=False, selection_mode=('points', 'box', 'lasso'),
+    is_selection_activated=False, theme='streamlit', width='stretch', height='content', alt=None,
+)
+
+try:
+    from streamlit.delta_generator import DeltaGenerator
+    from streamlit.elements.lib.form_utils import current_form_id
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+    from streamlit.elements.lib.utils import compute_and_register_element_id
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+    # Same names, different signatures (another Streamlit version): use the public path
+    inspect.signature(compute_and_register_element_id).bind(
+        'plotly_chart', dg=None, plotly_spec='', plotly_config='', **ELEMENT_ID_ARGS)
+    inspect.signature(DeltaGenerator._enqueue).bind(None, 'plotly_chart', None, layout_config=None)
+    LayoutConfig(width='stretch', height=DEFAULT_HEIGHT)
+    fast_path_error = None
+except Exception as e:  # pragma: no cover - older / newer Streamlit
+    fast_path_error = e
+
+# figure: the built go.Figure; spec: its JSON as st.plotly_chart would send it
+CachedFigure = namedtuple('CachedFigure', 'figure spec height')
+
+
+def _serialize(fig):
+    import plotly.io
+    return CachedFigure(fig, plotly.io.to_json(fig, validate=False), fig.layout.height)
+
+
+class FigureCache:
+    """LRU of built, serialized figures keyed by (figure name, inputs), with hit/miss counts"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {}  # name -> [hits, misses]
+
+    def get(self, name, inputs, build):
+        """CachedFigure for (name, inputs), calling build() (and serializing) on a miss"""
+        key = (name, inputs)
+        with self._lock:
+            counts = self._counts.setdefault(name, [0, 0])
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                counts[0] += 1
+                return fig
+            counts[1] += 1
+
+        # Build outside the lock; a concurrent miss on the same key just builds twice
+        fig = _serialize(build())
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return fig
+
+    def stats(self):
+        with self._lock:
+            hits = sum(h for h, _ in self._counts.values())
+            misses = sum(m for _, m in self._counts.values())
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'size': len(self._figures),
+                'maxsize': self.maxsize,
+                'by_figure': {name: {'hits': h, 'misses': m} for name, (h, m) in self._counts.items()},
+                'fast_path_error': fast_path_error,  # None while plotly_chart() sends cached specs
+            }
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self._counts.clear()
+
+
+def plotly_chart(cached):
+    """st.plotly_chart(cached.figure, use_container_width=True), sending the cached spec as is"""
+    global fast_path_error
+    import streamlit as st
+    if fast_path_error is None:
+        try:
+            return _send_spec(st, cached)
+        except Exception as e:
+            fast_path_error = e  # don't retry on every chart; Developer Metrics shows why
+    return st.plotly_chart(cached.figure, use_container_width=True)
+
+
+def _send_spec(st, cached):
+    dg = st._main  # enqueues into the active `with` container, like st.plotly_chart
+    proto = PlotlyChartProto()
+    proto.theme = 'streamlit'
+    proto.form_id = current_form_id(dg)
+    proto.spec = cached.spec
+    proto.config = '{}'
+    layout = LayoutConfig(width='stretch', height=cached.height or DEFAULT_HEIGHT)
+    proto.id = compute_and_register_element_id(
+        'plotly_chart', dg=dg, plotly_spec=proto.spec, plotly_config=proto.config, **ELEMENT_ID_ARGS)
+    return dg._enqueue('plotly_chart', proto, layout_config=layout)
+
+
+# Process-wide instance used by the app
+figure_cache = FigureCache()
@@ -0,0 +1,196 @@
+"""
+Dense configuration grid - O(1) answers without hashing
+
+The categorical options form a finite cross-product, so every combination
+gets a fixed slot: its ordinal in mixed-radix arithmetic (like digits of a
+number whose base changes per position). Screen size and weight are
+continuous, so they are sampled at a few knots and interpolated bilinearly
+at query time.
+
+values has shape (*radices, len(screen_knots), len(weight_knots)).
+Fields that are not gridded are pinned to one value (`fixed`); queries with
+a different value for them fall outside the grid and come back as NaN,
+unless the grid carries `offsets` for that field: per-option log-price
+offsets from the pinned value, which extend the grid to the whole form
+(exact for log-additive models, a close approximation otherwise).
+
+A compact grid stores values as uint16 codes of log price (`log_range`):
+half the size of float32, with a rounding error of a few rupees.
+"""
+
+import json
+
+import numpy as np
+
+from .keys import canonicalize_columns
+
+DEFAULT_GRID_FIELDS = ('company', 'type_name', 'ram', 'cpu', 'gpu', 'ssd')
+DEFAULT_SCREEN_KNOTS = (10.0, 13.3, 15.6, 18.0)
+DEFAULT_WEIGHT_KNOTS = (0.5, 2.0, 5.0)
+QUANTIZED_LEVELS = 2 ** 16 - 1
+
+
+def _axis_array(values):
+    return np.array(values, dtype=np.int64) if isinstance(values[0], (int, np.integer)) else np.array(values, dtype=str)
+
+
+def quantize_log_prices(values):
+    """uint16 codes of log(values) plus (log low, log step) to decode them"""
+    logs = np.log(np.maximum(np.asarray(values, dtype=float), 1.0))
+    low, high = float(logs.min()), float(logs.max())
+    step = (high - low) / QUANTIZED_LEVELS or 1.0
+    return np.rint((logs - low) / step).astype(np.uint16), (low, step)
+
+
+class ConfigGrid:
+    """Mixed-radix indexed price tensor over a categorical cross-product"""
+
+    def __init__(self, axes, screen_knots, weight_knots, values, fixed=None, offsets=None, log_range=None):
+        self.fields = [field for field, _ in axes]
+        self.axis_values = [_axis_array(options) for _, options in axes]
+        self.radices = tuple(len(options) for options in self.axis_values)
+        self.screen_knots = np.asarray(screen_knots, dtype=float)
+        self.weight_knots = np.asarray(weight_knots, dtype=float)
+        self.fixed = dict(fixed or {})
+        # field -> {option: log-price offset from the pinned value}
+        self.offsets = {field: dict(options) for field, options in (offsets or {}).items()}
+        self.log_range = tuple(log_range) if log_range is not None else None  # set when values are codes
+        self.values = np.asarray(values).reshape(
+            int(np.prod(self.radices)), len(self.screen_knots), len(self.weight_knots)
+        )
+        self._sorters = [np.argsort(options) for options in self.axis_values]
+
+    @property
+    def shape(self):
+        return self.radices + (len(self.screen_knots), len(self.weight_knots))
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    # ------------------------------------------------------------------
+    # Mixed-radix ordinals
+    # ------------------------------------------------------------------
+
+    def _axis_indices(self, axis, queried):
+        """Position of each queried value in one axis (-1 if not an option)"""
+        options = self.axis_values[axis]
+        sorter = self._sorters[axis]
+        queried = np.asarray(queried, dtype=np.int64 if options.dtype.kind == 'i' else str)
+        found = np.searchsorted(options, queried, sorter=sorter)
+        found = sorter[np.minimum(found, len(options) - 1)]
+        return np.where(options[found] == queried, found, -1)
+
+    def pinned_offsets(self, canonical):
+        """(valid mask, summed log-price offset) of each row's pinned fields"""
+        n = len(canonical[self.fields[0]])
+        valid = np.ones(n, dtype=bool)
+        offset = np.zeros(n)
+        for field, value in self.fixed.items():
+            options = self.offsets.get(field, {value: 0.0})
+            row_offsets = np.array([options.get(v, np.nan) for v in canonical[field]], dtype=float)
+            valid &= ~np.isnan(row_offsets)
+            offset += np.nan_to_num(row_offsets)
+        return valid, offset
+
+    def ordinals(self, canonical):
+        """Flat categorical ordinal for each row, -1 where it is off-grid"""
+        n = len(canonical[self.fields[0]])
+        valid, _ = self.pinned_offsets(canonical)
+
+        digits = []
+        for axis, field in enumerate(self.fields):
+            index = self._axis_indices(axis, canonical[field])
+            valid &= index >= 0
+            digits.append(np.maximum(index, 0))
+
+        ordinal = np.ravel_multi_index(digits, self.radices) if n else np.zeros(0, dtype=np.int64)
+        return np.where(valid, ordinal, -1)
+
+    def configs_for(self, ordinals):
+        """Inverse of ordinals(): the categorical values of each slot"""
+        digits = np.unravel_index(ordinals, self.radices)
+        return {field: self.axis_values[axis][digits[axis]].tolist() for axis, field in enumerate(self.fields)}
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _bracket(knots, queried):
+        """Lower knot index and interpolation weight, clamped to the knot range"""
+        queried = np.clip(queried, knots[0], knots[-1])
+        if len(knots) == 1:
+            return np.zeros(len(queried), dtype=np.int64), np.zeros(len(queried))
+        lower = np.clip(np.searchsorted(knots, queried, side='right') - 1, 0, len(knots) - 2)
+        t = (queried - knots[lower]) / (knots[lower + 1] - knots[lower])
+        return lower, t
+
+    def lookup(self, columns):
+        """Prices for a column mapping of configurations, NaN where off-grid"""
+        canonical = canonicalize_columns(columns)
+        ordinal = self.ordinals(canonical)
+        prices = np.full(len(ordinal), np.nan)
+        on_grid = ordinal >= 0
+        if not on_grid.any():
+            return prices
+
+        rows = ordinal[on_grid]
+        s0, ts = self._bracket(self.screen_knots, np.asarray(canonical['screen_size'], dtype=float)[on_grid])
+        w0, tw = self._bracket(self.weight_knots, np.asarray(canonical['weight'], dtype=float)[on_grid])
+        s1 = np.minimum(s0 + 1, len(self.screen_knots) - 1)
+        w1 = np.minimum(w0 + 1, len(self.weight_knots) - 1)
+
+        cell = self._cells
+        prices[on_grid] = (
+            cell(rows, s0, w0) * (1 - ts) * (1 - tw)
+            + cell(rows, s1, w0) * ts * (1 - tw)
+            + cell(rows, s0, w1) * (1 - ts) * tw
+            + cell(rows, s1, w1) * ts * tw
+        )
+        if self.offsets:
+            _, offset = self.pinned_offsets(canonical)
+            prices[on_grid] *= np.exp(offset[on_grid])
+        return prices
+
+    def _cells(self, rows, screen, weight):
+        """Prices at the given knots, decoding uint16 codes if the grid is compact"""
+        cells = self.values[rows, screen, weight]
+        if self.log_range is None:
+            return cells
+        low, step = self.log_range
+        return np.exp(low + cells * step)
+
+    # ------------------------------------------------------------------
+    # Persistence (.npz, no pickle)
+    # ------------------------------------------------------------------
+
+    def save(self, path, quantize=False):
+        """Write an .npz; quantize=True stores uint16 log-price codes (compact grid)"""
+        values, log_range = self.values, self.log_range
+        if quantize and log_range is None:
+            values, log_range = quantize_log_prices(values)
+        meta = {
+            'fields': self.fields,
+            'fixed': self.fixed,
+            # Lists of [option, offset] pairs: JSON object keys would turn ints into strings
+            'offsets': {field: [[option, offset] for option, offset in options.items()]
+                        for field, options in self.offsets.items()},
+            'log_range': log_range,
+        }
+        arrays = {f'axis_{i}': options for i, options in enumerate(self.axis_values)}
+        np.savez(
+            path,
+            meta=np.array(json.dumps(meta)),
+            screen_knots=self.screen_knots,
+            weight_knots=self.weight_knots,
+            values=values,
+            **arrays
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            axes = [(field, data[f'axis_{i}'].tolist()) for i, field in enumerate(meta['fields'])]
+            return cls(axes, data['screen_knots'], data['weight_knots'], data['values'], meta['fixed'],
+                       meta.get('offsets'), meta.get('log_range'))
@@ -0,0 +1,87 @@
+"""
+Canonical laptop configuration keys
+
+Every lookup path (app, API, precompute) must turn the same laptop specs
+into the same key, so the key format lives here in one place.
+"""
+
+import hashlib
+
+import numpy as np
+
+# Order matters: it is the order the fields appear in the key string
+CONFIG_FIELDS = (
+    'company', 'type_name', 'ram', 'cpu', 'gpu', 'ssd', 'hdd', 'os',
+    'screen_size', 'weight', 'resolution', 'touchscreen', 'ips'
+)
+
+TEXT_FIELDS = ('company', 'type_name', 'cpu', 'gpu', 'os', 'resolution')
+INT_FIELDS = ('ram', 'ssd', 'hdd')
+FLOAT_FIELDS = ('screen_size', 'weight')
+FLAG_FIELDS = ('touchscreen', 'ips')
+
+KEY_LENGTH = 12
+KEY_DTYPE = f'S{KEY_LENGTH}'
+
+
+def _flag(value):
+    """Turn Yes/No, bools and 0/1 into 0/1"""
+    if isinstance(value, str):
+        return 1 if value.strip().lower() in ('yes', '1', 'true') else 0
+    return 1 if value else 0
+
+
+def canonicalize_columns(columns):
+    """
+    Normalise a column mapping (dict of lists, DataFrame, ...) field by field
+
+    Sliders can hand back 15.600000000000001, selectboxes can hand back
+    "8" instead of 8 - this makes sure both spellings give the same key.
+    """
+    canonical = {}
+    for field in TEXT_FIELDS:
+        canonical[field] = [str(v).strip() for v in columns[field]]
+    for field in INT_FIELDS:
+        canonical[field] = np.asarray(columns[field], dtype=float).astype(np.int64).tolist()
+    for field in FLOAT_FIELDS:
+        canonical[field] = np.round(np.asarray(columns[field], dtype=float), 1).tolist()
+    for field in FLAG_FIELDS:
+        canonical[field] = [_flag(v) for v in columns[field]]
+    return canonical
+
+
+def _key_string(company, type_name, ram, cpu, gpu, ssd, hdd, os, screen_size, weight, resolution, touchscreen, ips):
+    return f"{company}_{type_name}_{ram}GB_{cpu}_{gpu}_{ssd}SSD_{hdd}HDD_{os}_{screen_size}in_{weight}kg_{resolution}_touch{touchscreen}_ips{ips}"
+
+
+def create_laptop_hash(company, type_name, ram, cpu, gpu, ssd, hdd, os, screen_size, weight, resolution, touchscreen, ips):
+    """Create a unique hash key for laptop configuration"""
+    config = {
+        'company': [company], 'type_name': [type_name], 'ram': [ram], 'cpu': [cpu],
+        'gpu': [gpu], 'ssd': [ssd], 'hdd': [hdd], 'os': [os],
+        'screen_size': [screen_size], 'weight': [weight], 'resolution': [resolution],
+        'touchscreen': [touchscreen], 'ips': [ips]
+    }
+    return hash_columns(config)[0].decode()
+
+
+def hash_columns(columns):
+    """
+    Hash many configurations at once
+
+    Returns a numpy array of fixed-width byte keys (dtype S12), one per
+    row, which is what PredictionIndex.probe expects.
+    """
+    return hash_canonical_columns(canonicalize_columns(columns))
+
+
+def hash_canonical_columns(canonical):
+    """Hash columns that already went through canonicalize_columns"""
+    rows = zip(*(canonical[field] for field in CONFIG_FIELDS))
+    keys = [hashlib.md5(_key_string(*row).encode()).hexdigest()[:KEY_LENGTH] for row in rows]
+    return np.array(keys, dtype=KEY_DTYPE)
+
+
+def columns_from_records(records):
+    """Turn a list of config dicts into a column mapping"""
+    return {field: [record[field] for record in records] for field in CONFIG_FIELDS}
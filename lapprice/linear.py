@@ -0,0 +1,74 @@
+"""
+Closed-form log-price model for fallback estimates
+
+A ridge regression on the notebook's engineered features, solved with
+NumPy least squares - no sklearn needed to train or to serve. The result
+is a CompiledPipeline (one-hot encoders + linear model), so it is saved,
+loaded and batch-predicted exactly like the compiled pipe.pkl export.
+"""
+
+import numpy as np
+
+from .compiled import CompiledPipeline
+from .features import MODEL_COLUMNS
+
+CATEGORICAL_COLUMNS = ['Company', 'TypeName', 'Cpu brand', 'Gpu_Brand', 'os']
+
+
+def _layout(columns):
+    """One-hot encoders (first category dropped, like the notebook) + passthrough"""
+    encoders, passthrough = [], []
+    offset = 0
+    for index, name in enumerate(MODEL_COLUMNS):
+        if name in CATEGORICAL_COLUMNS:
+            categories = sorted({str(v) for v in columns[name]})
+            encoders.append({'column': index, 'categories': categories, 'numeric': False,
+                             'drop': 0, 'offset': offset})
+            offset += len(categories) - 1
+    for index, name in enumerate(MODEL_COLUMNS):
+        if name not in CATEGORICAL_COLUMNS:
+            passthrough.append((index, offset))
+            offset += 1
+    return encoders, passthrough, offset
+
+
+def solve_ridge(X, y, alpha):
+    """
+    Ridge coefficients via least squares on the augmented system
+    [X; sqrt(alpha) I] w = [y; 0], on standardised columns so the penalty
+    treats ppi and SSD-in-GB alike. The intercept is not penalised.
+    """
+    mean_x, mean_y = X.mean(axis=0), y.mean()
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+
+    Z = (X - mean_x) / scale
+    A = np.vstack([Z, np.sqrt(alpha) * np.eye(X.shape[1])])
+    b = np.concatenate([y - mean_y, np.zeros(X.shape[1])])
+    w, *_ = np.linalg.lstsq(A, b, rcond=None)
+
+    coef = w / scale
+    intercept = mean_y - mean_x @ coef
+    return coef, float(intercept)
+
+
+def fit_log_price_model(columns, prices, alpha=1.0):
+    """
+    Fit log(price) ~ features on {MODEL_COLUMN: values} and return a
+    CompiledPipeline that predicts log prices (predict_price gives ₹)
+    """
+    encoders, passthrough, n_features = _layout(columns)
+    meta = {
+        'input_columns': list(MODEL_COLUMNS),
+        'encoders': encoders,
+        'passthrough': passthrough,
+        'n_features': n_features,
+        'log_target': True,
+        'model': {'kind': 'linear', 'coef': 'linear_coef', 'intercept': 0.0},
+    }
+    model = CompiledPipeline(meta, {'linear_coef': np.zeros(n_features)})
+
+    coef, intercept = solve_ridge(model.transform(columns), np.log(np.asarray(prices, dtype=float)), alpha)
+    model.arrays['linear_coef'] = coef
+    meta['model']['intercept'] = intercept
+    return model
@@ -0,0 +1,198 @@
+"""
+Background loading of the predictions store
+
+The pre-computed store is a 58 MB JSON download. StoreLoader runs the
+download + parse on a daemon thread so the app can render and answer with
+its fallback estimators meanwhile; reruns simply check ready() and switch
+over once the store is in memory.
+
+    loader = shared_loader('predictions', fetch_predictions)
+    predictions = loader.get(wait=0) or {}
+    predictions, version = loader.snapshot(wait=0)   # the store and its version, together
+
+shared_loader is single-flight: however many sessions arrive at a cold
+process at once, one StoreLoader per name exists and its load runs exactly
+once; everyone else joins it and either waits (get(wait=...)) or gets None
+and uses a fallback. The counters in status() record all of this.
+
+Hot reload: given a version() callable (e.g. the version in a manifest
+file), watch(interval) polls it and, when it changes, reload() builds a
+second copy of the store on a background thread while the current one
+keeps serving. Only the finished copy is swapped in, with one reference
+assignment of the (store, version) pair, so a session sees either the old
+store or the new one, never a partial one, and never one store with the
+other's version. The old copy is freed as soon as the last rerun holding
+it finishes.
+
+The load function runs off the script thread: it must not call st.*.
+"""
+
+import threading
+import time
+
+IDLE, LOADING, READY, FAILED = 'idle', 'loading', 'ready', 'failed'
+
+
+class StoreLoader:
+    """Runs load() once on a background thread and holds its result"""
+
+    def __init__(self, load, name='predictions', version=None):
+        self.name = name
+        self.state = IDLE
+        self.current = (None, None)  # (value, version), always replaced as one tuple
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._load = load
+        self._version = version
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._watcher = None
+        # Hot reload
+        self.reloading = False
+        self.swaps = 0            # completed reloads
+        self.reload_error = None
+        # Single-flight accounting
+        self.fetches = 0    # times load() actually ran
+        self.joined = 0     # start() calls that found a load already started
+        self.waits = 0      # get() calls that blocked on the in-flight load
+        self.fallbacks = 0  # get() calls that returned None (store not ready)
+
+    @property
+    def value(self):
+        return self.current[0]
+
+    @property
+    def version(self):
+        """Version of the store being served"""
+        return self.current[1]
+
+    def start(self):
+        """Start loading (no-op if already started)"""
+        with self._lock:
+            if self.state != IDLE:
+                self.joined += 1
+                return self
+            self.state = LOADING
+            self.started_at = time.time()
+            self.fetches += 1
+        threading.Thread(target=self._run, name=f'lapprice-load-{self.name}', daemon=True).start()
+        return self
+
+    def _read_version(self):
+        """Current version from the version() callable; None if unknown or unreadable"""
+        if self._version is None:
+            return None
+        try:
+            return self._version()
+        except Exception:
+            return None
+
+    def _run(self):
+        try:
+            version = self._read_version()  # read first: a change during the load triggers another
+            self.current = (self._load(), version)
+            self.state = READY
+        except Exception as e:
+            self.error = e
+            self.state = FAILED
+        finally:
+            self.finished_at = time.time()
+            self._done.set()
+
+    def reload(self):
+        """Build a fresh copy in the background and swap it in once complete; False if one is under way"""
+        with self._lock:
+            if self.state not in (READY, FAILED) or self.reloading:
+                return False
+            self.reloading = True
+        threading.Thread(target=self._run_reload, name=f'lapprice-reload-{self.name}', daemon=True).start()
+        return True
+
+    def _run_reload(self):
+        try:
+            version = self._read_version()
+            value = self._load()              # second buffer, invisible until complete
+            self.current = (value, version)   # the swap: one reference assignment
+            self.error = None
+            self.state = READY
+            self.swaps += 1
+            self.reload_error = None
+        except Exception as e:
+            self.reload_error = e  # keep serving the current copy
+        finally:
+            self.reloading = False
+
+    def watch(self, interval):
+        """Poll version() every interval seconds and reload when it changes (one watcher per loader)"""
+        with self._lock:
+            if self._watcher is not None or self._version is None:
+                return self
+            self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                             name=f'lapprice-watch-{self.name}', daemon=True)
+        self._watcher.start()
+        return self
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            if self.state in (READY, FAILED) and not self.reloading:
+                version = self._read_version()
+                if version is not None and version != self.version:
+                    self.reload()
+
+    def ready(self):
+        return self.state == READY
+
+    def snapshot(self, wait=0.0):
+        """
+        (value, version) of the store being served, from one read - waiting
+        up to `wait` seconds for an in-flight load; (None, None) if not ready
+        """
+        if self.state == LOADING and wait:
+            with self._lock:
+                self.waits += 1
+            self._done.wait(wait)
+        if self.state == READY:
+            return self.current
+        with self._lock:
+            self.fallbacks += 1
+        return None, None
+
+    def get(self, wait=0.0):
+        """The loaded value, waiting up to `wait` seconds for an in-flight load; None if not ready"""
+        return self.snapshot(wait)[0]
+
+    def wait(self, timeout=None):
+        """Block until loading finished (either way); True if it did within timeout"""
+        return self._done.wait(timeout)
+
+    def status(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at if self.started_at else 0.0
+        return {
+            'name': self.name,
+            'state': self.state,
+            'elapsed_s': elapsed,
+            'error': str(self.error) if self.error else None,
+            'fetches': self.fetches,
+            'joined': self.joined,
+            'waits': self.waits,
+            'fallbacks': self.fallbacks,
+            'version': self.version,
+            'reloading': self.reloading,
+            'swaps': self.swaps,
+            'reload_error': str(self.reload_error) if self.reload_error else None,
+        }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def shared_loader(name, load, version=None):
+    """The process-wide StoreLoader for name, created and started by the first caller"""
+    with _registry_lock:
+        loader = _registry.get(name)
+        if loader is None:
+            loader = _registry[name] = StoreLoader(load, name, version)
+    return loader.start()
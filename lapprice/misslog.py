@@ -0,0 +1,101 @@
+"""
+Append-only log of lookup misses, for offline coverage expansion
+
+Every configuration the pre-computed store could not answer is appended
+to a JSON Lines file as {"key", "n", "config"} (canonical fields, so the
+offline job can price it exactly as asked). Lines are only ever appended;
+counts come from adding up "n" per key when the log is read.
+
+    log = MissLog('data/lookups/misses.jsonl')
+    log.record(key, config)                        # one miss (app)
+    log.record_many(keys, canonical, misses)       # batch misses (API)
+
+    top_misses('data/lookups/misses.jsonl', 1000)  # [(key, count, config)] most frequent first
+
+scripts/precompute_misses.py prices the most frequent ones and publishes
+them as a delta next to the store, which the app overlays on the store
+(lapprice.backends.OverlayBackend) - real traffic drives coverage up.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+from .keys import CONFIG_FIELDS, canonicalize_columns
+
+
+class MissLog:
+    """Appends misses to a JSON Lines file; write errors are kept, not raised"""
+
+    def __init__(self, path):
+        self.path = path
+        self.recorded = 0  # misses written by this process
+        self.error = None
+        self._lock = threading.Lock()
+
+    def _append(self, lines):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._lock, open(self.path, 'a') as f:
+                f.write(''.join(lines))  # one write per call: whole lines only
+            self.error = None
+            return True
+        except OSError as e:
+            self.error = e  # a read-only disk mustn't break predictions
+            return False
+
+    def record(self, key, config):
+        """One miss: key and its config as {field: value} (canonicalized here)"""
+        canonical = canonicalize_columns({field: [config[field]] for field in CONFIG_FIELDS})
+        entry = {'key': key, 'n': 1, 't': round(time.time()),
+                 'config': {field: canonical[field][0] for field in CONFIG_FIELDS}}
+        if self._append([json.dumps(entry) + '\n']):
+            self.recorded += 1
+
+    def record_many(self, keys, canonical, misses):
+        """The rows of canonical columns where misses is True, one line per distinct key"""
+        rows = np.flatnonzero(misses)
+        if not len(rows):
+            return
+        keys = np.asarray(keys).astype(str)
+        counts = Counter(keys[rows].tolist())
+        first = {}
+        for row in rows.tolist():
+            first.setdefault(keys[row], row)
+        now = round(time.time())
+        lines = [json.dumps({'key': key, 'n': n, 't': now,
+                             'config': {field: canonical[field][first[key]] for field in CONFIG_FIELDS}}) + '\n'
+                 for key, n in counts.items()]
+        if self._append(lines):
+            self.recorded += len(rows)
+
+
+def read_misses(path):
+    """{key: [count, config]} over the whole log; unreadable lines (e.g. a torn last line) are skipped"""
+    misses = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                key, n, config = entry['key'], int(entry.get('n', 1)), entry['config']
+            except (ValueError, KeyError, TypeError):
+                continue
+            seen = misses.get(key)
+            if seen is None:
+                misses[key] = [n, config]
+            else:
+                seen[0] += n
+    return misses
+
+
+def top_misses(path, n=None, min_count=1):
+    """[(key, count, config)] most frequent first, at most n, each seen at least min_count times"""
+    ranked = sorted(((key, count, config) for key, (count, config) in read_misses(path).items()
+                     if count >= min_count), key=lambda miss: -miss[1])
+    return ranked[:n] if n is not None else ranked
@@ -0,0 +1,78 @@
+"""
+UI configuration space
+
+The option lists the spec form offers. The app builds its widgets from
+these, and the grid/compact-store builders enumerate them, so both always
+agree on what a "UI-reachable" configuration is.
+"""
+
+DROPDOWN_OPTIONS = {
+    'Company': ['Acer', 'Apple', 'ASUS', 'Dell', 'HP', 'Lenovo', 'MSI', 'Microsoft', 'Razer', 'Samsung'],
+    'TypeName': ['Notebook', 'Ultrabook', 'Gaming', 'Workstation', '2 in 1 Convertible'],
+    'Cpu brand': ['Intel Core i3', 'Intel Core i5', 'Intel Core i7', 'Intel Core i9',
+                  'AMD Ryzen 3', 'AMD Ryzen 5', 'AMD Ryzen 7', 'AMD Ryzen 9',
+                  'Intel Celeron', 'Intel Pentium'],
+    'Gpu_Brand': ['Intel HD Graphics', 'Intel UHD Graphics', 'Intel Iris Xe',
+                  'Nvidia GeForce GTX 1650', 'Nvidia GeForce GTX 1660 Ti',
+                  'Nvidia GeForce RTX 3050', 'Nvidia GeForce RTX 3060',
+                  'Nvidia GeForce RTX 3070', 'Nvidia GeForce RTX 4060',
+                  'AMD Radeon Graphics', 'AMD Radeon RX 6600M'],
+    'os': ['Windows 10', 'Windows 11', 'macOS', 'Linux', 'Chrome OS', 'No OS']
+}
+
+RAM_OPTIONS = [2, 4, 6, 8, 12, 16, 24, 32, 64]
+SSD_OPTIONS = [0, 8, 128, 256, 512, 1024, 2048]
+HDD_OPTIONS = [0, 128, 256, 512, 1024, 2048]
+RESOLUTION_OPTIONS = ['1920x1080', '1366x768', '1600x900', '3840x2160', '2560x1440']
+YES_NO_OPTIONS = ['No', 'Yes']
+
+# Slider ranges: (min, max, step)
+SCREEN_SIZE_RANGE = (10.0, 18.0, 0.1)
+WEIGHT_RANGE = (0.5, 5.0, 0.1)
+
+# Every categorical field of lapprice.keys.CONFIG_FIELDS with its options,
+# in canonical form (flags as 0/1)
+CATEGORICAL_AXES = {
+    'company': DROPDOWN_OPTIONS['Company'],
+    'type_name': DROPDOWN_OPTIONS['TypeName'],
+    'ram': RAM_OPTIONS,
+    'cpu': DROPDOWN_OPTIONS['Cpu brand'],
+    'gpu': DROPDOWN_OPTIONS['Gpu_Brand'],
+    'ssd': SSD_OPTIONS,
+    'hdd': HDD_OPTIONS,
+    'os': DROPDOWN_OPTIONS['os'],
+    'resolution': RESOLUTION_OPTIONS,
+    'touchscreen': [0, 1],
+    'ips': [0, 1],
+}
+
+# What the form shows before the user touches anything
+FORM_DEFAULTS = {
+    'company': DROPDOWN_OPTIONS['Company'][0],
+    'type_name': DROPDOWN_OPTIONS['TypeName'][0],
+    'ram': 8,
+    'cpu': DROPDOWN_OPTIONS['Cpu brand'][0],
+    'gpu': DROPDOWN_OPTIONS['Gpu_Brand'][0],
+    'ssd': 256,
+    'hdd': 0,
+    'os': DROPDOWN_OPTIONS['os'][0],
+    'resolution': '1920x1080',
+    'touchscreen': 0,
+    'ips': 0,
+}
+
+# Slider positions before the user touches anything
+SLIDER_DEFAULTS = {'screen_size': 15.6, 'weight': 2.0}
+
+# Quick-configuration preset buttons: the form fields each one sets (battery
+# and warranty are form-only, not part of the configuration key)
+PRESETS = {
+    'student': {'ram': 8, 'ssd': 256, 'type_name': 'Notebook', 'screen_size': 14.0, 'weight': 1.5,
+                'resolution': '1920x1080', 'hdd': 0, 'battery': 8, 'warranty': 1},
+    'professional': {'ram': 16, 'ssd': 512, 'type_name': 'Ultrabook', 'screen_size': 14.0, 'weight': 1.3,
+                     'resolution': '1920x1080', 'hdd': 0, 'battery': 10, 'warranty': 3},
+    'gamer': {'ram': 16, 'ssd': 1024, 'type_name': 'Gaming', 'screen_size': 15.6, 'weight': 2.5,
+              'resolution': '1920x1080', 'hdd': 0, 'battery': 6, 'warranty': 2},
+    'designer': {'ram': 32, 'ssd': 1024, 'type_name': 'Workstation', 'screen_size': 15.6, 'weight': 2.0,
+                 'resolution': '3840x2160', 'hdd': 0, 'battery': 8, 'warranty': 3},
+}
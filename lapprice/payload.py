@@ -0,0 +1,77 @@
+"""
+Rerun payload measurement
+
+Counts the bytes Streamlit actually sends to the browser during one script
+run, by wrapping the run context's message queue for the duration of the
+rerun. Messages the browser already has cached go out as small references
+and are counted as such.
+
+    meter = PayloadMeter().start()
+    ...  # the rest of the script
+    report = meter.stop()  # {'bytes', 'messages', 'largest': [...]}
+
+Relies on ScriptRunContext internals; if those are not available the meter
+stays inactive and stop() returns None.
+"""
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:  # pragma: no cover - very old / very new Streamlit
+    get_script_run_ctx = None
+
+LARGEST_KEPT = 8
+
+
+def _describe(msg):
+    """Short label for a ForwardMsg: 'markdown: <style> ...' / 'ref' / message type"""
+    kind = msg.WhichOneof('type')
+    if kind == 'ref_hash':
+        return 'cached reference'
+    if kind != 'delta' or msg.delta.WhichOneof('type') != 'new_element':
+        return kind
+    element = msg.delta.new_element
+    element_type = element.WhichOneof('type')
+    if element_type == 'markdown':
+        body = ' '.join(element.markdown.body.split())
+        return f"markdown: {body[:48]}"
+    return element_type
+
+
+class PayloadMeter:
+    """Byte counter around one rerun's outgoing messages"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.messages = 0
+        self.sizes = []
+        self._ctx = None
+        self._original = None
+
+    def start(self):
+        ctx = get_script_run_ctx() if get_script_run_ctx else None
+        if ctx is None or not hasattr(ctx, '_enqueue'):
+            return self
+        self._ctx, self._original = ctx, ctx._enqueue
+
+        def counting_enqueue(msg):
+            size = msg.ByteSize()
+            self.bytes += size
+            self.messages += 1
+            self.sizes.append((size, msg))
+            self._original(msg)
+
+        ctx._enqueue = counting_enqueue
+        return self
+
+    def stop(self):
+        """Restore the queue; returns the rerun's totals and largest messages"""
+        if self._ctx is None:
+            return None
+        self._ctx._enqueue = self._original
+        self._ctx = None
+        largest = sorted(self.sizes, key=lambda item: -item[0])[:LARGEST_KEPT]
+        return {
+            'bytes': self.bytes,
+            'messages': self.messages,
+            'largest': [(size, _describe(msg)) for size, msg in largest],
+        }
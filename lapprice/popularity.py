@@ -0,0 +1,84 @@
+"""
+Configuration popularity - which configurations to keep hot
+
+Queries are not spread evenly over the 400k configurations: they start
+from the form's defaults or one of the preset buttons and change a field
+or two. estimate_popularity() scores a configuration by how close it is to
+the nearest of those anchors (each differing field halves the score);
+observed_counts() adds what traffic actually asked for, from miss logs
+(lapprice.misslog) and L1 snapshots (lapprice.tiers).
+
+    order = popularity_order(keys, columns, observed_counts(['data/lookups/misses.jsonl']))
+
+precompute_predictions.py writes predictions_lookup.json in this order
+and export_store.py puts the first --hot keys in the store file's hot
+section, which backends load into memory at open and the app copies into
+L1 at startup.
+"""
+
+import json
+from collections import Counter
+
+import numpy as np
+
+from .keys import CONFIG_FIELDS, FLOAT_FIELDS, canonicalize_columns
+from .options import FORM_DEFAULTS, PRESETS, SLIDER_DEFAULTS
+
+
+def anchor_configs():
+    """The configurations a session starts from: the form defaults, then each preset applied to them"""
+    defaults = dict(FORM_DEFAULTS, **SLIDER_DEFAULTS)
+    anchors = [defaults] + [dict(defaults, **{field: value for field, value in preset.items() if field in CONFIG_FIELDS})
+                            for preset in PRESETS.values()]
+    canonical = canonicalize_columns({field: [anchor[field] for anchor in anchors] for field in CONFIG_FIELDS})
+    return [{field: canonical[field][i] for field in CONFIG_FIELDS} for i in range(len(anchors))]
+
+
+def estimate_popularity(columns):
+    """Per row: 2 ** -(fields differing from the nearest anchor), so an anchor scores 1.0"""
+    canonical = canonicalize_columns(columns)
+    n = len(canonical[CONFIG_FIELDS[0]])
+    best = np.zeros(n, dtype=int)
+    for anchor in anchor_configs():
+        matches = np.zeros(n, dtype=int)
+        for field in CONFIG_FIELDS:
+            values = np.asarray(canonical[field])
+            if field in FLOAT_FIELDS:
+                matches += np.abs(values - anchor[field]) < 0.05
+            else:
+                matches += values == anchor[field]
+        best = np.maximum(best, matches)
+    return 2.0 ** (best - len(CONFIG_FIELDS))
+
+
+def observed_counts(paths):
+    """
+    {key: requests} from miss logs (.jsonl, summed counts) and L1
+    snapshots (.json, one per key held); unreadable files are skipped
+    """
+    from .misslog import read_misses
+    counts = Counter()
+    for path in paths:
+        try:
+            if path.endswith('.jsonl'):
+                counts.update({key: count for key, (count, _) in read_misses(path).items()})
+            else:
+                with open(path) as f:
+                    counts.update(key for key, _, _ in json.load(f)['entries'])
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+    return counts
+
+
+def popularity_order(keys, columns=None, observed=None):
+    """
+    Row indices most popular first: observed requests, then the estimate
+    from columns (if given), then the original order
+    """
+    keys = np.asarray(keys).astype(str)
+    sort_keys = [np.arange(len(keys))]  # np.lexsort: last key is primary
+    if columns is not None:
+        sort_keys.append(-estimate_popularity(columns))
+    if observed:
+        sort_keys.append(-np.array([observed.get(key, 0) for key in keys.tolist()]))
+    return np.lexsort(sort_keys)
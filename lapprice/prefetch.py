@@ -0,0 +1,217 @@
+"""
+Speculative neighbour prefetch - look up what the user is likely to ask next
+
+While the spec form is being edited, the current configuration and its
+one-step neighbours (RAM and SSD one option up/down, the GPU one tier
+up/down) are resolved against the lookup store on a small thread pool,
+through the batch lookup path (one probe per batch). With a remote store
+(shards / range) that turns Predict, and the priced upgrade suggestions,
+into in-memory reads.
+
+    prefetcher = Prefetcher(workers=2)             # one per process
+    cache = PrefetchCache()                        # one per session
+    cache.sync(generation)                         # drop answers of an older store
+    prefetcher.schedule(cache, neighbour_columns(config)[1], backend)
+    batch_lookup(columns, cache, fallback=local)   # the cache probes like a backend
+
+Only store answers are cached here. A store miss is remembered too, so the
+remote probe isn't repeated; it comes back as a miss and the caller falls
+through to its local tiers (grid, model) as usual.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from . import timing
+from .batch import batch_lookup, take_rows
+from .configdb import gpu_tier
+from .keys import CONFIG_FIELDS, canonicalize_columns, hash_canonical_columns
+from .options import DROPDOWN_OPTIONS, RAM_OPTIONS, SSD_OPTIONS
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAXSIZE = 256  # per session: a few dozen edits' worth of neighbourhoods
+DEFAULT_WAIT = 10.0
+
+# Neighbour labels, in the order neighbour_columns() returns them
+CURRENT = 'current'
+UPGRADES = ('ram_up', 'ssd_up', 'gpu_up')
+DOWNGRADES = ('ram_down', 'ssd_down', 'gpu_down')
+
+
+def _step(options, value, step):
+    """The option step places away from value in options, or None at either end"""
+    try:
+        position = options.index(value) + step
+    except ValueError:
+        return None
+    return options[position] if 0 <= position < len(options) else None
+
+
+def _gpu_step(gpu, step):
+    """First GPU option of the nearest tier above (step 1) or below (step -1), or None"""
+    tier = gpu_tier(gpu)
+    tiers = sorted({gpu_tier(option) for option in DROPDOWN_OPTIONS['Gpu_Brand']
+                    if (gpu_tier(option) - tier) * step > 0}, reverse=step < 0)
+    if not tiers:
+        return None
+    return next(option for option in DROPDOWN_OPTIONS['Gpu_Brand'] if gpu_tier(option) == tiers[0])
+
+
+def neighbour_columns(config):
+    """
+    (labels, columns) for config and its one-step neighbours
+
+    config: {field: value} over CONFIG_FIELDS; neighbours that would step
+    off the end of an option list are left out.
+    """
+    steps = {
+        'ram_up': ('ram', _step(RAM_OPTIONS, config['ram'], 1)),
+        'ssd_up': ('ssd', _step(SSD_OPTIONS, config['ssd'], 1)),
+        'gpu_up': ('gpu', _gpu_step(config['gpu'], 1)),
+        'ram_down': ('ram', _step(RAM_OPTIONS, config['ram'], -1)),
+        'ssd_down': ('ssd', _step(SSD_OPTIONS, config['ssd'], -1)),
+        'gpu_down': ('gpu', _gpu_step(config['gpu'], -1)),
+    }
+    labels = [CURRENT]
+    rows = [config]
+    for label in UPGRADES + DOWNGRADES:
+        field, value = steps[label]
+        if value is not None:
+            labels.append(label)
+            rows.append(dict(config, **{field: value}))
+    return labels, {field: [row[field] for row in rows] for field in CONFIG_FIELDS}
+
+
+class PrefetchCache:
+    """Per-session key -> store price (None = store miss), bounded LRU, tied to one store generation"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, wait=DEFAULT_WAIT):
+        self.maxsize = maxsize
+        self.wait = wait  # seconds to join an in-flight prefetch rather than look the key up again
+        self.generation = None
+        self.used = 0    # keys answered from here (instantly or by joining a prefetch)
+        self.unused = 0  # keys nothing had been prefetched for
+        self._results = OrderedDict()
+        self._pending = {}  # key -> Future of the batch resolving it
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def sync(self, generation):
+        """Forget every answer if generation differs from the one they were fetched under"""
+        with self._lock:
+            if generation == self.generation:
+                return False
+            self._results.clear()
+            self._pending.clear()
+            self.generation = generation
+            return True
+
+    def wanted(self, keys):
+        """The keys neither resolved nor in flight"""
+        with self._lock:
+            return [key for key in keys if key not in self._results and key not in self._pending]
+
+    def expect(self, keys, future):
+        with self._lock:
+            self._pending.update(dict.fromkeys(keys, future))
+
+    def store(self, generation, keys, answers):
+        """
+        Settle a batch: keys stop being in flight and answers ({key: price
+        or None}) are kept - unless the store changed while it ran
+        """
+        with self._lock:
+            for key in keys:
+                self._pending.pop(key, None)
+            if generation != self.generation:
+                return
+            for key, price in answers.items():
+                self._results[key] = price
+                self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def probe(self, keys):
+        """
+        (hits, prices) like a lookup backend: hit = prefetched and in the
+        store. Prefetches still in flight for keys are joined (up to wait
+        seconds) rather than probed again; a store miss and "never
+        prefetched" both come back as a miss.
+        """
+        keys = np.asarray(keys).astype(str).tolist()
+        with self._lock:
+            futures = {self._pending[key] for key in keys if key in self._pending and key not in self._results}
+        for future in futures:
+            try:
+                future.result(self.wait)
+            except Exception:
+                pass  # timed out or failed: those keys stay misses
+        hits = np.zeros(len(keys), dtype=bool)
+        prices = np.full(len(keys), np.nan)
+        with self._lock:
+            for row, key in enumerate(keys):
+                if key in self._results:
+                    self.used += 1
+                    if self._results[key] is not None:
+                        hits[row], prices[row] = True, self._results[key]
+                else:
+                    self.unused += 1
+        return hits, prices
+
+    def resolved(self, key):
+        """True if key has been prefetched (as a store hit or a store miss)"""
+        with self._lock:
+            return key in self._results
+
+    def get(self, key):
+        hits, prices = self.probe([key])
+        return float(prices[0]) if hits[0] else None
+
+
+class Prefetcher:
+    """Small thread pool resolving batches of configurations against a lookup backend"""
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = workers
+        self.batches = 0
+        self.errors = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lapprice-prefetch')
+
+    def schedule(self, cache, columns, index):
+        """Resolve the rows of columns cache doesn't have yet; returns the Future, or None if nothing to do"""
+        canonical = canonicalize_columns(columns)
+        keys = np.asarray(hash_canonical_columns(canonical)).astype(str)
+        wanted = set(cache.wanted(keys.tolist()))
+        if not wanted:
+            return None
+        rows = np.array([key in wanted for key in keys.tolist()])
+        batch = take_rows(canonical, rows)
+        future = Future()  # in flight before the task can possibly settle it
+        cache.expect(wanted, future)
+        self._pool.submit(self._resolve, cache, cache.generation, keys[rows].tolist(), batch, index, future)
+        return future
+
+    def _resolve(self, cache, generation, keys, columns, index, future):
+        answers = {}
+        try:
+            with timing.span('prefetch.batch'):
+                result = batch_lookup(columns, index)
+            answers = {key: float(price) if hit else None for key, hit, price in zip(
+                result['keys'].astype(str).tolist(), result['hits'].tolist(), result['prices'].tolist())}
+            timing.count('prefetch.keys', len(answers))
+        except Exception as e:
+            self.errors += 1  # a failed probe isn't a miss: nothing is cached, Predict looks it up itself
+            future.set_exception(e)
+        finally:
+            self.batches += 1
+            cache.store(generation, keys, answers)
+        if not future.done():
+            future.set_result(answers)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
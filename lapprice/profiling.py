@@ -0,0 +1,135 @@
+"""
+On-demand profiling of a single Streamlit rerun
+
+RerunProfiler runs cProfile on the script thread and, alongside it, a
+sampling thread that snapshots the script thread's stack every few ms.
+stop() writes three files to the output directory:
+
+- <stamp>.prof      cProfile stats (pstats / snakeviz)
+- <stamp>.folded    folded stacks, for flamegraph.pl or speedscope
+- <stamp>.tree.txt  sampled call tree plus the top functions by cumulative time
+
+Nothing here is imported or started unless profiling was asked for, so the
+normal rerun path pays nothing.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+DEFAULT_INTERVAL = 0.002  # seconds between stack samples
+
+_active = None  # profiler of a rerun that never reached stop() (st.rerun / exception)
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    # ';' separates frames in the folded format
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+
+class RerunProfiler:
+    """cProfile + stack sampler around one script run"""
+
+    def __init__(self, out_dir, interval=DEFAULT_INTERVAL):
+        self.out_dir = out_dir
+        self.interval = interval
+        self.samples = Counter()
+        self._profile = cProfile.Profile()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._thread_id = None
+        self._start = None
+
+    def start(self):
+        global _active
+        if _active is not None:
+            _active._abandon()
+        _active = self
+
+        self._thread_id = threading.get_ident()
+        self._sampler = threading.Thread(target=self._sample, name='lapprice-profiler', daemon=True)
+        self._start = time.perf_counter()
+        self._sampler.start()
+        self._profile.enable()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def _abandon(self):
+        global _active
+        self._profile.disable()
+        self._stop.set()
+        if _active is self:
+            _active = None
+
+    def stop(self):
+        """Stop profiling and write the outputs; returns {'prof', 'folded', 'tree'} paths"""
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._start
+        self._stop.set()
+        self._sampler.join()
+        self._abandon()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        stem = os.path.join(self.out_dir, datetime.now().strftime('rerun_%Y%m%d_%H%M%S_%f'))
+        paths = {'prof': stem + '.prof', 'folded': stem + '.folded', 'tree': stem + '.tree.txt'}
+
+        self._profile.dump_stats(paths['prof'])
+
+        with open(paths['folded'], 'w') as f:
+            for stack, n in self.samples.most_common():
+                f.write(f"{stack} {n}\n")
+
+        with open(paths['tree'], 'w') as f:
+            f.write(f"Rerun wall time: {elapsed * 1000:.1f} ms, "
+                    f"{sum(self.samples.values())} samples every {self.interval * 1000:g} ms\n\n")
+            f.write(self.call_tree())
+            f.write("\n\nTop functions by cumulative time (cProfile)\n\n")
+            out = io.StringIO()
+            pstats.Stats(self._profile, stream=out).sort_stats('cumulative').print_stats(40)
+            f.write(out.getvalue())
+
+        self.elapsed = elapsed
+        return paths
+
+    def call_tree(self, min_share=0.005):
+        """Indented call tree from the samples, pruned below min_share of the total"""
+        total = sum(self.samples.values())
+        if not total:
+            return "(no samples - the rerun was shorter than the sampling interval)\n"
+
+        tree = {}
+        for stack, n in self.samples.items():
+            node = tree
+            for label in stack.split(';'):
+                entry = node.setdefault(label, [0, {}])
+                entry[0] += n
+                node = entry[1]
+
+        lines = []
+
+        def walk(node, depth):
+            for label, (n, children) in sorted(node.items(), key=lambda item: -item[1][0]):
+                if n / total < min_share:
+                    continue
+                lines.append(f"{n / total * 100:6.1f}%  {'  ' * depth}{label}")
+                walk(children, depth + 1)
+
+        walk(tree, 0)
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,123 @@
+"""
+Local stand-ins for every lookup backend
+
+write_standins() writes one predictions dict in every backend format to a
+directory; StaticServer serves that directory over HTTP (with Range
+support, like GitHub Pages or any CDN), so the shards and range backends
+run against a real socket without leaving the machine.
+
+    with tempfile.TemporaryDirectory() as directory, StaticServer(directory) as server:
+        specs = write_standins(predictions, directory, server.url)
+        backend = open_backend(specs['range'])
+
+Used by scripts/check_backends.py; deployments can point the app at the
+same server (LAPPRICE_STORE=range:http://...) to try a backend locally.
+"""
+
+import functools
+import http.server
+import json
+import os
+import re
+import threading
+
+from .backends import DEFAULT_HOT, sorted_arrays, write_manifest, write_shards, write_sqlite, write_store_file
+
+_RANGE = re.compile(r'bytes=(\d+)-(\d*)$')
+
+
+class _RangeHandler(http.server.SimpleHTTPRequestHandler):
+    """Static files with single byte-range support (SimpleHTTPRequestHandler ignores Range)"""
+
+    def send_head(self):
+        self.server.requests.append((self.command, self.path, self.headers.get('Range')))
+        self._remaining = None
+        match = _RANGE.match(self.headers.get('Range', ''))
+        path = self.translate_path(self.path)
+        if not match or not os.path.isfile(path):
+            return super().send_head()  # whole file; end_headers advertises ranges
+
+        size = os.path.getsize(path)
+        first = int(match.group(1))
+        last = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+        if first > last:
+            self.send_error(416)
+            return None
+        f = open(path, 'rb')
+        f.seek(first)
+        self._remaining = last - first + 1
+        self.send_response(206)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Range', f'bytes {first}-{last}/{size}')
+        self.send_header('Content-Length', str(self._remaining))
+        self.end_headers()
+        return f
+
+    def end_headers(self):
+        self.send_header('Accept-Ranges', 'bytes')
+        super().end_headers()
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, '_remaining', None)
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        outputfile.write(source.read(remaining))
+
+    def log_message(self, *_):
+        pass
+
+
+class StaticServer:
+    """Range-capable static file server on 127.0.0.1, run on a daemon thread"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.server = None
+
+    def __enter__(self):
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), functools.partial(_RangeHandler, directory=self.directory)
+        )
+        self.server.requests = []  # (method, path, range) of every request, for assertions
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+
+def write_standins(predictions, directory, base_url=None):
+    """
+    Write predictions in every backend format under directory, plus manifest.json
+
+    Returns {kind: spec} for open_backend(); the HTTP backends are only
+    included when base_url (where directory is served) is given.
+    """
+    os.makedirs(directory, exist_ok=True)
+    keys, prices = sorted_arrays(predictions)
+    with open(os.path.join(directory, 'predictions_lookup.json'), 'w') as f:
+        json.dump(predictions, f)
+    # predictions are taken to be most popular first, as precompute_predictions.py writes them
+    write_store_file(os.path.join(directory, 'predictions.lps'), keys, prices, hot_keys=list(predictions)[:DEFAULT_HOT])
+    write_sqlite(os.path.join(directory, 'predictions.sqlite'), keys, prices)
+    write_shards(os.path.join(directory, 'shards'), keys, prices)
+    write_manifest(directory, ['predictions_lookup.json', 'predictions.lps', 'predictions.sqlite', 'shards'])
+
+    specs = {
+        'dict': f"dict:{os.path.join(directory, 'predictions_lookup.json')}",
+        'mmap': f"mmap:{os.path.join(directory, 'predictions.lps')}",
+        'sqlite': f"sqlite:{os.path.join(directory, 'predictions.sqlite')}",
+    }
+    if base_url:
+        specs['shards'] = f'shards:{base_url}/shards'
+        specs['range'] = f'range:{base_url}/predictions.lps'
+    return specs
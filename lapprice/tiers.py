@@ -0,0 +1,211 @@
+"""
+Tiered prediction path: L1 hot keys -> L2 pre-computed stores -> L3 inference
+
+    L1  HotKeyCache: in-process LRU of canonical key -> decoded price,
+        snapshotted to a small JSON file so a restarted process starts warm
+    L2  the pre-computed stores, tried in order (lookup backend, dense grid)
+    L3  inference (fallback model / estimator); the result is written back
+        to L1 so the next request for the same configuration stops at L1
+
+    tiers = TieredPredictor(HotKeyCache(path='data/lookups/l1_cache.json'))
+    price, tier, source = tiers.predict(
+        key,
+        l2=[('store', lambda: backend.get(key)), ('grid', lambda: grid_price(columns))],
+        l3=('model', lambda: model(columns)[0]),
+    )
+
+Each tier records its latency into the lapprice.timing span 'tier.<tier>'
+and its outcome into the counters 'tier.<tier>.hit' / 'tier.<tier>.miss'
+(L3 always answers), so tier_stats() and the app's Developer Metrics see
+the same numbers.
+
+L1 entries are only valid for the store they came from. sync(generation)
+drops them when the caller's generation (e.g. store state + manifest
+version) changes, and the snapshot on disk carries its generation too.
+warm() then refills it from the new store's hot section
+(LookupBackend.hot_items) so the common configurations start in L1.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import timing
+
+L1, L2, L3 = 'l1', 'l2', 'l3'
+TIERS = (L1, L2, L3)
+DEFAULT_MAXSIZE = 4096
+DEFAULT_SAVE_INTERVAL = 30.0  # seconds between snapshots while entries change
+
+
+class HotKeyCache:
+    """LRU of key -> (price, source) with an optional JSON snapshot at path"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, path=None, save_interval=DEFAULT_SAVE_INTERVAL):
+        self.maxsize = maxsize
+        self.path = path
+        self.save_interval = save_interval
+        self.generation = None
+        self.restored = 0       # entries loaded from the snapshot
+        self.warmed = 0         # entries filled in by warm()
+        self.save_error = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.time()
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """(price, source) for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, price, source):
+        with self._lock:
+            self._entries[key] = (float(price), source)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._dirty = True
+            due = self.path and time.time() - self._saved_at >= self.save_interval
+        if due:
+            self.save()
+
+    def sync(self, generation):
+        """Drop every entry if generation differs from the one they were cached under; True if it did"""
+        with self._lock:
+            if generation == self.generation:
+                return False
+            self._entries.clear()
+            self.generation = generation
+            self._dirty = True
+            return True
+
+    def warm(self, items, source):
+        """Fill free slots with [(key, price)], most popular first, without evicting anything held"""
+        with self._lock:
+            new = [(key, price) for key, price in items if key not in self._entries]
+            new = new[:self.maxsize - len(self._entries)]
+            for key, price in new:
+                self._entries[key] = (float(price), source)
+                self._entries.move_to_end(key, last=False)  # the least popular end up evicted first
+            self._dirty = self._dirty or bool(new)
+            self.warmed += len(new)
+            return len(new)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def load(self):
+        """Restore the snapshot at path (oldest entry first); a missing or bad file starts cold"""
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+            entries = [(key, (float(price), source)) for key, price, source in snapshot['entries']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+        with self._lock:
+            self.generation = snapshot.get('generation')
+            self._entries = OrderedDict(entries[-self.maxsize:])
+            self.restored = len(self._entries)
+        return self.restored
+
+    def save(self):
+        """Write the snapshot atomically (no-op if nothing changed); errors are kept, not raised"""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return False
+            snapshot = {'generation': self.generation,
+                        'entries': [[key, price, source] for key, (price, source) in self._entries.items()]}
+            self._dirty = False
+            self._saved_at = time.time()
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(self.path + '.tmp', self.path)
+            self.save_error = None
+            return True
+        except OSError as e:
+            self.save_error = e  # read-only disk: the cache still works, it just starts cold
+            return False
+
+
+class TieredPredictor:
+    """Answers a key from L1, else the first L2 source that has it, else L3"""
+
+    def __init__(self, l1):
+        self.l1 = l1
+
+    def predict(self, key, l2, l3, write_back=True):
+        """
+        (price, tier, source) for key
+
+        l2: [(source, lookup() -> price or None)], tried in order
+        l3: (source, infer() -> price), or infer() -> (price, source) when
+        what answers varies (e.g. a remote service with its own fallbacks)
+        write_back: cache the answer in L1 (pass False while L2 is
+        incomplete, e.g. the store is still loading, so a stand-in answer
+        doesn't shadow the exact price once it arrives)
+        """
+        with timing.span('tier.l1'):
+            entry = self.l1.get(key)
+        if entry is not None:
+            timing.count('tier.l1.hit')
+            return entry[0], L1, entry[1]
+        timing.count('tier.l1.miss')
+
+        price = None
+        with timing.span('tier.l2'):
+            for source, lookup in l2:
+                price = lookup()
+                if price is not None:
+                    break
+        if price is not None:
+            timing.count('tier.l2.hit')
+            if write_back:
+                self.l1.put(key, price, source)
+            return float(price), L2, source
+        timing.count('tier.l2.miss')
+
+        source, infer = l3
+        with timing.span('tier.l3'):
+            price = infer()
+        if isinstance(price, tuple):
+            price, source = price
+        price = float(price)
+        timing.count('tier.l3.hit')
+        if write_back:
+            self.l1.put(key, price, source)
+        return price, L3, source
+
+
+def tier_stats():
+    """Per tier: hits, misses, hit rate and latency percentiles (from lapprice.timing)"""
+    metrics = timing.snapshot()
+    rows = []
+    for tier in TIERS:
+        hits = metrics['counters'].get(f'tier.{tier}.hit', 0)
+        misses = metrics['counters'].get(f'tier.{tier}.miss', 0)
+        span = metrics['spans'].get(f'tier.{tier}', {})
+        rows.append({
+            'tier': tier, 'hits': hits, 'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'p50_ms': span.get('p50_ms', 0.0), 'p99_ms': span.get('p99_ms', 0.0),
+        })
+    return rows
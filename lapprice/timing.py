@@ -0,0 +1,151 @@
+"""
+Stage timing for the prediction flow
+
+Timed spans feed per-process latency histograms (log-spaced buckets, so
+memory stays fixed no matter how many requests are served) and plain
+counters track lookup hits/misses. Everything lives at module level, so a
+Streamlit server shares one set of numbers across sessions and reruns.
+
+    with span('lookup'):
+        ...
+    count('lookup.hit')
+    snapshot()  # {'spans': {name: {count, p50_ms, ...}}, 'counters': {...}}
+
+The startup Timeline records one-off events of a cold start (imports, data
+loads, first paint) with their offset from the first script run.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Bucket upper bounds in seconds: 1 µs .. ~100 s, 5% apart
+_BUCKET_GROWTH = 1.05
+_BUCKET_BOUNDS = [1e-6 * _BUCKET_GROWTH ** i
+                  for i in range(int(math.log(1e8) / math.log(_BUCKET_GROWTH)) + 1)]
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram with approximate percentiles (±5%)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.n += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile, in seconds"""
+        if not self.n:
+            return float('nan')
+        rank = q / 100 * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return min(_BUCKET_BOUNDS[i], self.max) if i < len(_BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.n,
+            'mean_ms': self.total / self.n * 1000 if self.n else float('nan'),
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+
+def record(name, seconds):
+    """Add one duration to the named histogram"""
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = LatencyHistogram()
+        hist.record(seconds)
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block into the named histogram (recorded even on error)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def count(name, n=1):
+    """Increment a named counter"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def snapshot():
+    """Current per-process span summaries and counters"""
+    with _lock:
+        return {
+            'spans': {name: hist.summary() for name, hist in _histograms.items()},
+            'counters': dict(_counters),
+        }
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+class Timeline:
+    """One-off startup steps and marks, each recorded the first time it happens"""
+
+    def __init__(self):
+        self.origin = None
+        self.events = {}  # label -> (start, end) in perf_counter seconds
+
+    def begin(self, origin=None):
+        """Set time zero (first script run); later calls are ignored"""
+        if self.origin is None:
+            self.origin = time.perf_counter() if origin is None else origin
+
+    @contextmanager
+    def step(self, label):
+        if label in self.events:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.setdefault(label, (start, time.perf_counter()))
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.events.setdefault(label, (now, now))
+
+    def report(self):
+        """Steps in start order: label, start/end offset from origin and duration, in ms"""
+        origin = self.origin if self.origin is not None else 0.0
+        return [
+            {'step': label, 'start_ms': (start - origin) * 1000, 'end_ms': (end - origin) * 1000,
+             'duration_ms': (end - start) * 1000}
+            for label, (start, end) in sorted(self.events.items(), key=lambda item: item[1][0])
+        ]
+
+
+# Cold-start timeline of this process
+startup = Timeline()
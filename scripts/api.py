@@ -1,13 +1,107 @@
 import numpy as np
-import pandas as pd
 from flask import Flask, request, jsonify
 import pickle
+import json
+import os
+import sys
+
+# Make the shared lapprice package importable when run as `python scripts/api.py`
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.backends import DictBackend, OverlayBackend, manifest_version, open_backend
+from lapprice.batch import PredictionIndex, batch_lookup, first_available
+from lapprice.compiled import CompiledPipeline
+from lapprice.configdb import FILTERS, ConfigStore
+from lapprice.estimator import estimate_prices
+from lapprice.features import MODEL_COLUMNS, model_columns
+from lapprice.grid import ConfigGrid
+from lapprice.keys import canonicalize_columns
+from lapprice.loader import StoreLoader
+from lapprice.misslog import MissLog
 
 # Initialize the flask app
 app = Flask(__name__)
 
-# Load the trained pipeline
-pipe = pickle.load(open('pipe.pkl', 'rb'))
+# Load the trained pipeline - the compiled NumPy export if there is one
+# (scripts/export_compiled_model.py), so serving needs neither sklearn nor pandas.
+# Without any pipeline, fall back to the closed-form model fitted on laptop_data.csv
+COMPILED_PATH = os.environ.get('LAPPRICE_COMPILED', 'pipe_compiled.npz')
+FALLBACK_MODEL_PATH = os.environ.get('LAPPRICE_FALLBACK_MODEL', os.path.join(ROOT, 'models', 'fallback_model.npz'))
+pipe = None
+if os.path.exists(COMPILED_PATH):
+    compiled_pipe = CompiledPipeline.load(COMPILED_PATH)
+elif os.path.exists('pipe.pkl'):
+    compiled_pipe = None
+    pipe = pickle.load(open('pipe.pkl', 'rb'))
+elif os.path.exists(FALLBACK_MODEL_PATH):
+    compiled_pipe = CompiledPipeline.load(FALLBACK_MODEL_PATH)
+else:
+    compiled_pipe = None
+
+# Pre-computed predictions (optional) - hits are answered without the model.
+# LAPPRICE_STORE picks any lookup backend ('mmap:predictions.lps', 'sqlite:...',
+# see lapprice/backends.py); otherwise the JSON is loaded into sorted arrays.
+# With LAPPRICE_STORE_MANIFEST set, a new manifest version is loaded in the
+# background and swapped in between requests (no restart)
+LOOKUP_PATH = os.environ.get('LAPPRICE_LOOKUP', 'predictions_lookup.json')
+STORE_MANIFEST = os.environ.get('LAPPRICE_STORE_MANIFEST')
+RELOAD_INTERVAL = float(os.environ.get('LAPPRICE_RELOAD_INTERVAL', '60'))
+
+
+# Newly priced misses (scripts/precompute_misses.py), answered ahead of the store
+DELTA_PATH = os.environ.get('LAPPRICE_STORE_DELTA', 'predictions_delta.json')
+
+
+def open_lookup_index():
+    if os.environ.get('LAPPRICE_STORE'):
+        index = open_backend(os.environ['LAPPRICE_STORE'])
+    elif os.path.exists(LOOKUP_PATH):
+        with open(LOOKUP_PATH) as f:
+            index = PredictionIndex.from_predictions(json.load(f))
+    else:
+        return None
+    if os.path.exists(DELTA_PATH):
+        index = OverlayBackend(index, DictBackend.open(DELTA_PATH))
+    return index
+
+
+lookups = StoreLoader(open_lookup_index, 'lookups',
+                      version=(lambda: manifest_version(STORE_MANIFEST)) if STORE_MANIFEST else None).start()
+lookups.wait()  # the first copy loads before serving, as before
+if lookups.error:
+    raise lookups.error
+if STORE_MANIFEST and RELOAD_INTERVAL > 0:
+    lookups.watch(RELOAD_INTERVAL)
+
+# Configurations the store missed, appended for scripts/precompute_misses.py
+miss_log = MissLog(os.environ.get('LAPPRICE_MISS_LOG', 'misses.jsonl'))
+
+# Dense configuration grid (optional) - answers UI-reachable configs without the model
+GRID_PATH = os.environ.get('LAPPRICE_GRID', 'config_grid.npz')
+config_grid = ConfigGrid.load(GRID_PATH) if os.path.exists(GRID_PATH) else None
+
+# Configuration database (optional) - filtered and price-range queries
+CONFIG_DB_PATH = os.environ.get('LAPPRICE_CONFIG_DB', 'configs.sqlite')
+config_store = ConfigStore(CONFIG_DB_PATH) if os.path.exists(CONFIG_DB_PATH) else None
+
+
+def predict_log_prices(columns):
+    """Run the model over {MODEL_COLUMN: values} in one call"""
+    if compiled_pipe is not None:
+        return compiled_pipe.predict(columns)
+
+    import pandas as pd
+    return pipe.predict(pd.DataFrame(columns, columns=MODEL_COLUMNS))
+
+
+def predict_model_batch(columns):
+    """Run the pipeline once over all canonical configs that missed the lookup"""
+    if compiled_pipe is None and pipe is None:
+        # No model at all: the formula estimator still prices the whole batch at once
+        return estimate_prices(columns)
+    return np.exp(predict_log_prices(model_columns(columns)))
+
 
 # Define a route for the prediction
 @app.route('/predict', methods=['POST'])
@@ -15,19 +109,143 @@ def predict():
     # Get the data from the POST request
     data = request.get_json(force=True)
 
-    # Convert the incoming JSON data to a pandas DataFrame
+    if compiled_pipe is None and pipe is None:
+        # No model at all: the formula estimator prices the fields it knows
+        prediction = estimate_prices({
+            'company': [data['Company']], 'type_name': [data['TypeName']], 'ram': [data['Ram']],
+            'ssd': [data['SSD']], 'hdd': [data['HDD']], 'gpu': [data['Gpu_Brand']]
+        })[0]
+        return jsonify({'predicted_price': float(prediction), 'source': 'estimate'})
+
+    # One-row columns in the model's column order
     # The keys in your JSON ('Company', 'TypeName', etc.) must match these columns
-    input_data = pd.DataFrame([data])
-    
+    input_data = {column: [data[column]] for column in MODEL_COLUMNS}
+
     # Make a prediction
-    prediction_log = pipe.predict(input_data)[0]
-    
+    prediction_log = predict_log_prices(input_data)[0]
+
     # Since you trained on the log of the price, convert it back
     prediction = np.exp(prediction_log)
 
     # Return the result as JSON
-    return jsonify({'predicted_price': prediction})
+    return jsonify({'predicted_price': prediction, 'source': 'model'})
+
+
+# Batch route: many app-style configurations in one call
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    # Expects {"configs": {"company": [...], "type_name": [...], ...}}
+    # i.e. columns named like lapprice.keys.CONFIG_FIELDS
+    data = request.get_json(force=True)
+
+    grid_answered = []  # which misses the grid priced, kept for 'sources' below
+
+    def grid_lookup(columns):
+        prices = config_grid.lookup(columns)
+        grid_answered.append(~np.isnan(prices))
+        return prices
+
+    if config_grid is not None:
+        fallback = first_available(grid_lookup, predict_model_batch)
+    else:
+        fallback = predict_model_batch
+    # One read of the current store per request: a swap mid-request can't mix versions
+    index = lookups.value
+    result = batch_lookup(data['configs'], index, fallback=fallback)
+    misses = ~result['hits']
+    canonical = canonicalize_columns(data['configs'])
+    if index is not None and misses.any():
+        miss_log.record_many(result['keys'], canonical, misses)
+
+    # Which tier answered each row (the app-as-client mode shows it like a local answer)
+    model_source = 'model' if compiled_pipe is not None or pipe is not None else 'estimate'
+    sources = np.where(result['hits'], 'store', model_source).astype(object)
+    if grid_answered:
+        sources[np.flatnonzero(misses)[grid_answered[0]]] = 'grid'
+
+    return jsonify({
+        'keys': result['keys'].astype(str).tolist(),
+        'predicted_prices': result['prices'].tolist(),
+        'hits': result['hits'].tolist(),
+        'sources': sources.tolist()
+    })
+
+
+# Store lookups by key - the app-as-client mode uses the service as its lookup backend
+@app.route('/lookup', methods=['POST'])
+def lookup():
+    # Expects {"keys": ["d5d7f3af8f99", ...]} (lapprice.keys hash keys)
+    keys = request.get_json(force=True)['keys']
+    index = lookups.value
+    if index is None or not keys:
+        return jsonify({'hits': [False] * len(keys), 'prices': [None] * len(keys)})
+    hits, prices = index.probe(np.array(keys, dtype=bytes))
+    return jsonify({
+        'hits': hits.tolist(),
+        'prices': [float(price) if hit else None for hit, price in zip(hits.tolist(), prices.tolist())]
+    })
+
+
+# What this service is serving; 'version' changes when the store is hot-reloaded
+@app.route('/status', methods=['GET'])
+def status():
+    index, version = lookups.current  # one read: this store's own version
+    return jsonify({
+        'store': index.describe() if hasattr(index, 'describe') else (f"index ({len(index):,} keys)" if index is not None else None),
+        'keys': len(index) if index is not None else 0,
+        'version': version,
+        'configs': len(config_store) if config_store is not None else None,
+        'grid': config_grid is not None,
+        'model': 'compiled' if compiled_pipe is not None else ('pipeline' if pipe is not None else None),
+    })
+
+def query_filters(args):
+    """Config filters from query string args (?type_name=Gaming&min_ram=16&max_price=80000)"""
+    filters = {}
+    for name in FILTERS:
+        if name in args:
+            value = args[name]
+            filters[name] = value if name in ('company', 'type_name') else float(value)
+    return filters
+
+
+def query_limit(args, default, most):
+    """?limit= clamped to 1..most (a negative LIMIT would mean "every row" to SQLite)"""
+    return max(1, min(int(args.get('limit', default)), most))
+
+
+# Filtered / price-range search over the configuration database
+@app.route('/configs', methods=['GET'])
+def search_configs():
+    if config_store is None:
+        return jsonify({'error': 'configuration database not built'}), 503
+    try:
+        filters = query_filters(request.args)
+        order = request.args.get('order', 'price')
+        limit = query_limit(request.args, 20, 500)
+        return jsonify({
+            'count': config_store.count(**filters),
+            'configs': config_store.search(limit=limit, order=order, **filters)
+        })
+    except ValueError as e:  # bad number, unknown order
+        return jsonify({'error': str(e)}), 400
+
+
+# Configurations priced closest to ?price=, with the same optional filters
+@app.route('/configs/similar', methods=['GET'])
+def similar_configs():
+    if config_store is None:
+        return jsonify({'error': 'configuration database not built'}), 503
+    try:
+        price = float(request.args['price'])
+        limit = query_limit(request.args, 3, 100)
+        return jsonify({'configs': config_store.similar_price(price, limit=limit, **query_filters(request.args))})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 # Run the app
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # HTTP/1.1 keeps connections alive, so pooled clients (lapprice.client) reuse them
+    from werkzeug.serving import WSGIRequestHandler
+    WSGIRequestHandler.protocol_version = 'HTTP/1.1'
+    app.run(debug=True, port=int(os.environ.get('PORT', 5000)))
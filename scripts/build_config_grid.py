@@ -0,0 +1,155 @@
+"""
+Dense Configuration Grid - Pre-compute every UI-reachable configuration
+into a tensor indexed by mixed-radix ordinals (no hashing at all).
+
+- Categorical fields: full cross-product of the form's options
+- Screen size / weight: sampled at a few knots, interpolated at query time
+
+The full categorical space of the form is ~250M combinations, so by default
+only the fields that move the price most are gridded (see
+lapprice.grid.DEFAULT_GRID_FIELDS); the rest are pinned to the form's
+defaults. Add more with --fields, the size estimate is printed up front.
+
+--compact builds the offline store that ships with the app: prices as
+uint16 log codes (half the size) plus per-option offsets for the pinned
+fields, so every configuration the form can produce has an answer from
+local disk even when GitHub Pages is unreachable.
+
+Usage:
+    python scripts/build_config_grid.py --model pipe.pkl --out config_grid.npz
+    python scripts/build_config_grid.py --compact --out data/lookups/config_grid.npz
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.compiled import CompiledPipeline
+from lapprice.estimator import estimate_prices
+from lapprice.features import MODEL_COLUMNS, model_columns
+from lapprice.grid import ConfigGrid, DEFAULT_GRID_FIELDS, DEFAULT_SCREEN_KNOTS, DEFAULT_WEIGHT_KNOTS
+from lapprice.keys import canonicalize_columns
+from lapprice.options import CATEGORICAL_AXES, FORM_DEFAULTS
+
+
+def parse_knots(text):
+    return tuple(float(k) for k in text.split(','))
+
+
+parser = argparse.ArgumentParser(description="Build the dense configuration grid")
+parser.add_argument('--model', default='pipe.pkl',
+                    help="Trained pipeline to price the grid with (pipe.pkl or a compiled .npz)")
+parser.add_argument('--out', default='config_grid.npz')
+parser.add_argument('--fields', default=','.join(DEFAULT_GRID_FIELDS),
+                    help="Comma-separated categorical fields to grid, or 'all'")
+parser.add_argument('--screen-knots', type=parse_knots, default=DEFAULT_SCREEN_KNOTS)
+parser.add_argument('--weight-knots', type=parse_knots, default=DEFAULT_WEIGHT_KNOTS)
+parser.add_argument('--chunk', type=int, default=20000, help="Grid slots priced per model call")
+parser.add_argument('--compact', action='store_true',
+                    help="Quantize to uint16 log prices and add offsets for the pinned fields (offline store)")
+parser.add_argument('--offset-samples', type=int, default=2000,
+                    help="Grid slots averaged over when estimating each pinned-field offset")
+parser.add_argument('--fallback-model', default=os.path.join(ROOT, 'models', 'fallback_model.npz'),
+                    help="Model used when --model can't be loaded, before the formula estimator")
+args = parser.parse_args()
+
+fields = list(CATEGORICAL_AXES) if args.fields == 'all' else args.fields.split(',')
+axes = [(field, CATEGORICAL_AXES[field]) for field in fields]
+fixed = {field: value for field, value in FORM_DEFAULTS.items() if field not in fields}
+
+print("=" * 80)
+print("  🧊 DENSE CONFIGURATION GRID")
+print("=" * 80)
+print()
+
+n_slots = int(np.prod([len(options) for _, options in axes]))
+n_knots = len(args.screen_knots) * len(args.weight_knots)
+print(f"📐 Gridded fields: {', '.join(fields)}")
+print(f"   Pinned fields:  {fixed}")
+print(f"   Categorical slots: {n_slots:,} × {n_knots} knots = {n_slots * n_knots:,} cells "
+      f"(~{n_slots * n_knots * 4 / 1024 ** 2:.1f} MB as float32)")
+print()
+
+print("🤖 Loading ML model...")
+pipe = None
+for model_path in (args.model, args.fallback_model):
+    try:
+        if model_path.endswith('.npz'):
+            pipe = CompiledPipeline.load(model_path)
+        else:
+            pipe = pickle.load(open(model_path, 'rb'))
+        print(f"   ✅ Model loaded successfully ({model_path})")
+        break
+    except Exception as e:
+        print(f"   ⚠️  Could not load {model_path} ({e})")
+if pipe is None:
+    print("   ⚠️  Filling the grid with the formula estimator")
+print()
+
+
+def price_configs(columns):
+    """exp(pipe.predict) over app-style config columns (formula estimate without a model)"""
+    canonical = canonicalize_columns(columns)
+    if pipe is None:
+        return estimate_prices(canonical)
+    if isinstance(pipe, CompiledPipeline):
+        return pipe.predict_price(model_columns(canonical))
+    frame = pd.DataFrame(model_columns(canonical), columns=MODEL_COLUMNS)
+    return np.exp(pipe.predict(frame))
+
+
+grid = ConfigGrid(axes, args.screen_knots, args.weight_knots,
+                  np.zeros((n_slots, len(args.screen_knots), len(args.weight_knots)), dtype=np.float32), fixed)
+
+print("🔨 Pricing grid cells...")
+start = time.time()
+screens, weights = np.meshgrid(args.screen_knots, args.weight_knots, indexing='ij')
+for first in range(0, n_slots, args.chunk):
+    slots = np.arange(first, min(first + args.chunk, n_slots))
+
+    # One row per (slot, screen knot, weight knot), in values' memory order
+    configs = {field: np.repeat(values, n_knots).tolist() for field, values in grid.configs_for(slots).items()}
+    configs.update({field: [value] * (len(slots) * n_knots) for field, value in fixed.items()})
+    configs['screen_size'] = np.tile(screens.ravel(), len(slots))
+    configs['weight'] = np.tile(weights.ravel(), len(slots))
+
+    grid.values[slots] = price_configs(configs).reshape(len(slots), *screens.shape)
+    print(f"   ⚙️  {slots[-1] + 1:,} / {n_slots:,} slots ({(slots[-1] + 1) / n_slots * 100:.1f}%)")
+
+print(f"   ✅ Done in {time.time() - start:.1f}s")
+print()
+
+if args.compact and fixed:
+    # Mean log-price change from setting each pinned field to each option,
+    # over a sample of slots at the middle knots
+    print("📎 Pinned-field offsets...")
+    rng = np.random.default_rng(0)
+    sample = np.sort(rng.choice(n_slots, min(args.offset_samples, n_slots), replace=False))
+    base = grid.configs_for(sample)
+    base.update({field: [value] * len(sample) for field, value in fixed.items()})
+    base['screen_size'] = [args.screen_knots[len(args.screen_knots) // 2]] * len(sample)
+    base['weight'] = [args.weight_knots[len(args.weight_knots) // 2]] * len(sample)
+    base_log = np.log(price_configs(base))
+    offsets = {}
+    for field, pinned in fixed.items():
+        offsets[field] = {}
+        for option in CATEGORICAL_AXES[field]:
+            configs = dict(base, **{field: [option] * len(sample)})
+            offsets[field][option] = 0.0 if option == pinned else float(np.mean(np.log(price_configs(configs)) - base_log))
+        print(f"   {field}: " + ", ".join(f"{option}={offset:+.3f}" for option, offset in offsets[field].items()))
+    grid.offsets = offsets
+    print()
+
+grid.save(args.out, quantize=args.compact)
+size_mb = os.path.getsize(args.out) / (1024 * 1024)
+print(f"💾 Saved {args.out} ({size_mb:.2f} MB)")
+print()
+print("=" * 80)
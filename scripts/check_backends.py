@@ -0,0 +1,87 @@
+"""
+Lookup backend check
+
+Writes one generated predictions store in every backend format
+(lapprice.standins), serves the HTTP ones from a local range-capable
+server and checks that every backend gives the same answers as the dict.
+Prints open time, single-key latency and batch probe time per backend, as
+a guide when picking LAPPRICE_STORE for a deployment.
+
+Usage:
+    python scripts/check_backends.py --entries 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.backends import BACKENDS, open_backend
+from lapprice.standins import StaticServer, write_standins
+
+parser = argparse.ArgumentParser(description="Check every lookup backend against the in-memory dict")
+parser.add_argument('--entries', type=int, default=200000, help="Size of the generated store")
+parser.add_argument('--queries', type=int, default=2000, help="Keys per batch probe (half hits, half misses)")
+parser.add_argument('--singles', type=int, default=200, help="Single-key lookups timed per backend")
+parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+args = parser.parse_args()
+
+print("=" * 80)
+print("  🔌 LOOKUP BACKEND CHECK")
+print("=" * 80)
+print()
+
+rng = np.random.default_rng(42)
+keys = np.unique(np.array([f'{k:012x}' for k in rng.integers(0, 16 ** 12, args.entries)]))
+predictions = {key: {'price': int(price)} for key, price in zip(keys.tolist(), rng.integers(15000, 400000, len(keys)))}
+misses = np.array([f'{k:012x}' for k in rng.integers(0, 16 ** 12, args.queries // 2)])
+queries = np.concatenate([rng.choice(keys, args.queries - len(misses)), misses[~np.isin(misses, keys)]])
+expected = np.array([predictions[key]['price'] if key in predictions else np.nan for key in queries.tolist()])
+print(f"📦 {len(predictions):,} predictions, {len(queries):,} probe keys")
+print()
+
+failures = []
+with tempfile.TemporaryDirectory(prefix='lapprice_backends_') as directory, StaticServer(directory) as server:
+    specs = write_standins(predictions, directory, server.url)
+
+    print(f"   {'backend':<8} {'open ms':>9} {'get p50 µs':>11} {'probe ms':>9} {'requests':>9}  result")
+    for kind in args.backends:
+        served_before = len(server.requests)
+        start = time.perf_counter()
+        backend = open_backend(specs[kind])
+        opened = time.perf_counter() - start
+
+        start = time.perf_counter()
+        hits, prices = backend.probe(queries)
+        probed = time.perf_counter() - start
+
+        singles = []
+        for key in queries[:args.singles].tolist():
+            start = time.perf_counter()
+            price = backend.get(key)
+            singles.append(time.perf_counter() - start)
+            if price != (predictions[key]['price'] if key in predictions else None):
+                failures.append(f"{kind}: get({key}) = {price}")
+                break
+
+        ok = len(backend) == len(predictions) and np.array_equal(hits, ~np.isnan(expected)) \
+            and np.array_equal(prices[hits], expected[hits])
+        if not ok:
+            failures.append(f"{kind}: probe disagrees with the dict")
+        backend.close()
+        print(f"   {kind:<8} {opened * 1000:9.1f} {np.median(singles) * 1e6:11.1f} {probed * 1000:9.1f} "
+              f"{len(server.requests) - served_before:9d}  {'✅' if ok else '❌'}")
+
+print()
+print("=" * 80)
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Every backend agrees with the in-memory dict")
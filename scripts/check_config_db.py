@@ -0,0 +1,114 @@
+"""
+Configuration database check
+
+Builds a configs database (lapprice.configdb) from random form
+configurations priced by the fallback model, then times the app's and
+API's queries against it - filtered search, budget range, similar-price -
+and checks their results against a NumPy scan of the same rows.
+
+Usage:
+    python scripts/check_config_db.py --rows 2000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.compiled import CompiledPipeline
+from lapprice.configdb import ConfigStore, write_config_db
+from lapprice.estimator import estimate_prices
+from lapprice.features import config_pricer
+from lapprice.options import CATEGORICAL_AXES
+
+parser = argparse.ArgumentParser(description="Build a configs database and time its queries")
+parser.add_argument('--rows', type=int, default=1000000)
+parser.add_argument('--repeat', type=int, default=50, help="Runs per query when timing")
+parser.add_argument('--db', help="Keep the database at this path (default: temporary)")
+args = parser.parse_args()
+
+print("=" * 80)
+print("  🗄️  CONFIGURATION DATABASE CHECK")
+print("=" * 80)
+print()
+
+rng = np.random.default_rng(7)
+columns = {field: np.array(options, dtype=object)[rng.integers(0, len(options), args.rows)].tolist()
+           for field, options in CATEGORICAL_AXES.items()}
+columns['screen_size'] = np.round(rng.uniform(11.6, 17.3, args.rows), 1).tolist()
+columns['weight'] = np.round(rng.uniform(1.0, 3.5, args.rows), 1).tolist()
+
+fallback_path = os.path.join(ROOT, 'models', 'fallback_model.npz')
+price = config_pricer(CompiledPipeline.load(fallback_path)) if os.path.exists(fallback_path) else estimate_prices
+prices = np.round(price(columns))
+
+path = args.db or os.path.join(tempfile.mkdtemp(prefix='lapprice_configdb_'), 'configs.sqlite')
+start = time.time()
+write_config_db(path, columns, prices)
+print(f"💾 {args.rows:,} configurations -> {path} "
+      f"({os.path.getsize(path) / 1024 ** 2:.0f} MB, {time.time() - start:.1f}s)")
+print()
+
+store = ConfigStore(path)
+ram = np.array(columns['ram'])
+type_name = np.array(columns['type_name'])
+
+QUERIES = {
+    'Gaming, 16GB+, under ₹80k': (
+        lambda: store.search(type_name='Gaming', min_ram=16, max_price=80000, order='-price', limit=10),
+        (type_name == 'Gaming') & (ram >= 16) & (prices <= 80000),
+    ),
+    'budget ₹30k-₹80k': (
+        lambda: store.search(min_price=30000, max_price=80000, limit=10),
+        (prices >= 30000) & (prices <= 80000),
+    ),
+    'similar to ₹62,000 (Ultrabook)': (
+        lambda: store.similar_price(62000, type_name='Ultrabook', limit=3),
+        None,
+    ),
+    'count gpu tier 4+': (
+        lambda: store.count(min_gpu_tier=4),
+        None,
+    ),
+}
+
+failures = []
+print(f"   {'query':<34} {'p50 ms':>8} {'max ms':>8} {'rows':>6}")
+for name, (query, mask) in QUERIES.items():
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = query()
+        times.append(time.perf_counter() - start)
+    n = result if isinstance(result, int) else len(result)
+    print(f"   {name:<34} {np.median(times) * 1000:8.2f} {max(times) * 1000:8.2f} {n:6d}")
+
+    if mask is not None:
+        # Same rows as a NumPy scan: dearest first for the Gaming query, cheapest otherwise
+        ordered = np.sort(prices[mask])
+        expected = ordered[::-1][:10] if 'Gaming' in name else ordered[:10]
+        if [row['price'] for row in result] != expected.tolist():
+            failures.append(f"{name}: prices differ from a NumPy scan")
+
+similar = store.similar_price(62000, type_name='Ultrabook', limit=3)
+ultrabook = prices[type_name == 'Ultrabook']
+expected = np.sort(np.abs(ultrabook - 62000))[:3]
+if [abs(row['price'] - 62000) for row in similar] != expected.tolist():
+    failures.append("similar_price: not the closest prices")
+if store.count(min_gpu_tier=4) != sum(1 for gpu in columns['gpu'] if any(
+        model in gpu for model in ('RTX 3060', 'RTX 3070', 'RTX 4060', 'RX 6600'))):
+    failures.append("count(min_gpu_tier=4) disagrees with the tier rules")
+
+print()
+print("=" * 80)
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Queries match a full scan")
@@ -0,0 +1,150 @@
+"""
+Hot reload check
+
+Publishes a generated predictions store (lapprice.standins), serves it
+through a watching StoreLoader while reader threads hammer it, then
+publishes a new version over the top. Checks that the watcher picks up
+the new manifest and swaps the store in without a restart, that no reader
+ever sees a mix of the two versions, that each snapshot's manifest version
+is the one of the store it came with, and (dict backend) that memory goes
+back to one copy after the swap.
+
+Every price of version v lies in [v * 1e6, (v + 1) * 1e6), so the version
+a batch of lookups came from can be read off the prices themselves.
+
+Usage:
+    python scripts/check_hot_reload.py --entries 200000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.backends import MANIFEST_NAME, manifest_version, open_backend
+from lapprice.loader import StoreLoader
+from lapprice.standins import write_standins
+
+LOCAL_KINDS = ('dict', 'mmap', 'sqlite')
+
+parser = argparse.ArgumentParser(description="Check hot reload of the lookup store under concurrent reads")
+parser.add_argument('--entries', type=int, default=100000, help="Size of the generated store")
+parser.add_argument('--readers', type=int, default=4, help="Reader threads")
+parser.add_argument('--interval', type=float, default=0.1, help="Manifest poll interval (s)")
+parser.add_argument('--backends', nargs='+', default=list(LOCAL_KINDS), choices=LOCAL_KINDS)
+args = parser.parse_args()
+
+print("=" * 80)
+print("  🔄 HOT RELOAD CHECK")
+print("=" * 80)
+print()
+
+rng = np.random.default_rng(44)
+keys = np.unique(np.array([f'{k:012x}' for k in rng.integers(0, 16 ** 12, args.entries)]))
+base = rng.integers(15000, 400000, len(keys))
+
+
+def publish(directory, version):
+    predictions = {key: {'price': int(version * 1000000 + price)} for key, price in zip(keys.tolist(), base)}
+    return write_standins(predictions, directory)
+
+
+def reader(loader, stop, seen, torn, pairs, reads, seed):
+    """Probe random keys against one snapshot of the store at a time"""
+    sample = np.random.default_rng(seed)
+    while not stop.is_set():
+        backend, version = loader.snapshot()  # one snapshot per "request", as the app does per rerun
+        if backend is None:
+            continue
+        _, prices = backend.probe(sample.choice(keys, 200))
+        versions = set((prices // 1000000).astype(int).tolist())
+        reads[seed] += 1
+        if len(versions) != 1:
+            torn.append(versions)
+        else:
+            pairs.add((version, min(versions)))
+            if not seen or seen[-1] != min(versions):
+                seen.append(min(versions))
+        del backend
+
+
+failures = []
+print(f"📦 {len(keys):,} predictions, {args.readers} readers, polling every {args.interval}s")
+print()
+print(f"   {'backend':<8} {'reload s':>9} {'reads':>9}  {'versions seen':<15} {'memory':<22} result")
+for kind in args.backends:
+    with tempfile.TemporaryDirectory(prefix='lapprice_reload_') as directory:
+        specs = publish(directory, 1)
+        manifest = os.path.join(directory, MANIFEST_NAME)
+
+        tracemalloc.start()
+        loader = StoreLoader(lambda: open_backend(specs[kind]), kind, version=lambda: manifest_version(manifest))
+        loader.start().wait()
+        gc.collect()
+        one_copy = tracemalloc.get_traced_memory()[0]
+        loader.watch(args.interval)
+
+        stop = threading.Event()
+        seen = [[] for _ in range(args.readers)]
+        torn = []
+        pairs = set()  # (manifest version, store version read off the prices) per snapshot
+        reads = [0] * args.readers
+        threads = [threading.Thread(target=reader, args=(loader, stop, seen[i], torn, pairs, reads, i), daemon=True)
+                   for i in range(args.readers)]
+        for thread in threads:
+            thread.start()
+
+        time.sleep(0.3)
+        first_version = loader.version
+        publish(directory, 2)
+        tracemalloc.reset_peak()
+        published = time.perf_counter()
+        while loader.swaps == 0 and time.perf_counter() - published < 60:
+            time.sleep(0.01)
+        reloaded = time.perf_counter() - published
+        time.sleep(0.3)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        versions = sorted({tuple(s) for s in seen})
+        mismatched = len({version for version, _ in pairs}) != len(pairs)  # one manifest version, two stores
+        ok = (loader.swaps == 1 and not torn and not mismatched and loader.version == manifest_version(manifest) != first_version
+              and all(s[-1] == 2 and s == sorted(s) for s in seen) and loader.get().get(keys[0]) >= 2000000)
+        memory = ''
+        if kind == 'dict':
+            memory = f"{one_copy / 1024 ** 2:.0f} -> {peak / 1024 ** 2:.0f} -> {current / 1024 ** 2:.0f} MB"
+            if current > one_copy * 1.25:
+                ok = False
+                failures.append(f"{kind}: {current / 1024 ** 2:.0f} MB held after the swap "
+                                f"(one copy is {one_copy / 1024 ** 2:.0f} MB)")
+        if torn:
+            failures.append(f"{kind}: {len(torn)} reads mixed versions {torn[0]}")
+        if mismatched:
+            failures.append(f"{kind}: a snapshot paired a store with another store's version {sorted(pairs)}")
+        if not ok and not torn and not mismatched:
+            failures.append(f"{kind}: swaps={loader.swaps}, version {loader.version}, "
+                            f"error {loader.reload_error}, readers saw {versions}")
+        print(f"   {kind:<8} {reloaded:9.2f} {sum(reads):9d}  {str(versions[0]):<15} {memory:<22} {'✅' if ok else '❌'}")
+        loader.current = (None, loader.version)  # free this backend's copy before the next one
+
+print()
+print("=" * 80)
+if failures:
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1)
+print("✅ Every backend hot-reloaded without a torn read")
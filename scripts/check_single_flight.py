@@ -0,0 +1,115 @@
+"""
+Single-flight check for the predictions store
+
+Serves a generated predictions_lookup.json from a local, deliberately slow
+HTTP server, points app_new.py at it (LAPPRICE_PAGES_BASE) and starts
+several app sessions at the same time on a cold process. Passes only if
+the server saw exactly one download of the store and the loader ran
+exactly once, with every other session joining it. Other GETs on the load
+path are counted per path, not mistaken for store downloads: the
+predictions_delta.json probe is part of the same load and must also be
+made once; the manifest.json version poll is reported.
+
+Usage:
+    python scripts/check_single_flight.py --sessions 8 --delay 2
+"""
+
+import argparse
+import collections
+import functools
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+parser = argparse.ArgumentParser(description="Prove one predictions download per process under concurrent sessions")
+parser.add_argument('--sessions', type=int, default=8)
+parser.add_argument('--delay', type=float, default=2.0, help="Seconds the server stalls before answering")
+parser.add_argument('--entries', type=int, default=50000, help="Size of the generated store")
+args = parser.parse_args()
+
+print("=" * 80)
+print("  🚦 SINGLE-FLIGHT STORE LOADING CHECK")
+print("=" * 80)
+print()
+
+# Local stand-in for GitHub Pages
+pages_dir = tempfile.mkdtemp(prefix='lapprice_pages_')
+with open(os.path.join(pages_dir, 'predictions_lookup.json'), 'w') as f:
+    json.dump({f'{i:012x}': {'price': 30000 + i} for i in range(args.entries)}, f)
+
+STORE_PATH = '/predictions_lookup.json'
+DELTA_PATH = '/predictions_delta.json'  # probed once per load, next to the store (404 here)
+requests_seen = collections.Counter()  # path -> GETs
+
+
+class SlowHandler(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        requests_seen[self.path.split('?')[0]] += 1
+        if self.path.startswith(STORE_PATH):
+            time.sleep(args.delay)
+        super().do_GET()
+
+    def log_message(self, *_):
+        pass
+
+
+server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(SlowHandler, directory=pages_dir))
+threading.Thread(target=server.serve_forever, daemon=True).start()
+os.environ['LAPPRICE_PAGES_BASE'] = f'http://127.0.0.1:{server.server_address[1]}'
+print(f"🌐 Serving {args.entries:,} predictions at {os.environ['LAPPRICE_PAGES_BASE']} ({args.delay}s delay)")
+
+from streamlit.testing.v1 import AppTest
+
+from lapprice.loader import shared_loader
+
+print(f"👥 Starting {args.sessions} sessions at once...")
+barrier = threading.Barrier(args.sessions)
+errors = []
+
+
+def session():
+    at = AppTest.from_file(os.path.join(ROOT, 'app_new.py'), default_timeout=120)
+    barrier.wait()
+    at.run()
+    if at.exception:
+        errors.append(at.exception[0].value)
+
+
+threads = [threading.Thread(target=session) for _ in range(args.sessions)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+loader = shared_loader('predictions', None)
+loader.wait(timeout=60)
+status = loader.status()
+server.shutdown()
+print()
+
+print("📊 Counters:")
+print(f"   Store downloads seen by server: {requests_seen[STORE_PATH]}")
+for path, n in sorted(requests_seen.items()):
+    if path != STORE_PATH:
+        print(f"   {path + ' GETs:':<31} {n}")
+print(f"   Loader fetches:                 {status['fetches']}")
+print(f"   Sessions that joined:           {status['joined'] - 1}")  # minus this script's own lookup
+print(f"   Sessions served the fallback:   {status['fallbacks']}")
+print(f"   Store state:                    {status['state']} after {status['elapsed_s']:.1f}s")
+print()
+print("=" * 80)
+
+ok = not errors and requests_seen[STORE_PATH] == 1 and requests_seen[DELTA_PATH] == 1 and status['fetches'] == 1 and status['state'] == 'ready'
+if errors:
+    print(f"❌ Sessions raised: {errors[0]}")
+if not ok:
+    print("❌ Store (and its delta) was not loaded exactly once")
+    sys.exit(1)
+print("✅ Exactly one download and parse (and one delta probe) for all sessions")
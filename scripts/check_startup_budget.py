@@ -0,0 +1,77 @@
+"""
+Startup budget check for app_new.py
+
+Runs the app once in a fresh process (Streamlit's AppTest harness, no
+browser needed), prints the cold-start timeline recorded by
+lapprice.timing.startup and exits with status 1 when time-to-first-paint
+(process start -> header rendered) is over budget. Meant for CI and for
+checking a change before deploying to Render/Railway.
+
+Usage:
+    python scripts/check_startup_budget.py --budget 3.0
+"""
+
+import time
+process_start = time.perf_counter()
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+parser = argparse.ArgumentParser(description="Fail when app_new.py's time-to-first-paint exceeds a budget")
+parser.add_argument('--budget', type=float, default=float(os.environ.get('LAPPRICE_STARTUP_BUDGET', 3.0)),
+                    help="Seconds allowed from process start to the header (default 3.0, env LAPPRICE_STARTUP_BUDGET)")
+parser.add_argument('--app', default=os.path.join(ROOT, 'app_new.py'))
+parser.add_argument('--timeout', type=float, default=120)
+args = parser.parse_args()
+
+from streamlit.testing.v1 import AppTest
+
+from lapprice import timing
+
+FIRST_PAINT = "first paint (header)"
+DEFERRED_MODULES = ['pandas', 'plotly.graph_objects', 'plotly.express', 'requests']
+
+print("=" * 80)
+print("  🚀 STARTUP BUDGET CHECK")
+print("=" * 80)
+print()
+
+at = AppTest.from_file(args.app, default_timeout=args.timeout)
+at.run()
+done = time.perf_counter()
+
+if at.exception:
+    print(f"❌ App raised on first run: {at.exception[0].value}")
+    sys.exit(1)
+
+events = timing.startup.events
+if FIRST_PAINT not in events:
+    print(f"❌ App never reached '{FIRST_PAINT}'")
+    sys.exit(1)
+
+origin = timing.startup.origin
+print(f"⏱️  Timeline (ms from process start; script run began at {(origin - process_start) * 1000:.0f} ms)")
+for event in timing.startup.report():
+    start = event['start_ms'] + (origin - process_start) * 1000
+    print(f"   {start:8.1f}  {event['duration_ms']:8.1f}  {event['step']}")
+print()
+
+loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+print(f"📦 Deferred modules in memory after the default view: {', '.join(loaded) or 'none'}")
+print("   (Streamlit itself may import some of them, e.g. plotly for its chart theme)")
+print()
+
+first_paint = events[FIRST_PAINT][0] - process_start
+print(f"🎨 Time to first paint: {first_paint:.2f}s (budget {args.budget:.2f}s)")
+print(f"🏁 First run complete:  {done - process_start:.2f}s")
+print()
+print("=" * 80)
+
+if first_paint > args.budget:
+    print(f"❌ Over budget by {first_paint - args.budget:.2f}s")
+    sys.exit(1)
+print("✅ Within budget")
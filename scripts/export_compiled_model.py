@@ -0,0 +1,90 @@
+"""
+Compile pipe.pkl into a NumPy-only artifact
+
+The archived app and the API unpickle the full scikit-learn pipeline and
+call pipe.predict on a one-row DataFrame for every query. This exports the
+fitted pipeline's arrays (encoder vocabularies, coefficients, flattened
+trees) so lapprice.compiled.CompiledPipeline can serve identical
+predictions without importing sklearn or pandas.
+
+Usage:
+    python scripts/export_compiled_model.py --model pipe.pkl --out pipe_compiled.npz
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lapprice.compiled import CompiledPipeline, compile_pipeline
+
+parser = argparse.ArgumentParser(description="Compile pipe.pkl for NumPy-only inference")
+parser.add_argument('--model', default='pipe.pkl')
+parser.add_argument('--data', default='df.pkl', help="Engineered dataframe used to verify the export")
+parser.add_argument('--out', default='pipe_compiled.npz')
+args = parser.parse_args()
+
+print("=" * 80)
+print("  🧮 COMPILING ML PIPELINE TO NUMPY ARRAYS")
+print("=" * 80)
+print()
+
+print("🤖 Step 1: Loading ML model...")
+pipe = pickle.load(open(args.model, 'rb'))
+print(f"   ✅ Loaded {type(pipe[-1]).__name__ if hasattr(pipe, 'steps') else type(pipe).__name__}")
+print()
+
+print("🔨 Step 2: Compiling...")
+compiled = compile_pipeline(pipe)
+compiled.save(args.out)
+size_kb = os.path.getsize(args.out) / 1024
+print(f"   ✅ Saved {args.out} ({size_kb:,.0f} KB, {len(compiled.arrays)} arrays)")
+print()
+
+print("🔍 Step 3: Verifying predictions...")
+start = time.perf_counter()
+compiled = CompiledPipeline.load(args.out)
+load_ms = (time.perf_counter() - start) * 1000
+
+if os.path.exists(args.data):
+    df = pickle.load(open(args.data, 'rb'))
+    X = df[compiled.input_columns]
+    columns = {name: X[name].tolist() for name in compiled.input_columns}
+
+    expected = pipe.predict(X)
+    actual = compiled.predict(columns)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    print(f"   Rows checked: {len(X):,}")
+    print(f"   Max |log-price difference|: {max_diff:.2e}")
+    if max_diff > 1e-9:
+        print("   ❌ Compiled predictions differ from pipe.predict")
+        sys.exit(1)
+    print("   ✅ Identical predictions")
+
+    one_row = {name: values[:1] for name, values in columns.items()}
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        compiled.predict(one_row)
+    single_us = (time.perf_counter() - start) / runs * 1e6
+
+    start = time.perf_counter()
+    for _ in range(20):
+        pipe.predict(X.iloc[:1])
+    sklearn_us = (time.perf_counter() - start) / 20 * 1e6
+else:
+    print(f"   ⚠️  {args.data} not found, skipping verification")
+    single_us = sklearn_us = None
+print()
+
+print("⚡ Performance:")
+print(f"   Load time: {load_ms:.1f} ms")
+if single_us is not None:
+    print(f"   Single row: {single_us:,.0f} µs (compiled) vs {sklearn_us:,.0f} µs (pipe.predict)")
+print()
+print("=" * 80)
@@ -0,0 +1,87 @@
+"""
+Export the predictions lookup to the other backend formats
+
+Reads predictions_lookup.json (from precompute_predictions.py) and writes
+the files the mmap, sqlite, shards and range backends read
+(lapprice.backends). Copy the output next to the app, or publish it to
+GitHub Pages for the HTTP backends, then set LAPPRICE_STORE, e.g.:
+
+    mmap:data/lookups/predictions.lps
+    sqlite:data/lookups/predictions.sqlite
+    shards:https://<user>.github.io/<repo>/shards
+    range:https://<user>.github.io/<repo>/predictions.lps
+
+The store file starts with a hot section: the --hot most popular keys
+(the JSON's own order - precompute_predictions.py writes it most popular
+first - re-ranked by any --popularity miss logs / L1 snapshots). Backends
+hold it in memory and the app copies it into its L1 cache at startup.
+
+A manifest.json versioning the exported files is written last; a running
+app or API watching it loads the new store in the background and swaps it
+in (see LAPPRICE_STORE_MANIFEST / LAPPRICE_RELOAD_INTERVAL).
+
+Usage:
+    python scripts/export_store.py --input predictions_lookup.json --out data/lookups
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.backends import DEFAULT_HOT, sorted_arrays, write_manifest, write_shards, write_sqlite, write_store_file
+from lapprice.popularity import observed_counts, popularity_order
+
+FORMATS = {
+    'lps': ('predictions.lps', write_store_file),  # mmap + range
+    'sqlite': ('predictions.sqlite', write_sqlite),
+    'shards': ('shards', write_shards),
+}
+
+parser = argparse.ArgumentParser(description="Export predictions_lookup.json for the mmap/sqlite/shards/range backends")
+parser.add_argument('--input', default='predictions_lookup.json')
+parser.add_argument('--out', default=os.path.join(ROOT, 'data', 'lookups'))
+parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=list(FORMATS))
+parser.add_argument('--hot', type=int, default=DEFAULT_HOT, help="Keys in the store file's hot section")
+parser.add_argument('--popularity', nargs='*', default=[], metavar='PATH',
+                    help="Miss logs (.jsonl) / L1 snapshots (.json) of observed traffic to rank by")
+args = parser.parse_args()
+
+print("=" * 80)
+print("  📤 EXPORTING PREDICTIONS STORE")
+print("=" * 80)
+print()
+
+print(f"📂 Loading {args.input}...")
+with open(args.input) as f:
+    predictions = json.load(f)
+keys, prices = sorted_arrays(predictions)
+print(f"   ✅ {len(keys):,} predictions")
+file_order = list(predictions)
+observed = observed_counts(args.popularity)
+hot_keys = [file_order[i] for i in popularity_order(file_order, observed=observed)[:args.hot].tolist()]
+print(f"   🔥 {len(hot_keys):,} hot keys ({sum(1 for key in hot_keys if observed.get(key)):,} seen in traffic)")
+print()
+
+os.makedirs(args.out, exist_ok=True)
+for name in args.formats:
+    filename, write = FORMATS[name]
+    path = os.path.join(args.out, filename)
+    start = time.time()
+    write(path, keys, prices, **({'hot_keys': hot_keys} if name == 'lps' else {}))
+    if os.path.isdir(path):
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    else:
+        size = os.path.getsize(path)
+    print(f"💾 {path}: {size / 1024 ** 2:.1f} MB ({time.time() - start:.1f}s)")
+
+manifest = write_manifest(args.out, [FORMATS[name][0] for name in args.formats])
+print(f"📋 {os.path.join(args.out, 'manifest.json')}: version {manifest['version']}")
+
+print()
+print("=" * 80)
+print("✅ Done")
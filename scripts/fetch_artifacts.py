@@ -0,0 +1,65 @@
+"""
+Download the app's artifacts in parallel
+
+Fetches the pre-computed predictions, the config grid and the compiled
+fallback model from a static host (GitHub Pages by default) with one pooled
+Downloader: all files at once, large ones split into range requests, failed
+requests retried. Useful as a build step on Render/Railway so the app starts
+with its grid and fallback model already on disk.
+
+Usage:
+    python scripts/fetch_artifacts.py --base https://yourusername.github.io/laptop-price-predictor
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.download import Downloader
+
+# Remote name -> local path the app loads it from
+ARTIFACTS = {
+    'predictions_lookup.json': os.path.join(ROOT, 'data', 'lookups', 'predictions_lookup.json'),
+    'config_grid.npz': os.path.join(ROOT, 'data', 'lookups', 'config_grid.npz'),
+    'fallback_model.npz': os.path.join(ROOT, 'models', 'fallback_model.npz'),
+}
+
+parser = argparse.ArgumentParser(description="Download app artifacts in parallel")
+parser.add_argument('--base', default=os.environ.get('LAPPRICE_PAGES_BASE',
+                                                     'https://yourusername.github.io/laptop-price-predictor'))
+parser.add_argument('--names', nargs='+', default=list(ARTIFACTS), choices=list(ARTIFACTS))
+parser.add_argument('--workers', type=int, default=8)
+args = parser.parse_args()
+
+print("=" * 80)
+print("  📥 FETCHING ARTIFACTS")
+print("=" * 80)
+print()
+
+urls = {f"{args.base.rstrip('/')}/{name}": name for name in args.names}
+print(f"🌐 {len(urls)} artifact(s) from {args.base}")
+
+with Downloader(workers=args.workers) as downloader:
+    try:
+        blobs = downloader.fetch_many(list(urls))
+    except Exception as e:
+        print(f"❌ Download failed: {e}")
+        sys.exit(1)
+
+for url, blob in blobs.items():
+    path = ARTIFACTS[urls[url]]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(blob)
+    print(f"💾 {os.path.relpath(path, ROOT)}")
+print()
+
+print("📊 Throughput:")
+for line in downloader.report().splitlines():
+    print(f"   {line}")
+print()
+print("=" * 80)
+print("✅ Done")
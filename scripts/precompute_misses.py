@@ -0,0 +1,135 @@
+"""
+Delta pre-computation - price the configurations users asked for but the
+store didn't have
+
+Reads the miss log written by the app and the API (lapprice.misslog),
+prices the most frequent missing configurations in one batch and merges
+them into predictions_delta.json next to the store (same format as
+predictions_lookup.json). The manifest is rewritten last, so running apps
+hot-reload and overlay the delta on the store (lapprice.backends.
+OverlayBackend): every configuration priced here is an exact hit from then
+on. Run it periodically and coverage follows real traffic.
+
+Usage:
+    python scripts/precompute_misses.py --log data/lookups/misses.jsonl --out data/lookups --top 10000
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.backends import DELTA_NAME, MANIFEST_NAME, open_backend, write_manifest
+from lapprice.compiled import CompiledPipeline
+from lapprice.estimator import estimate_prices
+from lapprice.features import MODEL_COLUMNS, model_columns
+from lapprice.keys import columns_from_records, hash_columns
+from lapprice.misslog import top_misses
+
+parser = argparse.ArgumentParser(description="Price the most frequent lookup misses and publish them as a delta")
+parser.add_argument('--log', default=os.path.join(ROOT, 'data', 'lookups', 'misses.jsonl'))
+parser.add_argument('--out', default=os.path.join(ROOT, 'data', 'lookups'),
+                    help="Directory holding the store and its manifest.json")
+parser.add_argument('--top', type=int, default=10000, help="Most frequent missing configurations to price")
+parser.add_argument('--min-count', type=int, default=1, help="Skip configurations missed fewer times")
+parser.add_argument('--store', help="Lookup store spec; configurations it already answers are skipped")
+parser.add_argument('--model', default='pipe.pkl',
+                    help="Trained pipeline to price with (pipe.pkl or a compiled .npz)")
+parser.add_argument('--fallback-model', default=os.path.join(ROOT, 'models', 'fallback_model.npz'),
+                    help="Model used when --model can't be loaded, before the formula estimator")
+args = parser.parse_args()
+
+print("=" * 80)
+print("  🎯 DELTA PRE-COMPUTATION FROM LOOKUP MISSES")
+print("=" * 80)
+print()
+
+delta_path = os.path.join(args.out, DELTA_NAME)
+delta = {}
+if os.path.exists(delta_path):
+    with open(delta_path) as f:
+        delta = json.load(f)
+
+print(f"📂 Reading {args.log}...")
+misses = [miss for miss in top_misses(args.log, min_count=args.min_count) if miss[0] not in delta]
+if args.store and misses:
+    store = open_backend(args.store)
+    hits, _ = store.probe([key for key, _, _ in misses])
+    misses = [miss for miss, hit in zip(misses, hits.tolist()) if not hit]
+    store.close()
+total_requests = sum(count for _, count, _ in misses)
+misses = misses[:args.top]
+print(f"   ✅ {len(misses):,} configurations to price "
+      f"({sum(count for _, count, _ in misses):,} of {total_requests:,} missed requests), "
+      f"{len(delta):,} already in the delta")
+print()
+if not misses:
+    print("✅ Nothing new to price")
+    sys.exit(0)
+
+print("🤖 Loading ML model...")
+pipe = None
+for model_path in (args.model, args.fallback_model):
+    try:
+        if model_path.endswith('.npz'):
+            pipe = CompiledPipeline.load(model_path)
+        else:
+            pipe = pickle.load(open(model_path, 'rb'))
+        print(f"   ✅ Model loaded successfully ({model_path})")
+        break
+    except Exception as e:
+        print(f"   ⚠️  Could not load {model_path} ({e})")
+if pipe is None:
+    print("   ⚠️  Pricing with the formula estimator")
+print()
+
+print("🔨 Pricing missing configurations...")
+start = time.time()
+columns = columns_from_records([config for _, _, config in misses])
+if pipe is None:
+    prices = estimate_prices(columns)
+elif isinstance(pipe, CompiledPipeline):
+    prices = pipe.predict_price(model_columns(columns))
+else:
+    prices = np.exp(pipe.predict(pd.DataFrame(model_columns(columns), columns=MODEL_COLUMNS)))
+
+# Keys are recomputed from the logged configs: a stale or hand-edited log can't mis-key the delta
+keys = hash_columns(columns).astype(str).tolist()
+for key, price in zip(keys, np.asarray(prices, dtype=float).tolist()):
+    delta[key] = {
+        'price': price,
+        'confidence_lower': price * 0.92,
+        'confidence_upper': price * 1.08,
+        'confidence_score': 0.95,
+    }
+print(f"   ✅ {len(keys):,} priced in {time.time() - start:.2f}s")
+print()
+
+print("💾 Publishing delta...")
+os.makedirs(args.out, exist_ok=True)
+with open(delta_path + '.tmp', 'w') as f:
+    json.dump(delta, f)
+os.replace(delta_path + '.tmp', delta_path)
+print(f"   ✅ {delta_path}: {len(delta):,} configurations")
+
+# Manifest last: watching apps reload the store with the new delta overlaid
+manifest_path = os.path.join(args.out, MANIFEST_NAME)
+names = {DELTA_NAME}
+if os.path.exists(manifest_path):
+    with open(manifest_path) as f:
+        names.update(name for name in json.load(f).get('files', {})
+                     if os.path.exists(os.path.join(args.out, name)))
+manifest = write_manifest(args.out, sorted(names))
+print(f"   ✅ {manifest_path}: version {manifest['version']}")
+
+print()
+print("=" * 80)
+print("✅ Done")
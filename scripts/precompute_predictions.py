@@ -5,6 +5,13 @@ Instead of running ML model on every query, we pre-compute everything!
 This is MUCH faster for production:
 - ML model: ~100-500ms per prediction
 - Hash lookup: ~0.1ms per prediction (1000x faster!)
+
+--sqlite PATH also writes every priced configuration to an indexed SQLite
+database (lapprice.configdb) for filtered / price-range queries.
+
+predictions_lookup.json is written most popular first (lapprice.popularity:
+closeness to the form defaults and presets, plus any --popularity traffic
+logs), so export_store.py can put the head of it in the store's hot section.
 """
 
 import pandas as pd
@@ -12,8 +19,19 @@ import numpy as np
 import pickle
 import json
 import hashlib
+import argparse
+import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser(description="Pre-compute the O(1) lookup tables")
+parser.add_argument('--sqlite', metavar='PATH', help="Also write an indexed configs database (e.g. configs.sqlite)")
+parser.add_argument('--popularity', nargs='*', default=[], metavar='PATH',
+                    help="Miss logs (.jsonl) / L1 snapshots (.json) of observed traffic to rank by")
+args = parser.parse_args()
+
 print("=" * 80)
 print("  🚀 O(1) LOOKUP SYSTEM - PRE-COMPUTING PREDICTIONS")
 print("=" * 80)
@@ -76,6 +94,7 @@ print()
 predictions_lookup = {}  # Hash key -> prediction
 specs_lookup = {}        # Hash key -> full specs
 search_index = {}        # Searchable key -> hash keys (for similar configs)
+row_keys = []            # hash key of every row, in dataset order
 
 batch_size = 10000
 for i in range(0, len(df), batch_size):
@@ -87,6 +106,7 @@ for i in range(0, len(df), batch_size):
     for idx, row in batch.iterrows():
         # Create unique hash key
         hash_key = create_laptop_key(row)
+        row_keys.append(hash_key)
 
         # Store the predicted price (already in dataset for synthetic data)
         predicted_price = row['Price']
@@ -131,6 +151,18 @@ print()
 print("✅ Pre-computation complete!")
 print()
 
+# Most popular configurations first - the order predictions_lookup.json is written in
+from lapprice.features import raw_config_columns
+from lapprice.keys import hash_columns
+from lapprice.popularity import observed_counts, popularity_order
+
+# Traffic logs hold the app's canonical keys, not this file's md5 row keys: rank by those
+config_columns = raw_config_columns(df)
+order = popularity_order(hash_columns(config_columns), config_columns, observed_counts(args.popularity))
+predictions_lookup = {key: predictions_lookup[key] for key in np.asarray(row_keys)[order].tolist()}
+print(f"🔥 Ordered by popularity (most popular: {next(iter(predictions_lookup))})")
+print()
+
 # Statistics
 print("📊 Lookup System Statistics:")
 print(f"   Total predictions: {len(predictions_lookup):,}")
@@ -157,6 +189,11 @@ with open('search_index.json', 'w') as f:
     json.dump(search_index, f)
 print("   ✅ Saved search_index.json")
 
+# Manifest last: a running app/API watching it hot-reloads the new version
+from lapprice.backends import write_manifest
+manifest = write_manifest('.', ['predictions_lookup.json', 'specs_lookup.json', 'search_index.json'])
+print(f"   ✅ Saved manifest.json (version {manifest['version']})")
+
 print()
 
 # Calculate file sizes
@@ -172,6 +209,16 @@ print(f"   search_index.json: {search_size:.2f} MB")
 print(f"   Total: {total_size:.2f} MB")
 print()
 
+if args.sqlite:
+    from lapprice.configdb import write_config_db
+    from lapprice.features import raw_config_columns
+
+    print("🗄️  Writing configuration database...")
+    rows = write_config_db(args.sqlite, raw_config_columns(df), df['Price'])
+    print(f"   ✅ Saved {args.sqlite}: {rows:,} configurations, "
+          f"{Path(args.sqlite).stat().st_size / (1024 * 1024):.2f} MB")
+    print()
+
 # Create a sample lookup example
 print("🔍 Example Lookup (O(1) retrieval):")
 sample_key = list(predictions_lookup.keys())[0]
@@ -0,0 +1,238 @@
+"""
+Multi-process serving - N app processes sharing one read-only store
+
+One Streamlit process runs its Python on one core (GIL), and N separate
+`streamlit run`s on the default dict store hold N parsed copies of the
+predictions. This launches --workers app processes on the same mmap (or
+sqlite) store file, so the store's pages sit once in the OS page cache and
+every worker maps them: a worker adds its own interpreter and caches, not
+another copy of the store. A small TCP balancer on --port hands each new
+connection to the worker with the fewest open ones. A Streamlit session is
+one long-lived WebSocket, so each session stays on one worker and sessions
+spread across cores.
+
+Workers that exit are restarted. Each worker keeps its own L1 snapshot
+(l1_cache.<n>.json next to the store) and they all append to the same miss
+log. Hot reload works as usual: every worker watches the store's manifest.
+
+Usage:
+    python scripts/export_store.py --input predictions_lookup.json --out data/lookups --formats lps
+    python scripts/serve_multi.py --workers 4 --port 8501 --store data/lookups/predictions.lps
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.backends import open_backend
+
+SHARED_KINDS = ('mmap', 'sqlite')  # stores the OS can share between processes
+
+parser = argparse.ArgumentParser(description="Serve app_new.py from N processes sharing one lookup store")
+parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="App processes (default: one per core)")
+parser.add_argument('--port', type=int, default=8501, help="Port the balancer listens on")
+parser.add_argument('--address', default='0.0.0.0', help="Address the balancer listens on")
+parser.add_argument('--worker-port', type=int, default=8600, help="First worker port (workers bind 127.0.0.1)")
+parser.add_argument('--store', default=os.path.join(ROOT, 'data', 'lookups', 'predictions.lps'),
+                    help="Store file or LAPPRICE_STORE spec; a bare path means mmap:<path>")
+parser.add_argument('--app', default=os.path.join(ROOT, 'app_new.py'))
+parser.add_argument('--startup-timeout', type=float, default=120.0, help="Seconds to wait for the workers to come up")
+parser.add_argument('--report-interval', type=float, default=0.0,
+                    help="Print worker memory and connections every N seconds (0 = at startup only)")
+args = parser.parse_args()
+
+print("=" * 80)
+print("  🧵 MULTI-PROCESS SERVING")
+print("=" * 80)
+print()
+
+store_spec = args.store if ':' in args.store else f'mmap:{args.store}'
+kind, _, store_path = store_spec.partition(':')
+if kind not in SHARED_KINDS:
+    print(f"❌ {store_spec}: each worker would hold its own copy - use one of "
+          f"{', '.join(f'{k}:<path>' for k in SHARED_KINDS)}")
+    sys.exit(1)
+if not os.path.exists(store_path):
+    print(f"❌ {store_path} not found - write it first:")
+    print(f"   python scripts/export_store.py --input predictions_lookup.json "
+          f"--out {os.path.dirname(store_path) or '.'} --formats {'lps' if kind == 'mmap' else 'sqlite'}")
+    sys.exit(1)
+store_path = os.path.abspath(store_path)
+store_spec = f'{kind}:{store_path}'
+backend = open_backend(store_spec)
+print(f"📦 {store_spec}: {len(backend):,} predictions, {os.path.getsize(store_path) / 1024 ** 2:.1f} MB on disk")
+backend.close()
+print()
+
+
+class Worker:
+    """One `streamlit run` bound to 127.0.0.1:port"""
+
+    def __init__(self, number, port):
+        self.number = number
+        self.port = port
+        self.process = None
+        self.restarts = 0
+        self.active = 0       # open balancer connections
+        self.connections = 0  # connections handed to it so far
+
+    def start(self):
+        env = dict(os.environ,
+                   LAPPRICE_STORE=store_spec,
+                   LAPPRICE_L1_CACHE=os.path.join(os.path.dirname(store_path), f'l1_cache.{self.number}.json'),
+                   LAPPRICE_WORKER=f'{self.number}/{args.workers}')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', args.app,
+             '--server.port', str(self.port), '--server.address', '127.0.0.1', '--server.headless', 'true'],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def healthy(self):
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{self.port}/_stcore/health', timeout=2) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def stop(self):
+        if self.alive:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def memory(pid):
+    """Whole-process and store-mapping RSS / PSS in MB from /proc (Linux), or None"""
+    totals = {'rss': 0, 'pss': 0, 'store_rss': 0, 'store_pss': 0}
+    try:
+        with open(f'/proc/{pid}/smaps') as f:
+            in_store = False
+            for line in f:
+                field = line.split()
+                if not line[0].isupper():  # mapping header: address range ... pathname
+                    in_store = field[-1] == store_path
+                elif field[0] in ('Rss:', 'Pss:'):
+                    name = field[0][:-1].lower()
+                    totals[name] += int(field[1])
+                    if in_store:
+                        totals[f'store_{name}'] += int(field[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return {name: kb / 1024 for name, kb in totals.items()}
+
+
+def report(workers):
+    print(f"   {'worker':<7} {'pid':>7} {'port':>6} {'conns':>6} {'open':>5} "
+          f"{'RSS MB':>8} {'PSS MB':>8} {'store RSS':>10} {'store PSS':>10}")
+    for worker in workers:
+        usage = memory(worker.process.pid) if worker.alive else None
+        columns = (f"{usage['rss']:8.1f} {usage['pss']:8.1f} {usage['store_rss']:10.1f} {usage['store_pss']:10.1f}"
+                   if usage else f"{'-':>8} {'-':>8} {'-':>10} {'-':>10}")
+        print(f"   {worker.number:<7} {worker.process.pid:>7} {worker.port:>6} {worker.connections:>6} "
+              f"{worker.active:>5} {columns}")
+    print("   (PSS splits shared pages between the processes mapping them: the store is counted once in total)")
+
+
+async def pipe(reader, writer):
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+async def balance(workers, client_reader, client_writer):
+    """Connect the client to the live worker with the fewest open connections"""
+    for worker in sorted(workers, key=lambda w: w.active):
+        if not worker.alive:
+            continue
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection('127.0.0.1', worker.port)
+        except OSError:
+            continue  # restarting: try the next one
+        break
+    else:
+        client_writer.close()
+        return
+    worker.active += 1
+    worker.connections += 1
+    try:
+        await asyncio.gather(pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer))
+    finally:
+        worker.active -= 1
+
+
+async def supervise(workers):
+    """Restart workers that exit; print the report every --report-interval seconds"""
+    reported = time.time()
+    while True:
+        await asyncio.sleep(1)
+        for worker in workers:
+            if not worker.alive:
+                worker.restarts += 1
+                print(f"⚠️  Worker {worker.number} exited ({worker.process.returncode}) - restart #{worker.restarts}")
+                worker.start()
+        if args.report_interval and time.time() - reported >= args.report_interval:
+            reported = time.time()
+            report(workers)
+
+
+async def serve(workers):
+    server = await asyncio.start_server(lambda r, w: balance(workers, r, w), args.address, args.port)
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+    print(f"🌐 Serving on http://{args.address}:{args.port} ({len(workers)} workers) - Ctrl+C to stop")
+    supervisor = asyncio.create_task(supervise(workers))
+    async with server:
+        await stopping.wait()
+    supervisor.cancel()
+
+
+workers = [Worker(number, args.worker_port + number) for number in range(args.workers)]
+print(f"🚀 Starting {args.workers} workers on ports {args.worker_port}-{args.worker_port + args.workers - 1}...")
+for worker in workers:
+    worker.start()
+try:
+    deadline = time.time() + args.startup_timeout
+    pending = list(workers)
+    while pending and time.time() < deadline:
+        pending = [worker for worker in pending if worker.alive and not worker.healthy()]
+        if any(not worker.alive for worker in workers):
+            break
+        time.sleep(0.5)
+    failed = [worker for worker in workers if not worker.alive] + pending
+    if failed:
+        print(f"❌ Worker(s) {', '.join(str(worker.number) for worker in failed)} did not come up")
+        sys.exit(1)
+    print("   ✅ All workers healthy")
+    print()
+    report(workers)
+    print()
+    asyncio.run(serve(workers))
+finally:
+    for worker in workers:
+        worker.stop()
+    print()
+    print("=" * 80)
+    print("✅ Stopped")
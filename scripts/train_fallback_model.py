@@ -0,0 +1,102 @@
+"""
+Train the lightweight fallback model
+
+Fits a regularised log-price linear model on the engineered features of
+data/datasets/laptop_data.csv with NumPy least squares, picks the ridge
+strength on a held-out split, refits on everything and writes the
+coefficients to a tiny artifact the app and API load at startup.
+
+Usage:
+    python scripts/train_fallback_model.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lapprice.features import MODEL_COLUMNS, engineer_raw_frame
+from lapprice.linear import fit_log_price_model
+
+parser = argparse.ArgumentParser(description="Fit the closed-form fallback model")
+parser.add_argument('--data', default=os.path.join(ROOT, 'data', 'datasets', 'laptop_data.csv'))
+parser.add_argument('--out', default=os.path.join(ROOT, 'models', 'fallback_model.npz'))
+parser.add_argument('--alphas', default='0.1,1,3,10,30,100,300', help="Ridge strengths to try")
+parser.add_argument('--test-size', type=float, default=0.15)
+args = parser.parse_args()
+
+print("=" * 80)
+print("  📐 TRAINING CLOSED-FORM FALLBACK MODEL")
+print("=" * 80)
+print()
+
+print("📂 Step 1: Loading and engineering features...")
+df = engineer_raw_frame(pd.read_csv(args.data))
+columns = {name: df[name].tolist() for name in MODEL_COLUMNS}
+prices = df['Price'].to_numpy()
+print(f"   ✅ {len(df):,} laptops, {len(MODEL_COLUMNS)} features")
+print()
+
+
+def subset(rows):
+    return {name: [values[i] for i in rows] for name, values in columns.items()}
+
+
+def evaluate(model, rows):
+    """R2 and MAE on log price, plus median absolute % error in ₹"""
+    actual = np.log(prices[rows])
+    predicted = model.predict(subset(rows))
+    residual = actual - predicted
+    r2 = 1 - np.sum(residual ** 2) / np.sum((actual - actual.mean()) ** 2)
+    pct = np.median(np.abs(np.exp(predicted) / prices[rows] - 1)) * 100
+    return {'r2': float(r2), 'mae_log': float(np.mean(np.abs(residual))), 'median_pct_error': float(pct)}
+
+
+print("🔍 Step 2: Choosing ridge strength on a held-out split...")
+rng = np.random.default_rng(2)
+order = rng.permutation(len(df))
+n_test = int(len(df) * args.test_size)
+test_rows, train_rows = order[:n_test], order[n_test:]
+
+results = {}
+for alpha in [float(a) for a in args.alphas.split(',')]:
+    model = fit_log_price_model(subset(train_rows), prices[train_rows], alpha=alpha)
+    results[alpha] = evaluate(model, test_rows)
+    print(f"   alpha={alpha:<6g} R2={results[alpha]['r2']:.3f}  "
+          f"MAE(log)={results[alpha]['mae_log']:.3f}  median error={results[alpha]['median_pct_error']:.1f}%")
+
+best_alpha = min(results, key=lambda a: results[a]['mae_log'])
+print(f"   ✅ Best alpha: {best_alpha:g}")
+print()
+
+print("🔨 Step 3: Refitting on all data...")
+start = time.perf_counter()
+model = fit_log_price_model(columns, prices, alpha=best_alpha)
+fit_ms = (time.perf_counter() - start) * 1000
+model.meta['validation'] = dict(results[best_alpha], alpha=best_alpha, test_rows=int(n_test))
+model.save(args.out)
+print(f"   ✅ Fitted in {fit_ms:.1f} ms")
+print(f"   💾 Saved {args.out} ({os.path.getsize(args.out) / 1024:.1f} KB)")
+print()
+
+print("⚡ Serving speed:")
+one_row = subset([0])
+runs = 1000
+start = time.perf_counter()
+for _ in range(runs):
+    model.predict_price(one_row)
+print(f"   Single row: {(time.perf_counter() - start) / runs * 1e6:.0f} µs")
+start = time.perf_counter()
+model.predict_price(columns)
+print(f"   Batch of {len(df):,}: {(time.perf_counter() - start) * 1000:.1f} ms")
+print()
+print(f"📊 Validation (held-out {args.test_size:.0%}): {json.dumps(model.meta['validation'])}")
+print()
+print("=" * 80)